@@ -0,0 +1,168 @@
+import math
+from collections.abc import Mapping, Sequence
+from enum import Enum, auto
+from typing import Dict, Any, List, Tuple, Union
+
+# Keys of objects and indexes of arrays from the root to a value
+Path = Tuple[Union[str, int], ...]
+
+
+class ChangeType(Enum):
+    ADDED = auto()
+    REMOVED = auto()
+    CHANGED = auto()
+
+
+class Change:
+    """Difference between two parsed values at a specific path"""
+    change_type: ChangeType
+    path: Path
+    old: Any
+    new: Any
+
+    def __init__(self, change_type: ChangeType, path: Path, old: Any = None, new: Any = None):
+        self.change_type = change_type
+        self.path = path
+        self.old = old
+        self.new = new
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Change):
+            return NotImplemented
+        return (self.change_type, self.path, self.old, self.new) == (other.change_type, other.path, other.old,
+                                                                     other.new)
+
+    def __repr__(self):
+        return f'Change({self.change_type.name}, {format_path(self.path)!r}, {self.old!r}, {self.new!r})'
+
+
+def format_path(path: Path) -> str:
+    """
+    Gets the text of a path, with keys separated by dots and indexes between brackets (i.e. servers[3].limits.rps)
+    :param path: Path
+    :return: Text of the path
+    """
+    result = ''
+    for part in path:
+        if isinstance(part, int):
+            result += f'[{part}]'
+        else:
+            result += f'.{part}' if len(result) > 0 else part
+    return result
+
+
+def is_object(value: Any) -> bool:
+    """
+    Checks if a value is an object (a dict or any other mapping, like frozen or shared values)
+    :param value: Value to check
+    :return: True if value is an object
+    """
+    return isinstance(value, Mapping)
+
+
+def is_array(value: Any) -> bool:
+    """
+    Checks if a value is an array (a list or any other sequence but strings)
+    :param value: Value to check
+    :return: True if value is an array
+    """
+    return isinstance(value, Sequence) and not isinstance(value, (str, bytes))
+
+
+def diff(old: Any, new: Any) -> List[Change]:
+    """
+    Gets the differences between two parsed values: the paths that were added, removed or changed. Objects are
+    compared key by key and arrays index by index. A value of a different type (i.e. 1 and 1.0) is changed. Subtrees
+    that are the same object in both values (i.e. frozen values shared between reloads) are skipped without comparing
+    them. Changes are listed in an order in which patch() can apply them to old
+    :param old: Old values
+    :param new: New values
+    :return: List of changes. Added and changed values are references to the subtrees of new
+    """
+    changes: List[Change] = []
+    diff_values(old, new, (), changes)
+    return changes
+
+
+def diff_values(old: Any, new: Any, path: Path, changes: List[Change]):
+    """
+    Appends the differences between two values
+    :param old: Old value
+    :param new: New value
+    :param path: Path of the values
+    :param changes: List where the changes are appended
+    """
+    if old is new:
+        return
+
+    if is_object(old) and is_object(new):
+        for key, old_value in old.items():
+            if key not in new:
+                changes.append(Change(ChangeType.REMOVED, path + (key,), old=old_value))
+        for key, new_value in new.items():
+            if key in old:
+                diff_values(old[key], new_value, path + (key,), changes)
+            else:
+                changes.append(Change(ChangeType.ADDED, path + (key,), new=new_value))
+    elif is_array(old) and is_array(new):
+        common_length = min(len(old), len(new))
+        for idx in range(common_length):
+            diff_values(old[idx], new[idx], path + (idx,), changes)
+        # Added items are appended in order, and removed items are removed from the end
+        for idx in range(common_length, len(new)):
+            changes.append(Change(ChangeType.ADDED, path + (idx,), new=new[idx]))
+        for idx in reversed(range(common_length, len(old))):
+            changes.append(Change(ChangeType.REMOVED, path + (idx,), old=old[idx]))
+    elif type(old) is not type(new) or (old != new and not is_nan(old, new)):
+        changes.append(Change(ChangeType.CHANGED, path, old=old, new=new))
+
+
+def is_nan(old: Any, new: Any) -> bool:
+    """
+    Checks if two values are float NaNs, which are the same value although they are not equal
+    :param old: Old value
+    :param new: New value
+    :return: True if both values are NaN
+    """
+    return isinstance(old, float) and isinstance(new, float) and math.isnan(old) and math.isnan(new)
+
+
+def patch(values: Any, changes: List[Change]) -> Any:
+    """
+    Applies the changes got from diff() to the values they were computed from. The values are not modified: only the
+    objects and arrays along the changed paths are copied, the rest of subtrees are shared with values
+    :param values: Values to patch
+    :param changes: Changes to apply, in order
+    :raise: KeyError or IndexError if some change path does not exist in values
+    :return: Patched values. Objects and arrays along the changed paths are dicts and lists
+    """
+    # Copies made by this patch (by id), which can be modified
+    copies: Dict[int, Any] = {}
+
+    def writable(value: Any) -> Any:
+        if id(value) in copies:
+            return value
+        value = dict(value) if is_object(value) else list(value)
+        copies[id(value)] = value
+        return value
+
+    for change in changes:
+        if len(change.path) == 0:
+            values = change.new
+            continue
+
+        values = writable(values)
+        container = values
+        for part in change.path[:-1]:
+            child = writable(container[part])
+            container[part] = child
+            container = child
+
+        last = change.path[-1]
+        if change.change_type == ChangeType.REMOVED:
+            del container[last]
+        elif change.change_type == ChangeType.ADDED and isinstance(container, list) and isinstance(last, int):
+            container.insert(last, change.new)
+        else:
+            container[last] = change.new
+    return values
@@ -0,0 +1,400 @@
+from typing import Dict, Any, Optional, List, Set, Tuple, Union, cast
+from gura.GuraParser import GuraParser, MatchResult, INDENT
+
+# Path to a key: a tuple of keys or a string with keys separated by dots (i.e. 'services.nginx.port')
+KeyPath = Union[str, Tuple[str, ...]]
+
+
+class CstNode:
+    """
+    Key/value pair of a Gura document with the spans (positions in the original text) of all its parts. Pending edits
+    are stored in the node until the document text is generated
+    """
+    key: str
+    indentation: int
+    start: int
+    end: int
+    key_start: int
+    key_end: int
+    value_start: int
+    value_end: int
+    is_object: bool
+    children: Dict[str, 'CstNode']
+    deleted: bool
+    replaced: bool
+    new_value: Any
+    inserted: Dict[str, Any]
+
+    def __init__(self, key: str, indentation: int, start: int, end: int, key_start: int, value_start: int,
+                 value_end: int, is_object: bool, children: List['CstNode']):
+        self.key = key
+        self.indentation = indentation
+        self.start = start
+        self.end = end
+        self.key_start = key_start
+        self.key_end = key_start + len(key)
+        self.value_start = value_start
+        self.value_end = value_end
+        self.is_object = is_object
+        self.children = {child.key: child for child in children}
+        self.deleted = False
+        self.replaced = False
+        self.new_value = None
+        self.inserted = {}
+
+    def __str__(self):
+        return f'{self.key} -> [{self.start}, {self.end})'
+
+
+class CstParser(GuraParser):
+    """
+    Parser that, besides the values, keeps the spans of every pair, value and comment of the parsed text (excluding
+    the content of imported files and pairs inside arrays)
+    """
+    source: str
+    offset: Optional[int]
+    prefix_end: int
+    body_start: int
+    node_stack: List[List[CstNode]]
+    comments: Dict[int, int]
+    imported_keys: Set[str]
+
+    def __init__(self):
+        super(CstParser, self).__init__()
+        self.__restart_cst('')
+
+    def __restart_cst(self, text: str):
+        """
+        Sets the params to collect spans from a specific text
+        :param text: Original text
+        """
+        self.source = text
+        self.offset = None
+        self.prefix_end = 0
+        self.body_start = 0
+        self.node_stack = [[]]
+        self.comments = {}
+        self.imported_keys = set()
+
+    def parse(self, text: str) -> 'GuraDocument':
+        """
+        Parses a text in Gura format keeping the spans of all its elements
+        :param text: Text to be parsed
+        :raise: ParseError if the syntax of text is invalid
+        :return: Document to apply edits to the text
+        """
+        self.__restart_cst(text)
+        self.loads(text)
+        root = CstNode('', -len(INDENT), 0, len(text), 0, 0, len(text), True, self.node_stack[0])
+        comments = sorted(self.comments.items())
+        return GuraDocument(text, root, comments, self.imported_keys)
+
+    def __to_source_pos(self, pos: int) -> int:
+        """
+        Maps a position in the parsed text (which contains the imported files' content) to the original text
+        :param pos: Position in parsed text
+        :return: Position in original text
+        """
+        # It is only called once the offset is known
+        return pos - cast(int, self.offset)
+
+    def match(self, *rules: str):
+        """
+        Matches specific rules. While imports are being computed, it keeps track of the end of the consumed prefix
+        (imports, variables and useless lines) as it is removed from the text when there are imports
+        :param rules: Rules to match
+        :raise: ParseError if any of the specified rules matched
+        :return: The first matched rule method's result
+        """
+        result = super(CstParser, self).match(*rules)
+        if self.offset is None:
+            self.prefix_end = self.pos + 1
+        return result
+
+    def expression(self) -> Optional[MatchResult]:
+        """
+        Matches any Gura expression. The first time it is called the imports have been already computed, so the
+        position of the document body in the parsed text is stored
+        :return: Dict with Gura string data
+        """
+        if self.offset is None:
+            # Parsed text is the imported files' content followed by the original text from the end of the prefix
+            self.offset = len(self.text) - len(self.source)
+            self.body_start = self.prefix_end + self.offset
+        return super(CstParser, self).expression()
+
+    def comment(self) -> MatchResult:
+        """
+        Matches with a comment storing its span
+        :return: MatchResult indicating the presence of a comment
+        """
+        start = self.pos + 1
+        result = super(CstParser, self).comment()
+        end = self.pos + 1 if self.text[self.pos] not in '\f\v\r\n' else self.pos
+        if self.offset is None:
+            # Imports are still being computed, positions are already the original ones
+            self.comments[start] = end
+        elif start >= self.body_start:
+            self.comments[self.__to_source_pos(start)] = self.__to_source_pos(end)
+        return result
+
+    def list(self) -> MatchResult:
+        """
+        Matches with a list. Pairs of the objects inside the list are not collected
+        :return: Matched list
+        """
+        self.node_stack.append([])
+        try:
+            return super(CstParser, self).list()
+        finally:
+            self.node_stack.pop()
+
+    def pair(self) -> Optional[MatchResult]:
+        """
+        Matches with a key-value pair collecting a node with its spans
+        :return: Matched key-value pair. None if the indentation level is lower than the last one
+        """
+        start = self.pos + 1
+        children: List[CstNode] = []
+        self.node_stack.append(children)
+        try:
+            result = super(CstParser, self).pair()
+        finally:
+            self.node_stack.pop()
+
+        if result is None:
+            return None
+
+        key, value, indentation = result.value
+        key_start = start + indentation
+        if key_start < self.body_start:
+            # Pair comes from an imported file
+            if len(self.node_stack) == 1:
+                self.imported_keys.add(key)
+            return result
+
+        key_start = self.__to_source_pos(key_start)
+        value_start = key_start + len(key) + 1  # +1 for the colon
+        if len(children) > 0:
+            value_start = children[0].start
+            value_end = children[-1].value_end
+            end = children[-1].end
+        else:
+            value_text = self.source[value_start:self.__to_source_pos(self.pos + 1)]
+            value_end = value_start + len(value_text.rstrip())
+            value_start += len(value_text) - len(value_text.lstrip(' \t'))
+
+            # The rest of the line (i.e. a comment) belongs to the pair
+            line_end = self.source.find('\n', value_end)
+            end = line_end + 1 if line_end != -1 else len(self.source)
+
+        node = CstNode(key, indentation, self.source.rfind('\n', 0, key_start) + 1, end, key_start, value_start,
+                       value_end, isinstance(value, dict), children)
+        self.node_stack[-1].append(node)
+        return result
+
+
+class GuraDocument:
+    """
+    Lossless representation of a Gura text. Edits (set, delete and insert of keys) are stored as patches to the
+    affected ranges of the original text, which are applied in a single pass when the text is requested
+    """
+    source: str
+    root: CstNode
+    comments: List[Tuple[int, int]]
+    imported_keys: Set[str]
+
+    def __init__(self, source: str, root: CstNode, comments: List[Tuple[int, int]], imported_keys: Set[str]):
+        self.source = source
+        self.root = root
+        self.comments = comments
+        self.imported_keys = imported_keys
+        self.__text: Optional[str] = source
+
+    def __str__(self):
+        return self.text
+
+    @staticmethod
+    def __split_path(path: KeyPath) -> Tuple[str, ...]:
+        """
+        Gets the keys of a path
+        :param path: Path as a tuple of keys or as a string with keys separated by dots
+        :return: Tuple of keys
+        """
+        keys = tuple(path.split('.')) if isinstance(path, str) else tuple(path)
+        if len(keys) == 0:
+            raise KeyError(path)
+        return keys
+
+    def node(self, path: KeyPath) -> CstNode:
+        """
+        Gets the node of an existing pair of the original text
+        :param path: Path to the pair
+        :raise: KeyError if the pair does not exist in the original text or has been deleted
+        :return: Node with the spans of the pair
+        """
+        node = self.root
+        for key in self.__split_path(path):
+            child = node.children.get(key)
+            if child is None or child.deleted:
+                raise KeyError(path)
+            node = child
+        return node
+
+    def set(self, path: KeyPath, value: Any):
+        """
+        Sets the value of a key, inserting it at the end of its parent object if it does not exist
+        :param path: Path to the key
+        :param value: New value
+        :raise: KeyError if some of the parents of the key does not exist
+        :raise: TypeError if the parent of the key is not an object
+        """
+        *parent_keys, key = self.__split_path(path)
+        if len(parent_keys) == 0 and key in self.imported_keys:
+            raise KeyError(f'The key "{key}" is defined in an imported file')
+
+        parent, pending = self.__get_parent(parent_keys, path)
+        if pending is not None:
+            pending[key] = value
+        elif key in parent.inserted:
+            parent.inserted[key] = value
+        elif key in parent.children:
+            node = parent.children[key]
+            node.deleted = False
+            node.replaced = True
+            node.new_value = value
+        elif not parent.is_object:
+            raise TypeError(f'The value of "{parent.key}" is not an object')
+        elif len(parent.children) == 0 and parent is not self.root:
+            # It is an empty object
+            parent.replaced = True
+            parent.new_value = {key: value}
+        else:
+            parent.inserted[key] = value
+        self.__text = None
+
+    def delete(self, path: KeyPath):
+        """
+        Removes a key (and all its lines) from the document
+        :param path: Path to the key
+        :raise: KeyError if the key does not exist
+        """
+        *parent_keys, key = self.__split_path(path)
+        parent, pending = self.__get_parent(parent_keys, path)
+        if pending is not None:
+            del pending[key]
+        elif key in parent.inserted:
+            del parent.inserted[key]
+        else:
+            node = parent.children.get(key)
+            if node is None or node.deleted:
+                raise KeyError(path)
+            node.deleted = True
+        self.__text = None
+
+    def __get_parent(self, parent_keys: List[str], path: KeyPath) -> Tuple[CstNode, Optional[Dict]]:
+        """
+        Gets the parent of a key. If it (or any of its ancestors) is a pending new value, the dict which has to be
+        modified is returned
+        :param parent_keys: Keys of the parent of the key
+        :param path: Full path to report errors
+        :raise: KeyError if some of the parents does not exist
+        :return: Tuple with the last parent node and, if exists, the dict of pending values where the key is
+        """
+        node = self.root
+        pending = None
+        for key in parent_keys:
+            if pending is None:
+                if key in node.inserted:
+                    pending = node.inserted[key]
+                else:
+                    child = node.children.get(key)
+                    if child is None or child.deleted:
+                        raise KeyError(path)
+                    node = child
+                    if node.replaced:
+                        pending = node.new_value
+            else:
+                pending = pending[key]
+
+            if pending is not None and not isinstance(pending, dict):
+                raise TypeError(f'The value of "{key}" is not an object')
+        return node, pending
+
+    @property
+    def text(self) -> str:
+        """
+        Gets the text of the document with all the edits applied
+        :return: Gura text
+        """
+        if self.__text is None:
+            edits: List[Tuple[int, int, str]] = []
+            self.__collect_edits(self.root, edits)
+            edits.sort(key=lambda edit: (edit[0], edit[1]))
+
+            chunks = []
+            last_end = 0
+            for start, end, replacement in edits:
+                chunks.append(self.source[last_end:start])
+                chunks.append(replacement)
+                last_end = end
+            chunks.append(self.source[last_end:])
+            self.__text = ''.join(chunks)
+        return self.__text
+
+    @staticmethod
+    def __render_pairs(values: Dict[str, Any], indentation: str) -> str:
+        """
+        Generates the Gura text of some key/value pairs
+        :param values: Pairs to render
+        :param indentation: Indentation of the pairs
+        :return: Gura text without a final new line
+        """
+        return indentation + ''.join(GuraParser().dump_value(values, indentation))
+
+    def __collect_edits(self, node: CstNode, edits: List[Tuple[int, int, str]]):
+        """
+        Gets the patches of a node and its children
+        :param node: Node to check
+        :param edits: List where the patches (start, end and replacement) are added
+        """
+        if node.replaced:
+            indentation = ' ' * node.indentation
+            rendered = self.__render_pairs({node.key: node.new_value}, indentation)
+            edits.append((node.key_end + 1, node.value_end, rendered[len(indentation) + len(node.key) + 1:]))
+            return
+
+        remaining = [child for child in node.children.values() if not child.deleted]
+        if node is not self.root and len(node.children) > 0 and len(remaining) == 0 and len(node.inserted) == 0:
+            # An object without pairs is an empty object
+            edits.append((node.key_end + 1, node.value_end, ' empty'))
+            return
+
+        for child in node.children.values():
+            if child.deleted:
+                edits.append((child.start, child.end, ''))
+            else:
+                self.__collect_edits(child, edits)
+
+        if len(node.inserted) > 0:
+            last_child = list(node.children.values())[-1] if len(node.children) > 0 else None
+            position = last_child.end if last_child is not None else len(self.source)
+            rendered = self.__render_pairs(node.inserted, ' ' * (node.indentation + len(INDENT)))
+            # Pairs inserted in a nested object can end at the same position, right before these ones
+            previous = next((replacement for start, end, replacement in reversed(edits)
+                             if start == end == position and len(replacement) > 0), self.source[:position])
+            if len(previous) > 0 and previous[-1] not in '\f\v\r\n':
+                rendered = '\n' + rendered
+            elif position < len(self.source):
+                rendered += '\n'
+            edits.append((position, position, rendered))
+
+
+def loads_document(text: str) -> GuraDocument:
+    """
+    Parses a text in Gura format into a lossless document that keeps comments and formatting
+    :param text: Text to be parsed
+    :raise: ParseError if the syntax of text is invalid
+    :return: Document with the spans of all the pairs and comments, where edits can be applied
+    """
+    return CstParser().parse(text)
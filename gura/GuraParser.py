@@ -1,7 +1,19 @@
+import copy
 import os
-from typing import Dict, Any, Optional, List, Set, Tuple
+import re
+import sys
+from array import array
+from decimal import Decimal
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Set, Tuple, Iterator, TextIO, Callable, Mapping, FrozenSet, Generator, \
+    Type, Match
 from gura.Parser import ParseError, Parser, GuraError
+from gura.Positions import PositionMap
+from gura.TypeDecoder import TypeDecoder, get_decoder, dataclass_fields
+from gura.Specializer import specialize
 from enum import Enum, auto
+from functools import lru_cache
 
 
 class DuplicatedImportError(GuraError):
@@ -29,6 +41,11 @@ class InvalidIndentationError(GuraError):
     pass
 
 
+class InvalidTypeError(GuraError):
+    """Raises when an object can not be converted into the requested type"""
+    pass
+
+
 # Number chars
 BASIC_NUMBERS_CHARS = '0-9'
 HEX_OCT_BIN = 'A-Fa-fxob'
@@ -36,6 +53,34 @@ INF_AND_NAN = 'in'  # The rest of the chars are defined in hex_oct_bin
 # IMPORTANT: '-' char must be last, otherwise it will be interpreted as a range
 ACCEPTABLE_NUMBER_CHARS = BASIC_NUMBERS_CHARS + HEX_OCT_BIN + INF_AND_NAN + 'Ee+._-'
 
+# Useless lines (blanks and comments) between the elements of an array, the numbers of a flat numeric array and the
+# separators and ending of the array, for the fast numeric arrays scanner
+ARRAY_USELESS_LINES = r'(?:[ \t]*(?:#[^\f\v\r\n]*)?[\f\v\r\n])*'
+NUMERIC_ELEMENT_REGEX = re.compile(ARRAY_USELESS_LINES + r'[ \t]*([0-9A-Fa-fxobin+._Ee-]+)[ \t]*')
+NUMERIC_SEPARATOR_REGEX = re.compile(r'[\f\v\r\n]?,')
+NUMERIC_ARRAY_END_REGEX = re.compile(r'[\f\v\r\n]?[ \t]*[\f\v\r\n]?]')
+NUMERIC_ARRAY_END_AFTER_COMMA_REGEX = re.compile(ARRAY_USELESS_LINES + r' *]')
+
+# Regexes for the fast path of arrays of scalars. Comments are left to the general path, so subclasses can collect them
+ARRAY_ELEMENT_START_REGEX = re.compile(r'(?:[ \t]*[\f\v\r\n])*([ \t]*)')
+ARRAY_SEPARATOR_REGEX = re.compile(r'[ \t]*[\f\v\r\n]?,')
+ARRAY_END_REGEX = re.compile(r'[ \t]*[\f\v\r\n]?[ \t]*[\f\v\r\n]?]')
+NUMBER_REGEX = re.compile(r'[0-9A-Fa-fxobin+._Ee-]+')
+FLOAT_CHARS_REGEX = re.compile(r'[Ee.]')
+SIMPLE_BASIC_STRING_REGEX = re.compile(r'"([^"\\$\f\v\r\n]*)"')
+SIMPLE_LITERAL_STRING_REGEX = re.compile(r"'([^'\f\v\r\n]*)'")
+NEW_LINE_CHARS = '\f\v\r\n'
+
+# Values of the keywords that can be elements of an array ('empty' is excluded as it must be a new dict every time)
+SCALAR_KEYWORDS = {'null': None, 'true': True, 'false': False}
+
+# Leading blanks of a line: spaces and, if there is one, the first tab (which is not allowed in indentation)
+INDENTATION_REGEX = re.compile(r'( *)(\t?)')
+WS_REGEX = re.compile(r'[ \t]*')
+
+# Kinds of compact numeric arrays
+NUMERIC_ARRAYS_KINDS = ('array', 'numpy')
+
 # Acceptable chars for keys
 KEY_ACCEPTABLE_CHARS = '0-9A-Za-z_'
 
@@ -62,10 +107,122 @@ SEQUENCES_TO_ESCAPE = {
     '"': '\\"',
     '$': '\\$',
 }
+ESCAPE_TRANSLATION = str.maketrans(SEQUENCES_TO_ESCAPE)
 
 # Indentation of 4 spaces
 INDENT = '    '
 
+# Default size of the chunks generated by iterdumps()
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Number of elements of an array in the same line which are yielded as a single piece by dump_value()
+INLINE_GROUP_SIZE = 1024
+
+
+class EncoderType(Enum):
+    SCALAR = auto()  # Encoding function returns the Gura representation of the value
+    OBJECT = auto()  # Encoding function returns a sized collection of key/value pairs
+    ARRAY = auto()  # Encoding function returns a sequence of values
+    CONVERSION = auto()  # Encoding function returns another value to be dumped in place of the original one
+
+
+# Encoder type and encoding function
+Encoder = Tuple[EncoderType, Callable[[Any], Any]]
+
+
+def encode_string(value: str) -> str:
+    """
+    Gets the Gura representation of a string escaping everything that needs to be escaped
+    :param value: String to encode
+    :return: Quoted and escaped string
+    """
+    return f'"{value.translate(ESCAPE_TRANSLATION)}"'
+
+
+def encode_decimal(value: Decimal) -> str:
+    """
+    Gets the Gura representation of a Decimal value
+    :param value: Decimal to encode
+    :return: Number as string
+    """
+    if value.is_nan():
+        return 'nan'
+    if value.is_infinite():
+        return '-inf' if value.is_signed() else 'inf'
+    return str(value)
+
+
+# Encoders of the types natively supported
+BUILTIN_ENCODERS: Dict[type, Encoder] = {
+    type(None): (EncoderType.SCALAR, lambda _value: 'null'),
+    str: (EncoderType.SCALAR, encode_string),
+    bool: (EncoderType.SCALAR, lambda value: 'true' if value else 'false'),
+    int: (EncoderType.SCALAR, int.__repr__),
+    float: (EncoderType.SCALAR, float.__repr__),
+    Decimal: (EncoderType.SCALAR, encode_decimal),
+    dict: (EncoderType.OBJECT, dict.items),
+    list: (EncoderType.ARRAY, lambda value: value),
+    tuple: (EncoderType.ARRAY, lambda value: value),
+    array: (EncoderType.ARRAY, lambda value: value),
+}
+
+# Marker for types that must be converted with the default function of the dumper (its own function is never called)
+DEFAULT_ENCODER: Encoder = (EncoderType.CONVERSION, lambda value: value)
+
+# Conversion functions registered with register_encoder()
+CUSTOM_ENCODERS: Dict[type, Callable[[Any], Any]] = {}
+
+# Encoders by exact type. Encoders for other types are generated and cached the first time they are dumped
+ENCODERS: Dict[type, Encoder] = dict(BUILTIN_ENCODERS)
+
+
+def generate_encoder(value_type: type) -> Encoder:
+    """
+    Generates the encoder for a type which is not natively supported. Registered types, dataclasses, NamedTuples and
+    enums have their own encoders, subclasses of supported types use the encoder of their parent
+    :param value_type: Type to generate the encoder for
+    :return: Encoder for the type. DEFAULT_ENCODER if the type is not supported
+    """
+    for base in value_type.__mro__:
+        if base in CUSTOM_ENCODERS:
+            return EncoderType.CONVERSION, CUSTOM_ENCODERS[base]
+
+    fields = dataclass_fields(value_type)
+    if fields is not None:
+        names = tuple(field.name for field in fields)
+        if len(names) == 1:
+            name = names[0]
+            return EncoderType.OBJECT, lambda value: ((name, getattr(value, name)),)
+        getter = attrgetter(*names) if len(names) > 0 else lambda _value: ()
+        return EncoderType.OBJECT, lambda value: tuple(zip(names, getter(value)))
+
+    if issubclass(value_type, tuple) and hasattr(value_type, '_fields'):
+        names = value_type._fields
+        return EncoderType.OBJECT, lambda value: tuple(zip(names, value))
+
+    if issubclass(value_type, Enum):
+        return EncoderType.CONVERSION, attrgetter('value')
+
+    for base in value_type.__mro__:
+        if base in BUILTIN_ENCODERS:
+            return BUILTIN_ENCODERS[base]
+
+    return DEFAULT_ENCODER
+
+
+def register_encoder(value_type: type, encoder: Callable[[Any], Any]):
+    """
+    Registers a function to convert the values of a type (and its subclasses) into values that can be dumped. Natively
+    supported types can not be overridden
+    :param value_type: Type of the values to convert
+    :param encoder: Function that receives a value and returns the value to be dumped in its place
+    """
+    CUSTOM_ENCODERS[value_type] = encoder
+
+    # Generated encoders could be outdated
+    ENCODERS.clear()
+    ENCODERS.update(BUILTIN_ENCODERS)
+
 
 class MatchResultType(Enum):
     USELESS_LINE = auto(),
@@ -80,7 +237,7 @@ class MatchResultType(Enum):
 
 class MatchResult:
     result_type: MatchResultType
-    value: Optional[Any]
+    value: Any
 
     def __init__(self, result_type: MatchResultType, value: Optional[Any] = None):
         self.result_type = result_type
@@ -90,28 +247,188 @@ class MatchResult:
         return f'{self.result_type} -> {self.value}'
 
 
+# Generator of a rule result which yields the generators of its nested rules (see GuraParser.__run_generators())
+RuleGenerator = Generator['RuleGenerator', Any, Any]
+
+
+class GuraPrelude:
+    """
+    Variables, imported files and values of a Gura text (usually variables definitions and imports) compiled once to be
+    used as context of other texts, as if it were at their beginning. It must not be modified
+    """
+    variables: Mapping[str, Any]
+    values: Mapping[str, Any]
+    imported_files: FrozenSet[str]
+
+    def __init__(self, variables: Dict[str, Any], values: Dict[str, Any], imported_files: Set[str]):
+        self.variables = MappingProxyType(dict(variables))
+        self.values = MappingProxyType(dict(values))
+        self.imported_files = frozenset(imported_files)
+
+
 class GuraParser(Parser):
+    initial_variables: Dict[str, Any]
     variables: Dict[str, Any]
     indentation_levels: List[int]
     imported_files: Set[str]
-
-    def __init__(self):
+    default: Optional[Callable[[Any], Any]]
+    into: Optional[Any]
+    object_hook: Optional[Callable[[Dict], Any]]
+    object_pairs_hook: Optional[Callable[[List[Tuple[str, Any]]], Any]]
+    parse_float: Optional[Callable[[str], Any]]
+    parse_int: Optional[Callable[[str], Any]]
+    numeric_arrays: Optional[str]
+    env: Optional[Mapping[str, str]]
+    context: Optional[GuraPrelude]
+    iterative: bool
+    environment: Optional[Mapping[str, str]]
+    decoders: Optional[List[Optional[TypeDecoder]]]
+    convert_objects: bool
+    indentations: Dict[int, Tuple[int, bool]]
+    import_cache: Optional[Dict[str, Tuple[int, int, str]]]
+    positions: bool
+    position_map: Optional[PositionMap]
+
+    def __init__(
+            self,
+            default: Optional[Callable[[Any], Any]] = None,
+            into: Optional[Any] = None,
+            object_hook: Optional[Callable[[Dict], Any]] = None,
+            object_pairs_hook: Optional[Callable[[List[Tuple[str, Any]]], Any]] = None,
+            parse_float: Optional[Callable[[str], Any]] = None,
+            parse_int: Optional[Callable[[str], Any]] = None,
+            numeric_arrays: Optional[str] = None,
+            env: Optional[Mapping[str, str]] = None,
+            variables: Optional[Dict[str, Any]] = None,
+            context: Optional[GuraPrelude] = None,
+            iterative: bool = False,
+            import_cache: Optional[Dict[str, Tuple[int, int, str]]] = None,
+            positions: bool = False
+    ):
         super(GuraParser, self).__init__()
-        self.variables = {}
+        if numeric_arrays is not None and numeric_arrays not in NUMERIC_ARRAYS_KINDS:
+            raise ValueError(f'numeric_arrays must be one of {", ".join(NUMERIC_ARRAYS_KINDS)} or None')
+
+        self.initial_variables = dict(variables) if variables is not None else {}
+        self.context = context
+        if context is not None:
+            self.initial_variables.update(context.variables)
+        self.default = default
+        self.into = into
+        self.object_hook = object_hook
+        self.object_pairs_hook = object_pairs_hook
+        self.parse_float = parse_float
+        self.parse_int = parse_int
+        self.numeric_arrays = numeric_arrays
+        self.env = env
+        self.iterative = iterative
+        self.import_cache = import_cache
+        self.positions = positions
+        self.reset()
+
+    def reset(self):
+        """
+        Restores the state the parser had when it was created, discarding the one left by the last parsed text (even
+        if it raised an error): variables and imported files are only the initial ones (from variables and context
+        arguments) and the text is released. loads() calls it before parsing, so an instance can be reused for many
+        texts, but not by several threads at the same time (see ParserPool)
+        """
+        self.variables = dict(self.initial_variables)
+        self.imported_files = set(self.context.imported_files) if self.context is not None else set()
         self.indentation_levels = []
-        self.imported_files = set()
+        self.environment = None
+        self.decoders = None
+        self.convert_objects = False
+        self.position_map = None
+        self.__restart_params('')
 
     def loads(self, text: str) -> Dict:
         """
         Parses a text in Gura format
         :param text: Text to be parsed
         :raise: ParseError if the syntax of text is invalid
-        :return: Dict with all the parsed values
+        :raise: InvalidTypeError if the parsed objects can not be converted into the type specified in `into`
+        :return: Dict with all the parsed values (or an instance of `into` type if it was specified)
         """
+        self.reset()
         self.__restart_params(text)
+
+        # The environment is taken (from env or as a snapshot of os.environ) the first time it is needed
+        self.environment = self.env
+
+        # Stack with the decoders of the objects being parsed
+        root_decoder = get_decoder(self.into) if self.into is not None else None
+        self.decoders = [root_decoder] if root_decoder is not None else None
+        self.convert_objects = root_decoder is not None or self.object_hook is not None \
+            or self.object_pairs_hook is not None
+
+        # Table with the positions of the pairs, available in position_map after parsing
+        if self.positions:
+            self.position_map = PositionMap()
+
         result = self.start()
         self.assert_end()
-        return result if result is not None else {}
+        if self.position_map is not None:
+            self.position_map.finish(text)
+        result = result if result is not None else {}
+        if self.context is not None and len(self.context.values) > 0:
+            result = self.__merge_context_values(result, self.context)
+        if self.convert_objects:
+            result = self.__convert_object(result, root_decoder, 0, 1)
+        return result
+
+    def compile_prelude(self, text: str) -> GuraPrelude:
+        """
+        Parses a text in Gura format to be used as context of other texts
+        :param text: Text to be parsed
+        :raise: ParseError if the syntax of text is invalid
+        :return: Prelude with the defined variables, the imported files and the parsed values
+        """
+        values = self.loads(text)
+        return GuraPrelude(self.variables, values, self.imported_files)
+
+    def __merge_context_values(self, values: Dict, context: GuraPrelude) -> Dict:
+        """
+        Adds the values of the context before the parsed ones
+        :param values: Parsed values
+        :param context: Prelude whose values are added
+        :raise: DuplicatedKeyError if a key of the parsed values was defined in the context
+        :return: New dict with the values of the context (copied, so the context is not modified) and the parsed ones
+        """
+        result = copy.deepcopy(dict(context.values))
+        for key, value in values.items():
+            if key in result:
+                key_match = re.search(rf'^{re.escape(key)}[ \t]*:', self.text, re.MULTILINE)
+                pos = key_match.start() if key_match is not None else 0
+                raise DuplicatedKeyError(
+                    pos + 1,
+                    self.text.count('\n', 0, pos) + 1,
+                    f'The key "{key}" has been already defined'
+                )
+            result[key] = value
+        return result
+
+    def __convert_object(self, values: Dict, decoder: Optional[TypeDecoder], position: int, line: int) -> Any:
+        """
+        Converts a parsed object with its type decoder or, if it has none, with the object hooks
+        :param values: Parsed object
+        :param decoder: Decoder of the type of the object
+        :param position: Current position to report Exception (if needed)
+        :param line: Current line to report Exception (if needed)
+        :raise: InvalidTypeError if the instance could not be built with the parsed values
+        :return: Converted object
+        """
+        if decoder is not None and decoder.build is not None:
+            try:
+                return decoder.build(values)
+            except (TypeError, AttributeError) as e:
+                raise InvalidTypeError(position, line, f'Object could not be converted: {e}')
+
+        if self.object_pairs_hook is not None:
+            return self.object_pairs_hook(list(values.items()))
+        if self.object_hook is not None:
+            return self.object_hook(values)
+        return values
 
     def __restart_params(self, text: str):
         """
@@ -122,6 +439,7 @@ class GuraParser(Parser):
         self.pos = -1
         self.line = 1
         self.len = len(text) - 1
+        self.indentations = {}
 
     def new_line(self):
         """Matches with a new line"""
@@ -145,33 +463,34 @@ class GuraParser(Parser):
 
     def ws_with_indentation(self) -> int:
         """
-        Matches with white spaces taking into consideration indentation levels
+        Matches with white spaces taking into consideration indentation levels. The indentation of every position is
+        computed only once, as the same line is matched again by every parent object when a block is closed
         :return Indentation level
         """
-        current_indentation_level = 0
-
-        while self.pos < self.len:
-            blank = self.maybe_keyword(' ', '\t')
-            if blank is None:
-                # If it is not a blank or new line, returns from the method
-                break
-
-            # Tabs are not allowed
-            if blank == '\t':
-                raise InvalidIndentationError(
-                    self.pos,
-                    self.line,
-                    'Tabs are not allowed to define indentation blocks'
-                )
-
-            current_indentation_level += 1
+        start = self.pos + 1
+        indentation = self.indentations.get(start)
+        if indentation is None:
+            # The regex can match an empty string, so it always matches
+            spaces, tab = INDENTATION_REGEX.match(self.text, start).groups()  # type: ignore[union-attr]
+            indentation = (len(spaces), tab != '')
+            self.indentations[start] = indentation
+
+        current_indentation_level, has_tab = indentation
+        self.pos += current_indentation_level
+
+        # Tabs are not allowed
+        if has_tab:
+            raise InvalidIndentationError(
+                self.pos + 1,
+                self.line,
+                'Tabs are not allowed to define indentation blocks'
+            )
 
         return current_indentation_level
 
     def ws(self):
         """Matches white spaces (blanks and tabs)"""
-        while self.maybe_keyword(' ', '\t') is not None:
-            pass
+        self.pos = WS_REGEX.match(self.text, self.pos + 1).end() - 1
 
     def eat_ws_and_new_lines(self):
         """Consumes all the whitespaces and new lines"""
@@ -270,26 +589,54 @@ class GuraParser(Parser):
                         f'The file "{file_to_import}" has been already imported'
                     )
 
-                with open(file_to_import, 'r') as f:
-                    # Gets content considering imports
-                    content = f.read()
-                    aux_parser = GuraParser()
-                    parent_dir_path = os.path.dirname(file_to_import)
-                    content_with_import = aux_parser.get_text_with_imports(content, parent_dir_path)
-                    final_content += content_with_import + '\n'
+                # Gets content considering imports
+                content = self.__read_imported_file(file_to_import)
+                aux_parser = GuraParser(env=self.environment, iterative=self.iterative, import_cache=self.import_cache)
+                parent_dir_path = os.path.dirname(file_to_import)
+                content_with_import = aux_parser.get_text_with_imports(content, parent_dir_path)
+                final_content += content_with_import + '\n'
+
+                self.imported_files.add(file_to_import)
 
-                    self.imported_files.add(file_to_import)
+            if self.position_map is not None:
+                self.position_map.set_imported(len(final_content), self.pos + 1)
 
             # Sets as new text
             self.__restart_params(final_content + self.text[self.pos + 1:])
 
+    def __read_imported_file(self, file_path: str) -> str:
+        """
+        Reads the content of an imported file. If there is an import cache, the content is kept there and reused while
+        the file is not modified (same modification time and size)
+        :param file_path: Path of the file
+        :raise: OSError if the file can not be read
+        :return: File content
+        """
+        if self.import_cache is None:
+            with open(file_path, 'r') as f:
+                return f.read()
+
+        stat = os.stat(file_path)
+        cached = self.import_cache.get(file_path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        with open(file_path, 'r') as f:
+            content = f.read()
+        self.import_cache[file_path] = (stat.st_mtime_ns, stat.st_size, content)
+        return content
+
     def start(self) -> Dict:
         """
         Computes imports and matches the first expression of the file. Finally consumes all the useless lines
         :return: Dict with all the extracted values from Gura string
         """
         self.__compute_imports(parent_dir_path=None)
-        result: Optional[MatchResult] = self.match('expression')
+        result: Optional[MatchResult]
+        if self.iterative:
+            result = self.__run_generators(self.__expression_generator())
+        else:
+            result = self.match('expression')
         self.eat_ws_and_new_lines()
         return result.value[0] if result is not None else None
 
@@ -324,7 +671,9 @@ class GuraParser(Parser):
 
     def __get_variable_value(self, key: str, position: int, line: int) -> Any:
         """
-        Gets a variable value for a specific key from defined variables in file or as environment variable
+        Gets a variable value for a specific key from defined variables in file or as environment variable. Environment
+        variables are taken from the env mapping or, if it was not specified, from a snapshot of os.environ taken once
+        per call to loads()
         :param key: Key to retrieve
         :param position: Current position to report Exception (if needed)
         :param line: Current line to report Exception (if needed)
@@ -334,7 +683,10 @@ class GuraParser(Parser):
         if key in self.variables:
             return self.variables[key]
 
-        env_variable = os.getenv(key)
+        if self.environment is None:
+            self.environment = os.environ.copy()
+
+        env_variable = self.environment.get(key)
         if env_variable is not None:
             return env_variable
 
@@ -385,36 +737,248 @@ class GuraParser(Parser):
         Matches with a list
         :return: Matched list
         """
-        result = []
+        result: List[Any] = []
 
         self.maybe_match('ws')
         self.keyword('[')
-        while True:
-            # Discards useless lines between elements of array
-            useless_line = self.maybe_match('useless_line')
-            if useless_line is not None:
-                continue
 
-            item = self.maybe_match('any_type')
-            if item is None:
-                break
+        # Custom parse functions need every number to be parsed on its own
+        if self.numeric_arrays is not None and self.parse_int is None and self.parse_float is None:
+            numeric_array = self.__numeric_array()
+            if numeric_array is not None:
+                return MatchResult(MatchResultType.LIST, numeric_array)
 
-            if item.result_type == MatchResultType.EXPRESSION:
-                item = item.value[0]
-            else:
-                item = item.value
+        element_decoder = None
+        if self.decoders is not None:
+            list_decoder = self.decoders[-1]
+            element_decoder = list_decoder.element() if list_decoder is not None else None
+            self.decoders.append(element_decoder)
 
-            result.append(item)
+        try:
+            is_complete = self.__scalar_elements(result, element_decoder)
+            while not is_complete:
+                # Discards useless lines between elements of array
+                useless_line = self.maybe_match('useless_line')
+                if useless_line is not None:
+                    continue
 
-            self.maybe_match('ws')
-            self.maybe_match('new_line')
-            if not self.maybe_keyword(','):
-                break
+                initial_pos = self.pos
+                initial_line = self.line
+                item = self.maybe_match('any_type')
+                if item is None:
+                    break
+
+                if not self.__add_element(result, item, element_decoder, initial_pos, initial_line):
+                    break
+        finally:
+            if self.decoders is not None:
+                self.decoders.pop()
+
+        if not is_complete:
+            self.__list_end()
+        return MatchResult(MatchResultType.LIST, result)
+
+    def __add_element(
+            self,
+            result: List,
+            item: MatchResult,
+            element_decoder: Optional[TypeDecoder],
+            initial_pos: int,
+            initial_line: int
+    ) -> bool:
+        """
+        Adds a matched element to a list and consumes the separator that follows it
+        :param result: List where the element is added
+        :param item: Matched element
+        :param element_decoder: Decoder of the elements
+        :param initial_pos: Position where the element starts
+        :param initial_line: Line where the element starts
+        :return: True if the element is followed by a comma, False otherwise
+        """
+        if self.position_map is not None and item.result_type in (MatchResultType.EXPRESSION, MatchResultType.LIST):
+            # Objects and arrays are recorded so the pairs inside them have a path
+            self.position_map.add(self.text, len(result), -1, initial_pos + 1, self.pos + 1,
+                                  item.result_type == MatchResultType.EXPRESSION)
+
+        if item.result_type == MatchResultType.EXPRESSION:
+            value = item.value[0]
+        else:
+            value = item.value
+
+        if self.convert_objects and isinstance(value, dict):
+            value = self.__convert_object(value, element_decoder, initial_pos + 1, initial_line)
+
+        result.append(value)
 
+        self.maybe_match('ws')
+        self.maybe_match('new_line')
+        return self.maybe_keyword(',') is not None
+
+    def __list_end(self):
+        """
+        Matches the end of a list
+        :raise: ParseError if the closing bracket is missing
+        """
         self.maybe_match('ws')
         self.maybe_match('new_line')
         self.keyword(']')
-        return MatchResult(MatchResultType.LIST, result)
+
+    def __scalar_elements(self, result: List, element_decoder: Optional[TypeDecoder]) -> bool:
+        """
+        Fast path for the elements of an array. Scalars are matched directly from their first char, without trying
+        every rule. It stops at the first element that is not a scalar (i.e. a nested array or object) or does not
+        match as expected, leaving the parser at the start of that element so the general path can continue
+        :param result: List where parsed elements are appended
+        :param element_decoder: Decoder of the elements to convert empty objects (if needed)
+        :return: True if the whole array (including its closing bracket) was consumed, False otherwise
+        """
+        text = self.text
+        while True:
+            checkpoint_pos = self.pos
+            checkpoint_line = self.line
+
+            # The regex can match an empty string, so it always matches
+            start: Match[str] = ARRAY_ELEMENT_START_REGEX.match(text, self.pos + 1)  # type: ignore[assignment]
+            pos = start.end()
+            if pos > self.len:
+                return False
+
+            char = text[pos]
+            if char == ']' and '\t' in start.group(1):
+                # The general path tries to match an object there, raising an indentation error
+                return False
+
+            self.line += self.__count_new_lines(start.start(), pos)
+            if char == ']':
+                self.pos = pos
+                return True
+            self.pos = pos - 1
+
+            item: Any
+            try:
+                if char in 'ntf' and text.startswith(('null', 'true', 'false'), pos):
+                    keyword = 'null' if char == 'n' else 'true' if char == 't' else 'false'
+                    item = SCALAR_KEYWORDS[keyword]
+                    self.pos += len(keyword)
+                elif char == 'e' and text.startswith('empty', pos):
+                    item = {}
+                    if self.convert_objects:
+                        item = self.__convert_object(item, element_decoder, pos + 1, self.line)
+                    self.pos += len('empty')
+                elif char == '"':
+                    simple_string = SIMPLE_BASIC_STRING_REGEX.match(text, pos)
+                    if simple_string is not None and not text.startswith(char * 3, pos):
+                        item = simple_string.group(1)
+                        self.pos = simple_string.end() - 1
+                    else:
+                        item = self.basic_string().value
+                elif char == "'":
+                    simple_string = SIMPLE_LITERAL_STRING_REGEX.match(text, pos)
+                    if simple_string is not None and not text.startswith(char * 3, pos):
+                        item = simple_string.group(1)
+                        self.pos = simple_string.end() - 1
+                    else:
+                        item = self.literal_string().value
+                elif char == '$':
+                    item = self.variable_value().value
+                else:
+                    number_match = NUMBER_REGEX.match(text, pos)
+                    if number_match is None:
+                        # Nested array, object or comment
+                        raise ParseError(pos + 1, self.line, 'Expected a scalar value')
+                    number = number_match.group()
+                    number_type = float if FLOAT_CHARS_REGEX.search(number, 1) is not None else int
+                    item = self.__number_value(number, number_type)
+                    self.pos = pos + len(number) - 1
+
+                separator = ARRAY_SEPARATOR_REGEX.match(text, self.pos + 1)
+                if separator is None:
+                    end = ARRAY_END_REGEX.match(text, self.pos + 1)
+                    if end is None:
+                        raise ParseError(self.pos + 1, self.line, 'Expected "," or "]"')
+                    self.line += self.__count_new_lines(self.pos + 1, end.end())
+                    self.pos = end.end() - 1
+                    result.append(item)
+                    return True
+
+                self.line += self.__count_new_lines(self.pos + 1, separator.end())
+                self.pos = separator.end() - 1
+                result.append(item)
+            except ParseError:
+                # The general path goes on from the start of the element
+                self.pos = checkpoint_pos
+                self.line = checkpoint_line
+                return False
+
+    def __count_new_lines(self, start: int, end: int) -> int:
+        """
+        Counts the new line chars in a range of the text
+        :param start: Start of the range
+        :param end: End of the range (excluded)
+        :return: Number of new line chars
+        """
+        if start == end:
+            return 0
+        return sum(self.text.count(new_line_char, start, end) for new_line_char in NEW_LINE_CHARS)
+
+    def __numeric_array(self) -> Optional[Any]:
+        """
+        Scans, from the opening bracket, an array whose elements are all decimal numbers (or inf/nan). If the array
+        ends as expected, the parser is moved to its closing bracket
+        :return: array.array (or NumPy ndarray) of int64 or, if any of the numbers is a float, of doubles. None if the
+        array has other kind of elements or its numbers do not fit in a compact array
+        """
+        text = self.text
+        start = self.pos + 1
+        pos = start
+        numbers = []
+        is_float = False
+        while True:
+            element = NUMERIC_ELEMENT_REGEX.match(text, pos)
+            if element is None:
+                return None
+
+            number = element.group(1)
+            if number[:2] in ('0x', '0o', '0b'):
+                return None
+            try:
+                # Same type inference as number()
+                if FLOAT_CHARS_REGEX.search(number, 1) is not None or number[-3:] in ('inf', 'nan'):
+                    numbers.append(float(number))
+                    is_float = True
+                else:
+                    numbers.append(int(number))
+            except ValueError:
+                # Invalid numbers are reported by the general path
+                return None
+            pos = element.end()
+
+            separator = NUMERIC_SEPARATOR_REGEX.match(text, pos)
+            if separator is None:
+                end = NUMERIC_ARRAY_END_REGEX.match(text, pos)
+                break
+
+            pos = separator.end()
+            end = NUMERIC_ARRAY_END_AFTER_COMMA_REGEX.match(text, pos)
+            if end is not None:
+                break
+
+        if end is None:
+            return None
+
+        try:
+            result: Any = array('d' if is_float else 'q', numbers)
+        except OverflowError:
+            return None
+
+        if self.numeric_arrays == 'numpy':
+            import numpy
+            result = numpy.frombuffer(result, dtype=numpy.float64 if is_float else numpy.int64)
+
+        end_pos = end.end()
+        self.line += sum(text.count(new_line_char, start, end_pos) for new_line_char in '\f\v\r\n')
+        self.pos = end_pos - 1
+        return result
 
     def useless_line(self) -> MatchResult:
         """
@@ -438,13 +1002,13 @@ class GuraParser(Parser):
 
         return MatchResult(MatchResultType.USELESS_LINE)
 
-    def expression(self) -> MatchResult:
+    def expression(self) -> Optional[MatchResult]:
         """
         Match any Gura expression
         :raise: DuplicatedKeyError if any of the defined key was declared more than once
         :return: Dict with Gura string data
         """
-        result = {}
+        result: Dict[str, Any] = {}
         indentation_level = 0
         while self.pos < self.len:
             initial_pos = self.pos
@@ -456,30 +1020,226 @@ class GuraParser(Parser):
                 break
 
             if item.result_type == MatchResultType.PAIR:
-                # It is a key/value pair
-                key, value, indentation = item.value
-                if key in result:
-                    raise DuplicatedKeyError(
-                        initial_pos + 1 + indentation,
-                        initial_line,
-                        f'The key "{key}" has been already defined'
-                    )
+                indentation_level = self.__add_pair(result, item, initial_pos, initial_line)
+
+            if self.__is_list_end():
+                break
 
-                result[key] = value
-                indentation_level = indentation
+        return MatchResult(MatchResultType.EXPRESSION, (result, indentation_level)) if len(result) > 0 else None
 
+    def __add_pair(self, result: Dict, item: MatchResult, initial_pos: int, initial_line: int) -> int:
+        """
+        Adds a matched key/value pair to the values of an expression
+        :param result: Values of the expression
+        :param item: Matched pair
+        :param initial_pos: Position where the pair starts
+        :param initial_line: Line where the pair starts
+        :raise: DuplicatedKeyError if the key was already defined in the expression
+        :return: Indentation level of the pair
+        """
+        key, value, indentation = item.value
+        if key in result:
+            raise DuplicatedKeyError(
+                initial_pos + 1 + indentation,
+                initial_line,
+                f'The key "{key}" has been already defined'
+            )
+
+        result[key] = value
+        return indentation
+
+    def __is_list_end(self) -> bool:
+        """
+        Checks if an expression is followed by the end of a list element (a comma or a closing bracket). In that case
+        the parser is left just before that char
+        :return: True if the expression must finish, False otherwise
+        """
+        initial_pos = self.pos
+        self.maybe_match('ws')
+        if self.maybe_keyword(']', ',') is not None:
+            # Breaks if it is the end of a list
+            self.__remove_last_indentation_level()
+            self.pos -= 1
+            return True
+
+        self.pos = initial_pos
+        return False
+
+    @staticmethod
+    def __run_generators(root: RuleGenerator) -> Any:
+        """
+        Runs the generator of a rule keeping the generators of the nested rules in an explicit stack. When a generator
+        yields another generator, the latter is run and its result (or its exception) is sent back to the former, so
+        nested objects and arrays do not consume frames of the call stack
+        :param root: Generator of the outermost rule
+        :return: Result of the outermost rule
+        """
+        stack = [root]
+        value = None
+        error = None
+        while True:
+            generator = stack[-1]
+            try:
+                if error is None:
+                    nested = generator.send(value)
+                else:
+                    nested_error, error = error, None
+                    nested = generator.throw(nested_error)
+            except StopIteration as e:
+                stack.pop()
+                if len(stack) == 0:
+                    return e.value
+                value = e.value
+                continue
+            except Exception as e:
+                stack.pop()
+                if len(stack) == 0:
+                    raise
+                error = e
+                continue
+
+            stack.append(nested)
+            value = None
+
+    def __expression_generator(self) -> RuleGenerator:
+        """
+        Like expression() but yielding the generator of the nested pairs instead of matching them
+        :return: Generator of the expression result
+        """
+        result: Dict[str, Any] = {}
+        indentation_level = 0
+        while self.pos < self.len:
             initial_pos = self.pos
-            self.maybe_match('ws')
-            if self.maybe_keyword(']', ',') is not None:
-                # Breaks if it is the end of a list
-                self.__remove_last_indentation_level()
-                self.pos -= 1
-                break
-            else:
+            initial_line = self.line
+
+            # Same as match('variable', 'pair', 'useless_line')
+            try:
+                item = self.variable()
+            except ParseError as variable_error:
                 self.pos = initial_pos
+                self.line = initial_line
+                try:
+                    item = yield self.__pair_generator()
+                except ParseError as pair_error:
+                    self.pos = initial_pos
+                    self.line = initial_line
+                    try:
+                        item = self.useless_line()
+                    except ParseError as useless_line_error:
+                        self.pos = initial_pos
+                        self.line = initial_line
+                        raise self.furthest_error([('variable', variable_error), ('pair', pair_error),
+                                                   ('useless_line', useless_line_error)])
+
+            if item is None:
+                break
+
+            if item.result_type == MatchResultType.PAIR:
+                indentation_level = self.__add_pair(result, item, initial_pos, initial_line)
+
+            if self.__is_list_end():
+                break
 
         return MatchResult(MatchResultType.EXPRESSION, (result, indentation_level)) if len(result) > 0 else None
 
+    def __pair_generator(self) -> RuleGenerator:
+        """
+        Like pair() but yielding the generator of the value instead of matching it
+        :return: Generator of the pair result
+        """
+        pair_start = self.__pair_start()
+        if pair_start is None:
+            return None
+
+        key, key_pos, current_indentation_level, initial_pos, initial_line, decoder = pair_start
+        if self.decoders is not None:
+            self.decoders.append(decoder)
+            try:
+                result = yield self.__any_type_generator()
+            finally:
+                self.decoders.pop()
+        else:
+            result = yield self.__any_type_generator()
+
+        return self.__pair_end(key, key_pos, result, current_indentation_level, initial_pos, initial_line, decoder)
+
+    def __any_type_generator(self) -> RuleGenerator:
+        """
+        Like any_type() but yielding the generators of lists and expressions instead of matching them
+        :return: Generator of the matched value
+        """
+        result: Optional[MatchResult] = self.maybe_match('primitive_type')
+        if result is not None:
+            return result
+
+        # Same as match('list', 'expression')
+        initial_pos = self.pos
+        initial_line = self.line
+        try:
+            return (yield self.__list_generator())
+        except ParseError as list_error:
+            self.pos = initial_pos
+            self.line = initial_line
+            try:
+                return (yield self.__expression_generator())
+            except ParseError as expression_error:
+                self.pos = initial_pos
+                self.line = initial_line
+                raise self.furthest_error([('list', list_error), ('expression', expression_error)])
+
+    def __list_generator(self) -> RuleGenerator:
+        """
+        Like list() but yielding the generators of the elements instead of matching them
+        :return: Generator of the matched list
+        """
+        result: List[Any] = []
+
+        self.maybe_match('ws')
+        self.keyword('[')
+
+        # Custom parse functions need every number to be parsed on its own
+        if self.numeric_arrays is not None and self.parse_int is None and self.parse_float is None:
+            numeric_array = self.__numeric_array()
+            if numeric_array is not None:
+                return MatchResult(MatchResultType.LIST, numeric_array)
+
+        element_decoder = None
+        if self.decoders is not None:
+            list_decoder = self.decoders[-1]
+            element_decoder = list_decoder.element() if list_decoder is not None else None
+            self.decoders.append(element_decoder)
+
+        try:
+            is_complete = self.__scalar_elements(result, element_decoder)
+            while not is_complete:
+                # Discards useless lines between elements of array
+                useless_line = self.maybe_match('useless_line')
+                if useless_line is not None:
+                    continue
+
+                # Same as maybe_match('any_type')
+                initial_pos = self.pos
+                initial_line = self.line
+                try:
+                    item = yield self.__any_type_generator()
+                except ParseError:
+                    self.pos = initial_pos
+                    self.line = initial_line
+                    item = None
+
+                if item is None:
+                    break
+
+                if not self.__add_element(result, item, element_decoder, initial_pos, initial_line):
+                    break
+        finally:
+            if self.decoders is not None:
+                self.decoders.pop()
+
+        if not is_complete:
+            self.__list_end()
+        return MatchResult(MatchResultType.LIST, result)
+
     def __remove_last_indentation_level(self):
         """Removes, if exists, the last indentation level"""
         if len(self.indentation_levels) > 0:
@@ -511,8 +1271,31 @@ class GuraParser(Parser):
         :return: Matched key-value pair. None if the indentation level is lower than the last one (to indicate the
         ending of a parent object)
         """
+        pair_start = self.__pair_start()
+        if pair_start is None:
+            return None  # This breaks the parent loop
+
+        key, key_pos, current_indentation_level, initial_pos, initial_line, decoder = pair_start
+        if self.decoders is not None:
+            self.decoders.append(decoder)
+            try:
+                result = self.match('any_type')
+            finally:
+                self.decoders.pop()
+        else:
+            result = self.match('any_type')
+
+        return self.__pair_end(key, key_pos, result, current_indentation_level, initial_pos, initial_line, decoder)
+
+    def __pair_start(self) -> Optional[Tuple[str, int, int, int, int, Optional[TypeDecoder]]]:
+        """
+        Matches the indentation and the key of a key-value pair
+        :return: Tuple with the key, the position where the key starts, the indentation level, the position and line
+        where the value starts and the decoder of the value. None if the indentation level is lower than the last one
+        """
         pos_before_pair = self.pos  # To report correct position in case of exception
-        current_indentation_level = self.maybe_match('ws_with_indentation')
+        current_indentation_level = self.ws_with_indentation()
+        key_pos = self.pos + 1
 
         key = self.match('key')
         self.maybe_match('ws')
@@ -536,14 +1319,40 @@ class GuraParser(Parser):
             # As the indentation was consumed, it is needed to return to line beginning to get the indentation level
             # again in the previous matching. Otherwise, the other match would get indentation level = 0
             self.pos = pos_before_pair
-            return None  # This breaks the parent loop
+            return None
 
-        # To report well the line number in case of exceptions
-        initial_pos = self.pos
-        initial_line = self.line
+        decoder = None
+        if self.decoders is not None:
+            parent_decoder = self.decoders[-1]
+            decoder = parent_decoder.child(key) if parent_decoder is not None else None
 
+        # To report well the line number in case of exceptions
+        return key, key_pos, current_indentation_level, self.pos, self.line, decoder
+
+    def __pair_end(
+            self,
+            key: str,
+            key_pos: int,
+            result: Optional[MatchResult],
+            current_indentation_level: int,
+            initial_pos: int,
+            initial_line: int,
+            decoder: Optional[TypeDecoder]
+    ) -> MatchResult:
+        """
+        Checks the matched value of a key-value pair and consumes the end of the line
+        :param key: Key of the pair
+        :param key_pos: Position where the key starts
+        :param result: Matched value
+        :param current_indentation_level: Indentation level of the pair
+        :param initial_pos: Position where the value starts
+        :param initial_line: Line where the value starts
+        :param decoder: Decoder of the value
+        :raise: ParseError if there is no value
+        :raise: InvalidIndentationError if the value is an object with a wrong indentation level
+        :return: Matched key-value pair
+        """
         # If it is None then is an empty expression, and therefore invalid
-        result = self.match('any_type')
         if result is None:
             raise ParseError(
                 self.pos + 1,
@@ -551,6 +1360,10 @@ class GuraParser(Parser):
                 'Invalid pair'
             )
 
+        if self.position_map is not None:
+            self.position_map.add(self.text, key, key_pos, initial_pos + 1, self.pos + 1,
+                                  result.result_type == MatchResultType.EXPRESSION)
+
         # Checks indentation against parent level
         if result.result_type == MatchResultType.EXPRESSION:
             dict_values, child_indentation_level = result.value
@@ -578,6 +1391,9 @@ class GuraParser(Parser):
         else:
             result = result.value
 
+        if self.convert_objects and isinstance(result, dict):
+            result = self.__convert_object(result, decoder, initial_pos + 1, initial_line)
+
         # Prevents issues with indentation inside a list that break objects
         if isinstance(result, list):
             self.__remove_last_indentation_level()
@@ -658,7 +1474,7 @@ class GuraParser(Parser):
         :raise: ParseError if the extracted string is not a valid number
         :return: Returns an int or a float depending of type inference
         """
-        number_type = int
+        number_type: type = int
 
         chars = [self.char(ACCEPTABLE_NUMBER_CHARS)]
 
@@ -673,7 +1489,16 @@ class GuraParser(Parser):
             chars.append(char)
 
         result = ''.join(chars).rstrip(' \t')
+        return MatchResult(MatchResultType.PRIMITIVE, self.__number_value(result, number_type))
 
+    def __number_value(self, result: str, number_type: type) -> Any:
+        """
+        Gets the value of a number
+        :param result: Number as string
+        :param number_type: Type inferred for the number (int or float)
+        :raise: ParseError if the string is not a valid number
+        :return: Number converted with the custom parse functions or as int or float
+        """
         # Checks hexadecimal and octal format
         prefix = result[:2]
         if prefix in ['0x', '0o', '0b']:
@@ -684,15 +1509,18 @@ class GuraParser(Parser):
                 base = 8
             else:
                 base = 2
-            return MatchResult(MatchResultType.PRIMITIVE, int(without_prefix, base))
+            value = int(without_prefix, base)
+            if self.parse_int is not None:
+                value = self.parse_int(str(value))
+            return value
 
         # Checks inf or NaN
         last_three_chars = result[-3:]
         if last_three_chars in ['inf', 'nan']:
-            return MatchResult(MatchResultType.PRIMITIVE, float(result))
+            return float(result) if self.parse_float is None else self.parse_float(result)
 
         try:
-            return MatchResult(MatchResultType.PRIMITIVE, number_type(result))
+            value = number_type(result)
         except ValueError:
             raise ParseError(
                 self.pos + 1,
@@ -700,6 +1528,14 @@ class GuraParser(Parser):
                 f'"{result}" is not a valid number',
             )
 
+        # Custom parse functions receive only valid numbers
+        if number_type is int:
+            if self.parse_int is not None:
+                value = self.parse_int(result)
+        elif self.parse_float is not None:
+            value = self.parse_float(result)
+        return value
+
     def basic_string(self) -> MatchResult:
         """
         Matches with a simple/multiline basic string
@@ -778,105 +1614,360 @@ class GuraParser(Parser):
 
         return MatchResult(MatchResultType.PRIMITIVE, ''.join(chars))
 
-    def dumps(self, value: Dict) -> str:
+    def dumps(self, value: Any) -> str:
         """
-        Generates a Gura string from a dictionary (aka. stringify). Takes a value, check its type and returns its
-        correct value in a recursive way
-        :param value: Value retrieved from dict to transform in string
-        an object or array
+        Generates a Gura string from a dictionary (aka. stringify)
+        :param value: Value to transform in string
         :return: String representation of the received value
         """
-        if value is None:
-            return 'null'
-
-        value_type = type(value)
-        if value_type == str:
-            result = ''
-
-            # Escapes everything that needs to be escaped
-            for char in value:
-                result += SEQUENCES_TO_ESCAPE.get(char, char)
-
-            return f'"{result}"'
-        if value_type == bool:
-            return 'true' if value is True else 'false'
-        if value_type in (int, float):
-            return str(value)
-        if value_type == dict:
-            if len(value) == 0:
-                return 'empty'
-            result = ''
-            for key, dict_value in value.items():
-                result += f'{key}:'
-
-                # If the value is an object, splits the stringified value by
-                # newline and indents each line before adding it to the result
-                if type(dict_value) == dict:
-                    stringified_value = self.dumps(dict_value).rstrip()
-                    if len(dict_value) > 0:
-                        result += '\n'
-
-                        for line in stringified_value.split('\n'):
-                            result += INDENT + line + '\n'
-                    else:
-                        # Prevents indentation on empty objects
-                        result += ' ' + stringified_value + '\n'
-                # Otherwise adds the stringified value
-                else:
-                    result += f' {self.dumps(dict_value)}\n'
+        return ''.join(self.dump_value(value, indentation=''))
 
-            return result
-        if value_type == list:
-            should_multiline = any((type(e) == dict or type(e) == list) and len(e) > 0 for e in value)
+    def iterdumps(self, value: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Like dumps() but yields the Gura string in chunks of (at least) chunk_size characters, so the whole output never
+        has to be held in memory
+        :param value: Value to transform in string
+        :param chunk_size: Minimum length of every yielded chunk (except the last one)
+        :return: Generator of string chunks
+        """
+        buffer = []
+        buffer_size = 0
+        for piece in self.dump_value(value, indentation=''):
+            buffer.append(piece)
+            buffer_size += len(piece)
+            if buffer_size >= chunk_size:
+                yield ''.join(buffer)
+                buffer.clear()
+                buffer_size = 0
+
+        if buffer_size > 0:
+            yield ''.join(buffer)
+
+    def dump_value(self, value: Any, indentation: str) -> Iterator[str]:
+        """
+        Takes a value, gets the encoder of its type and yields the pieces of its Gura representation in a recursive
+        way. Every line but the first one is prefixed with the received indentation
+        :param value: Value to transform in string
+        :param indentation: Indentation of the block that contains the value
+        :raise: TypeError if the value can not be represented in Gura
+        :return: Generator of string pieces
+        """
+        encoder = ENCODERS.get(type(value))
+        if encoder is None or encoder[0] is EncoderType.CONVERSION:
+            value, encoder = self.__resolve(value)
+        encoder_type, encode = encoder
 
-            if not should_multiline:
-                stringify_values = list(map(self.dumps, value))
-                return f'[{", ".join(stringify_values)}]'
+        if encoder_type is EncoderType.SCALAR:
+            yield encode(value)
+        else:
+            yield from self.dump_encoded(value, encoder_type, encode(value), indentation)
 
-            result = '['
+    def dump_encoded(self, value: Any, encoder_type: EncoderType, encoded: Any, indentation: str) -> Iterator[str]:
+        """
+        Yields the pieces of the Gura representation of an object or an array which has been already encoded. Nested
+        objects and arrays are dumped with this method too, so they are encoded only once
+        :param value: Object or array (after the conversions)
+        :param encoder_type: EncoderType.OBJECT or EncoderType.ARRAY
+        :param encoded: Result of the encoding function for the value
+        :param indentation: Indentation of the block that contains the value
+        :raise: TypeError if some nested value can not be represented in Gura
+        :return: Generator of string pieces
+        """
+        if encoder_type is EncoderType.OBJECT:
+            yield from self.__dump_pairs(encoded, indentation)
+        else:
+            yield from self.__dump_entries(encoded, indentation)
 
-            last_idx = len(value) - 1
-            for idx, entry in enumerate(value):
-                stringified_value = self.dumps(entry).rstrip()
+    def __dump_pairs(self, pairs: Any, indentation: str) -> Iterator[str]:
+        """
+        Yields the pieces of the Gura representation of an encoded object
+        :param pairs: Sized collection of key/value pairs returned by the encoder of the object
+        :param indentation: Indentation of the block that contains the object
+        :raise: TypeError if some value can not be represented in Gura
+        :return: Generator of string pieces
+        """
+        if len(pairs) == 0:
+            yield 'empty'
+            return
+
+        new_line = '\n' + indentation
+        is_first = True
+        for key, pair_value in pairs:
+            if not is_first:
+                yield new_line
+            is_first = False
+
+            pair_encoder = ENCODERS.get(type(pair_value))
+            if pair_encoder is None or pair_encoder[0] is EncoderType.CONVERSION:
+                pair_value, pair_encoder = self.__resolve(pair_value)
+            pair_encoder_type, pair_encode = pair_encoder
+
+            if pair_encoder_type is EncoderType.SCALAR:
+                yield f'{key}: {pair_encode(pair_value)}'
+                continue
 
-                result += '\n'
+            encoded = pair_encode(pair_value)
+            if pair_encoder_type is EncoderType.OBJECT and len(encoded) > 0:
+                # A non-empty object is placed in the following lines with an extra indentation
+                child_indentation = indentation + INDENT
+                yield f'{key}:\n{child_indentation}'
+                yield from self.dump_encoded(pair_value, pair_encoder_type, encoded, child_indentation)
+            else:
+                yield f'{key}: '
+                yield from self.dump_encoded(pair_value, pair_encoder_type, encoded, indentation)
 
-                # If the stringified value contains multiple lines, indents all
-                # of them and adds them all to the result
-                if '\n' in stringified_value:
-                    splitted = stringified_value.split('\n')
-                    splitted = map(lambda element: INDENT + element, splitted)
-                    result += '\n'.join(splitted)
-                else:
-                    # Otherwise indent the value and add to result
-                    result += INDENT + stringified_value
+    def __dump_entries(self, values: Any, indentation: str) -> Iterator[str]:
+        """
+        Yields the pieces of the Gura representation of an encoded array
+        :param values: Sequence of values returned by the encoder of the array
+        :param indentation: Indentation of the block that contains the array
+        :raise: TypeError if some value can not be represented in Gura
+        :return: Generator of string pieces
+        """
+        # Scalars are encoded when they are dumped, objects and arrays are kept encoded too
+        entries = []
+        is_inline = True
+        for entry in values:
+            entry_encoder = ENCODERS.get(type(entry))
+            if entry_encoder is None or entry_encoder[0] is EncoderType.CONVERSION:
+                entry, entry_encoder = self.__resolve(entry)
+            entry_encoder_type, entry_encode = entry_encoder
+            encoded = None
+            if entry_encoder_type is not EncoderType.SCALAR:
+                encoded = entry_encode(entry)
+                # Scalars and empty objects or arrays are kept in the same line
+                if is_inline and len(encoded) > 0:
+                    is_inline = False
+            entries.append((entry_encoder_type, entry_encode, entry, encoded))
+
+        if is_inline:
+            # Entries are joined in groups, so the whole line is never held in memory
+            yield '['
+            for group_start in range(0, len(entries), INLINE_GROUP_SIZE):
+                group = ', '.join(
+                    entry_encode(entry) if entry_encoder_type is EncoderType.SCALAR
+                    else 'empty' if entry_encoder_type is EncoderType.OBJECT else '[]'
+                    for entry_encoder_type, entry_encode, entry, _encoded
+                    in entries[group_start:group_start + INLINE_GROUP_SIZE]
+                )
+                yield group if group_start == 0 else ', ' + group
+            yield ']'
+            return
+
+        # Every entry is placed in its own line with an extra indentation
+        child_indentation = indentation + INDENT
+        yield '['
+        last_idx = len(entries) - 1
+        for idx, (entry_encoder_type, entry_encode, entry, encoded) in enumerate(entries):
+            yield '\n' + child_indentation
+            if entry_encoder_type is EncoderType.SCALAR:
+                yield entry_encode(entry)
+            else:
+                yield from self.dump_encoded(entry, entry_encoder_type, encoded, child_indentation)
 
-                # Add a comma if this entry is not the final entry in the list
-                if idx < last_idx:
-                    result += ','
+            # Add a comma if this entry is not the final entry in the list
+            if idx < last_idx:
+                yield ','
+        yield '\n' + indentation + ']'
 
-            result += '\n]'
-            return result
+    def __get_encoder(self, value: Any) -> Encoder:
+        """
+        Gets the encoder for the type of a value, generating it if it is the first time the type is dumped
+        :param value: Value to be dumped
+        :raise: TypeError if there is no encoder for the value and no default function was specified
+        :return: Encoder type and encoding function
+        """
+        value_type = type(value)
+        encoder = ENCODERS.get(value_type)
+        if encoder is None:
+            encoder = generate_encoder(value_type)
+            ENCODERS[value_type] = encoder
+
+        if encoder is DEFAULT_ENCODER:
+            if self.default is None:
+                raise TypeError(f'Object of type {value_type.__name__} is not Gura serializable')
+            return EncoderType.CONVERSION, self.default
+        return encoder
+
+    def __resolve(self, value: Any) -> Tuple[Any, Encoder]:
+        """
+        Applies conversion encoders (i.e. enums or the default function) until getting a value which can be dumped
+        :param value: Value to be dumped
+        :raise: TypeError if a conversion returns a value of the same type
+        :return: Value to be dumped in place of the received one and its encoder
+        """
+        encoder = self.__get_encoder(value)
+        while encoder[0] is EncoderType.CONVERSION:
+            converted = encoder[1](value)
+            if type(converted) is type(value):
+                raise TypeError(f'Object of type {type(value).__name__} is not Gura serializable')
+            value = converted
+            encoder = self.__get_encoder(value)
+        return value, encoder
+
+
+@lru_cache(maxsize=None)
+def specialized_parser() -> Type[GuraParser]:
+    """
+    Gets a GuraParser subclass generated from its rules methods, where the rules are matched by specialized methods
+    with inlined chars checks instead of by their names (see Specializer.py). It is generated the first time it is
+    needed. If the source code of GuraParser is not available (i.e. only bytecode is installed) or the methods can not
+    be generated (ast.unparse() is needed, which was added in Python 3.9), GuraParser is used
+    :return: Parser class to be used by loads() and compile_prelude()
+    """
+    if sys.version_info < (3, 9):
+        return GuraParser
+
+    try:
+        return specialize(GuraParser, 'SpecializedGuraParser')
+    except OSError:
+        return GuraParser
+
+
+def loads(
+        text: str,
+        into: Optional[Any] = None,
+        object_hook: Optional[Callable[[Dict], Any]] = None,
+        object_pairs_hook: Optional[Callable[[List[Tuple[str, Any]]], Any]] = None,
+        parse_float: Optional[Callable[[str], Any]] = None,
+        parse_int: Optional[Callable[[str], Any]] = None,
+        numeric_arrays: Optional[str] = None,
+        env: Optional[Mapping[str, str]] = None,
+        variables: Optional[Dict[str, Any]] = None,
+        context: Optional[GuraPrelude] = None,
+        iterative: bool = False,
+        workers: Optional[int] = None,
+        positions: bool = False,
+        import_cache: Optional[Dict[str, Tuple[int, int, str]]] = None
+) -> Any:
+    """
+    Parses a text in Gura format
+    :param text: Text to be parsed
+    :param into: Type (dataclass or class with __slots__) to build from the parsed text. Nested objects are built
+    following the type hints of its fields
+    :param object_hook: Function called with every parsed object (dict). Its result is used instead of the dict
+    :param object_pairs_hook: Like object_hook but it receives a list of key/value pairs. It has priority over
+    object_hook
+    :param parse_float: Function called with the string of every float number (i.e. decimal.Decimal)
+    :param parse_int: Function called with the string of every integer number
+    :param numeric_arrays: If it is 'array', arrays of numbers are returned as compact array.array of int64 or doubles
+    (doubles if any of the numbers is a float). If it is 'numpy', they are returned as NumPy ndarray
+    :param env: Mapping used instead of the environment variables. By default, a snapshot of os.environ is taken (only
+    if some variable is not defined in the text)
+    :param variables: Variables defined before parsing the text, as if they were defined at its beginning
+    :param context: Prelude generated with compile_prelude(). Its variables, imports and values are used as if its
+    text was at the beginning of this one
+    :param iterative: If True, nested objects and arrays are parsed keeping an explicit stack instead of using recursive
+    calls, so deeply nested texts do not exceed the Python recursion limit
+    :param workers: Number of processes to parse large texts split at their top-level pairs (see Parallel.py). Texts
+    with imports, and calls with into, object hooks or context, are parsed serially. Custom parse functions must be
+    picklable
+    :param positions: If True, the offsets of every pair in text are recorded too (see PositionMap), and a tuple with
+    the parsed values and the positions is returned. Texts are always parsed serially then
+    :param import_cache: Dict where the imported files (including the nested imports) are recorded by their path with
+    their modification time (in nanoseconds), size and content. Files already recorded with their current
+    modification time and size are not read again
+    :raise: ParseError if the syntax of text is invalid
+    :raise: InvalidTypeError if the parsed objects can not be converted into the type specified in `into`
+    :return: Dict with all the parsed values (or an instance of `into` type if it was specified)
+    """
+    if workers is not None and into is None and object_hook is None and object_pairs_hook is None and context is None \
+            and not positions:
+        from gura.Parallel import parallel_loads
+        return parallel_loads(
+            text,
+            workers,
+            env=env,
+            variables=variables,
+            parse_float=parse_float,
+            parse_int=parse_int,
+            numeric_arrays=numeric_arrays,
+            iterative=iterative,
+            import_cache=import_cache
+        )
 
-        raise TypeError()
+    parser = specialized_parser()(
+        into=into,
+        object_hook=object_hook,
+        object_pairs_hook=object_pairs_hook,
+        parse_float=parse_float,
+        parse_int=parse_int,
+        numeric_arrays=numeric_arrays,
+        env=env,
+        variables=variables,
+        context=context,
+        iterative=iterative,
+        positions=positions,
+        import_cache=import_cache
+    )
+    result = parser.loads(text)
+    return (result, parser.position_map) if positions else result
+
+
+def load_file(path: str, **options: Any) -> Any:
+    """
+    Reads and parses a file in Gura format. Its imports are relative to the current directory, as in loads()
+    :param path: Path of the file
+    :param options: Rest of the arguments of loads()
+    :raise: OSError if the file can not be read
+    :raise: ParseError if the syntax of the file content is invalid
+    :return: Dict with all the parsed values (or an instance of `into` type if it was specified)
+    """
+    with open(path, 'r') as f:
+        text = f.read()
+    return loads(text, **options)
 
 
-def loads(text: str) -> Dict:
+def compile_prelude(text: str) -> GuraPrelude:
     """
-    Parses a text in Gura format
+    Parses once a text in Gura format (usually variables definitions and imports) shared by many other texts
     :param text: Text to be parsed
     :raise: ParseError if the syntax of text is invalid
-    :return: Dict with all the parsed values
+    :return: Prelude to be used as the context argument of loads()
     """
-    return GuraParser().loads(text)
+    return specialized_parser()().compile_prelude(text)
 
 
-def dumps(data: Dict) -> str:
+def dumps(data: Dict, default: Optional[Callable[[Any], Any]] = None) -> str:
     """
     Generates a Gura string from a dictionary (aka. Stringify)
     :param data: Dictionary data to stringify
+    :param default: Function called for values that can not be dumped. It must return a value that can be dumped
+    :raise: TypeError if there is a value that can not be dumped
     :return: String with the data in Gura format
     """
-    # content = GuraParser().dumps(data, indentation_level=0, new_line=True)
-    content = GuraParser().dumps(data)
-    return content.lstrip('\n').rstrip('\n')
+    return GuraParser(default=default).dumps(data)
+
+
+def iterdumps(
+        data: Dict,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        default: Optional[Callable[[Any], Any]] = None
+) -> Iterator[str]:
+    """
+    Generates a Gura string from a dictionary in chunks, without holding the entire output in memory
+    :param data: Dictionary data to stringify
+    :param chunk_size: Minimum length of every yielded chunk (except the last one)
+    :param default: Function called for values that can not be dumped. It must return a value that can be dumped
+    :raise: TypeError if there is a value that can not be dumped
+    :return: Generator of strings that, concatenated, are the data in Gura format
+    """
+    return GuraParser(default=default).iterdumps(data, chunk_size)
+
+
+def dump(
+        data: Dict,
+        fp: TextIO,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        default: Optional[Callable[[Any], Any]] = None
+):
+    """
+    Writes a dictionary in Gura format to a file-like object chunk by chunk
+    :param data: Dictionary data to stringify
+    :param fp: File-like object with a write() method that accepts strings
+    :param chunk_size: Size of the chunks written to fp
+    :param default: Function called for values that can not be dumped. It must return a value that can be dumped
+    :raise: TypeError if there is a value that can not be dumped
+    """
+    for chunk in iterdumps(data, chunk_size, default):
+        fp.write(chunk)
@@ -0,0 +1,245 @@
+import weakref
+from itertools import count
+from typing import Dict, Any, Iterator, List, Tuple, Optional, Callable
+from gura.GuraParser import GuraParser, EncoderType
+
+# Global source of versions, so two different states of the same tracked object never share a version
+_versions = count()
+
+
+def track(value: Any) -> Any:
+    """
+    Converts, recursively, all the dicts and lists of a value into their tracked counterparts. Tracked values are
+    returned as they are
+    :param value: Value to convert (usually a dict returned by loads())
+    :return: Value with TrackedDict instead of dict and TrackedList instead of list
+    """
+    if isinstance(value, (TrackedDict, TrackedList)):
+        return value
+    if isinstance(value, dict):
+        return TrackedDict(value)
+    if isinstance(value, list):
+        return TrackedList(value)
+    return value
+
+
+class Tracked:
+    """
+    Mixin for containers that keep a version number which changes every time they, or any of their tracked children,
+    are modified. Plain dicts and lists stored in a tracked container are converted into tracked ones
+    """
+    version: int
+    parents: List[weakref.ref]
+
+    def _init_tracking(self):
+        """Initializes version and parents references"""
+        self.version = next(_versions)
+        self.parents = []
+
+    def _adopt(self, value: Any) -> Any:
+        """
+        Converts a value into a tracked one (if needed) and registers this container as one of its parents
+        :param value: Value to be stored in this container
+        :return: Value to store
+        """
+        value = track(value)
+        if isinstance(value, Tracked) and all(parent() is not self for parent in value.parents):
+            value.parents.append(weakref.ref(self))
+        return value
+
+    def _touch(self):
+        """Updates the version of this container and all its ancestors"""
+        self.version = next(_versions)
+        for parent_ref in self.parents:
+            parent = parent_ref()
+            if parent is not None:
+                parent._touch()
+
+
+class TrackedDict(Tracked, dict):
+    """Dict which keeps a version number that changes on every modification of itself or of its children"""
+
+    def __init__(self, *args, **kwargs):
+        super(TrackedDict, self).__init__(*args, **kwargs)
+        self._init_tracking()
+        for key, value in dict.items(self):
+            dict.__setitem__(self, key, self._adopt(value))
+
+    def __setitem__(self, key: str, value: Any):
+        dict.__setitem__(self, key, self._adopt(value))
+        self._touch()
+
+    def __delitem__(self, key: str):
+        dict.__delitem__(self, key)
+        self._touch()
+
+    # In-place operators return the tracked container itself. mypy can not compare them with the overloaded operators
+    # of dict and list, so the checks are ignored
+    def __ior__(self, other: Any) -> 'TrackedDict':  # type: ignore[misc]
+        self.update(other)
+        return self
+
+    def clear(self):
+        dict.clear(self)
+        self._touch()
+
+    def pop(self, *args):
+        result = dict.pop(self, *args)
+        self._touch()
+        return result
+
+    def popitem(self):
+        result = dict.popitem(self)
+        self._touch()
+        return result
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            dict.__setitem__(self, key, self._adopt(value))
+        self._touch()
+
+
+class TrackedList(Tracked, list):
+    """List which keeps a version number that changes on every modification of itself or of its children"""
+
+    def __init__(self, iterable=()):
+        super(TrackedList, self).__init__(iterable)
+        self._init_tracking()
+        for idx, value in enumerate(list.__iter__(self)):
+            list.__setitem__(self, idx, self._adopt(value))
+
+    def __setitem__(self, index: Any, value: Any):
+        if isinstance(index, slice):
+            value = [self._adopt(element) for element in value]
+        else:
+            value = self._adopt(value)
+        list.__setitem__(self, index, value)
+        self._touch()
+
+    def __delitem__(self, index: Any):
+        list.__delitem__(self, index)
+        self._touch()
+
+    def __iadd__(self, other: Any) -> 'TrackedList':  # type: ignore[misc]
+        self.extend(other)
+        return self
+
+    def __imul__(self, n: Any) -> 'TrackedList':  # type: ignore[misc]
+        list.__imul__(self, n)
+        self._touch()
+        return self
+
+    def append(self, value: Any):
+        list.append(self, self._adopt(value))
+        self._touch()
+
+    def extend(self, iterable):
+        list.extend(self, [self._adopt(value) for value in iterable])
+        self._touch()
+
+    def insert(self, index: Any, value: Any):
+        list.insert(self, index, self._adopt(value))
+        self._touch()
+
+    def pop(self, *args):
+        result = list.pop(self, *args)
+        self._touch()
+        return result
+
+    def remove(self, value: Any):
+        list.remove(self, value)
+        self._touch()
+
+    def clear(self):
+        list.clear(self)
+        self._touch()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._touch()
+
+    def reverse(self):
+        list.reverse(self)
+        self._touch()
+
+
+class IncrementalDumper(GuraParser):
+    """
+    Dumper that remembers the rendered pieces of every tracked object and list (see track()). In later calls to
+    dumps() or iterdumps() only the subtrees whose version changed are rendered again, the rest are reused
+    """
+    rendered: Dict[int, Tuple[weakref.ref, int, str, List]]
+
+    def __init__(self, default: Optional[Callable[[Any], Any]] = None):
+        super(IncrementalDumper, self).__init__(default=default)
+        self.rendered = {}
+        self.__rendering_depth = 0
+
+    def dump_encoded(self, value: Any, encoder_type: EncoderType, encoded: Any, indentation: str) -> Iterator[Any]:
+        """
+        Like GuraParser.dump_encoded() but reuses the pieces of tracked subtrees that have not changed since the last
+        time they were rendered with the same indentation
+        :param value: Object or array (after the conversions)
+        :param encoder_type: EncoderType.OBJECT or EncoderType.ARRAY
+        :param encoded: Result of the encoding function for the value
+        :param indentation: Indentation of the block that contains the value
+        :return: Generator of string pieces (or of lists of pieces in nested calls)
+        """
+        # Empty containers are cheaper to render than to cache
+        if not isinstance(value, (TrackedDict, TrackedList)) or len(value) == 0:
+            yield from super(IncrementalDumper, self).dump_encoded(value, encoder_type, encoded, indentation)
+            return
+
+        pieces = self.__get_rendered(value, encoder_type, encoded, indentation)
+
+        # Nested calls return the cached pieces as a whole to the parent, which stores them as a reference instead of
+        # copying them. They are flattened only when the outermost tracked value is completed
+        if self.__rendering_depth > 0:
+            yield pieces
+        else:
+            yield from self.__flatten(pieces)
+
+    def __get_rendered(self, value: Tracked, encoder_type: EncoderType, encoded: Any, indentation: str) -> List:
+        """
+        Gets the rendered pieces of a tracked value from cache, rendering it if it changed
+        :param value: Tracked value to render
+        :param encoder_type: EncoderType.OBJECT or EncoderType.ARRAY
+        :param encoded: Result of the encoding function for the value
+        :param indentation: Indentation of the block that contains the value
+        :return: List of pieces, where every piece is a string or a list of pieces of a child
+        """
+        key = id(value)
+        cached = self.rendered.get(key)
+        if cached is not None:
+            value_ref, version, cached_indentation, pieces = cached
+            if value_ref() is value and version == value.version and cached_indentation == indentation:
+                return pieces
+
+        version = value.version
+        self.__rendering_depth += 1
+        try:
+            pieces = list(super(IncrementalDumper, self).dump_encoded(value, encoder_type, encoded, indentation))
+        finally:
+            self.__rendering_depth -= 1
+
+        rendered = self.rendered
+        value_ref = weakref.ref(value, lambda _ref: rendered.pop(key, None))
+        self.rendered[key] = (value_ref, version, indentation, pieces)
+        return pieces
+
+    def __flatten(self, pieces: List) -> Iterator[str]:
+        """
+        Yields all the strings from a list of rendered pieces
+        :param pieces: List of strings or lists of pieces
+        :return: Generator of strings
+        """
+        for piece in pieces:
+            if type(piece) is str:
+                yield piece
+            else:
+                yield from self.__flatten(piece)
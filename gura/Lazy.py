@@ -0,0 +1,319 @@
+import bisect
+import os
+import re
+from collections.abc import Mapping
+from typing import Dict, Any, Optional, List, Tuple, Iterator
+from gura.GuraParser import specialized_parser, INDENT
+from gura.Parallel import pre_scan, OBJECT_KEY_LINE_REST_REGEX
+from gura.Parser import GuraError
+
+# Key of a pair line
+KEY_REGEX = re.compile(r' *([0-9A-Za-z_]+):')
+
+# Indentation of a line
+INDENTATION_REGEX = re.compile(r'[ \t]*')
+
+# Blank and comment lines, which are checked without a parser
+COMMENT_LINES_REGEX = re.compile(r'(?: *(?:#[^\n]*)?\n)*')
+
+
+class FullParseRequired(Exception):
+    """Raises when a lazy lookup can not be done without parsing the whole text"""
+    pass
+
+
+class LazyDocument:
+    """
+    Text in Gura format whose parts are parsed only when they are needed (see loads_lazy()). It keeps the variables
+    defined before every part and falls back to parsing the whole text when a part can not be parsed on its own
+    """
+    text: str
+    options: Dict[str, Any]
+    lazy: bool
+    root: 'LazyObject'
+
+    def __init__(self, text: str, env: Optional[Dict[str, str]] = None, variables: Optional[Dict[str, Any]] = None,
+                 **options: Any):
+        # All the parts must see the same environment
+        options['env'] = env if env is not None else os.environ.copy()
+        self.text = text
+        self.options = options
+        self.__initial_variables = dict(variables) if variables is not None else {}
+        self.__full: Optional[Dict] = None
+        other_lines: List[int] = []
+        scan = pre_scan(text, other_lines=other_lines)
+        # With imports (or something that can not be scanned) the text is parsed as a whole when it is needed. So it
+        # is if it has no pairs, as only the pairs are parsed lazily
+        boundaries, self.__definitions = scan if scan is not None and len(scan[0]) > 0 else ([], [])
+        self.lazy = len(boundaries) > 0
+        # Variables defined after every number of definitions
+        self.__defined_variables: List[Dict[str, Any]] = [self.__initial_variables]
+        if self.lazy and boundaries[0] > 0:
+            self.__check_prefix(boundaries[0])
+            if not self.lazy:
+                boundaries, self.__definitions = [], []
+        self.__definitions_starts = [start for start, _end in self.__definitions]
+        self.root = LazyObject(self, 0, len(text), 0, (boundaries, other_lines))
+
+    def __check_prefix(self, end: int):
+        """
+        Parses the text before the first pair (variables definitions, comments and useless lines), which is not part of
+        any pair. If it is not valid, the document is not lazy anymore, so the whole text is parsed when it is accessed
+        to raise the error
+        :param end: Start of the first pair
+        """
+        try:
+            parser = specialized_parser()(variables=self.__initial_variables, **self.options)
+            parser.loads(self.text[:end])
+        except GuraError:
+            self.lazy = False
+            return
+
+        # No pair starts between the definitions of the prefix, so only the variables defined after all of them are
+        # needed
+        count = sum(1 for start, _end in self.__definitions if start < end)
+        self.__defined_variables.extend([parser.variables] * count)
+
+    def check_body_prefix(self, start: int, end: int):
+        """
+        Parses the lines of the body of a nested object before its first pair, which can only be useless lines
+        :param start: Start of the body
+        :param end: Start of the first pair of the body
+        :raise: FullParseRequired if the lines are not valid
+        """
+        if COMMENT_LINES_REGEX.fullmatch(self.text, start, end) is not None:
+            return
+
+        try:
+            parser = specialized_parser()(**self.options)
+            values = parser.loads(self.text[start:end])
+        except GuraError:
+            raise FullParseRequired
+        if len(values) > 0 or len(parser.variables) > 0:
+            raise FullParseRequired
+
+    def parse_segment(self, start: int, end: int) -> Dict:
+        """
+        Parses a segment of the text with the variables defined before it
+        :param start: Start of the segment
+        :param end: End of the segment
+        :raise: FullParseRequired if the segment is not valid on its own
+        :return: Parsed values of the segment
+        """
+        if not self.lazy or self.__full is not None:
+            raise FullParseRequired
+        try:
+            variables = self.__variables_before(start)
+            return specialized_parser()(variables=variables, **self.options).loads(self.text[start:end])
+        except GuraError:
+            # The whole text is parsed to raise the error with its real position
+            raise FullParseRequired
+
+    def full(self) -> Dict:
+        """
+        Parses the whole text (only once)
+        :raise: GuraError if the text is not valid
+        :return: Parsed values
+        """
+        if self.__full is None:
+            self.__full = specialized_parser()(variables=self.__initial_variables, **self.options).loads(self.text)
+        return self.__full
+
+    def __variables_before(self, pos: int) -> Dict[str, Any]:
+        """
+        Gets the variables defined before a position, parsing the definitions which have not been parsed yet
+        :param pos: Position in the text
+        :raise: GuraError if some definition is not valid
+        :return: Defined variables
+        """
+        count = bisect.bisect_left(self.__definitions_starts, pos)
+        while len(self.__defined_variables) <= count:
+            start, end = self.__definitions[len(self.__defined_variables) - 1]
+            parser = specialized_parser()(variables=self.__defined_variables[-1], **self.options)
+            parser.loads(self.text[start:end])
+            self.__defined_variables.append(parser.variables)
+        return self.__defined_variables[count]
+
+
+class LazyObject(Mapping):
+    """
+    Read-only view of an object of a lazy document. The lines of its keys are found the first time they are needed,
+    and the value of a key is parsed the first time it is accessed. If the value is an object in the following lines,
+    it is not parsed: another lazy view of it is returned
+    """
+
+    def __init__(self, document: LazyDocument, start: int, end: int, indentation: int,
+                 lines: Tuple[List[int], List[int]], path: Tuple[str, ...] = (),
+                 segment: Optional[Tuple[int, int]] = None):
+        """
+        :param document: Document of the object
+        :param start: Start of the lines of the pairs of the object
+        :param end: End of the lines of the pairs of the object
+        :param indentation: Indentation of the keys of the object
+        :param lines: Start positions of the lines of the pairs and of the lines of pairs with other indentations
+        :param path: Keys from the root of the document to the object
+        :param segment: Start and end positions of the pair of the object in its parent (None for the root)
+        """
+        self.__document = document
+        self.__start = start
+        self.__end = end
+        self.__indentation = indentation
+        self.__lines = lines
+        self.__path = path
+        self.__segment = segment
+        self.__segments: Optional[Dict[str, Tuple[int, int]]] = None
+        self.__values: Dict[str, Any] = {}
+
+    def __get_segments(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Finds the segments of the pairs of the object
+        :raise: FullParseRequired if the pairs can not be found (i.e. there are imports or duplicated keys)
+        :return: Dict with the (start, end) positions of the segment of every key, in order
+        """
+        if self.__segments is None:
+            if not self.__document.lazy:
+                raise FullParseRequired
+            boundaries, other_lines = self.__lines
+
+            text = self.__document.text
+            segments = {}
+            ends = boundaries[1:] + [self.__end]
+            for start, end in zip(boundaries, ends):
+                # The boundaries are lines where pre_scan() found a key
+                key = KEY_REGEX.match(text, start).group(1)  # type: ignore[union-attr]
+                if key in segments:
+                    raise FullParseRequired
+                segments[key] = (start, end)
+
+            # Pairs with other indentations must be in the body of a nested object. Otherwise (i.e. more indented
+            # lines after a value) the parser decides where they are
+            for line_start in other_lines:
+                idx = bisect.bisect_right(boundaries, line_start) - 1
+                # The regex can match an empty string, so it always matches
+                indentation_end = INDENTATION_REGEX.match(text, line_start).end()  # type: ignore[union-attr]
+                if idx < 0 or self.__object_body_start(boundaries[idx], ends[idx]) is None \
+                        or indentation_end - line_start <= self.__indentation:
+                    raise FullParseRequired
+            self.__segments = segments
+        return self.__segments
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self.__values[key]
+        except KeyError:
+            pass
+
+        try:
+            value = self.__load_value(key)
+        except FullParseRequired:
+            value = self.__document.full()
+            for part in self.__path + (key,):
+                value = value[part]
+        self.__values[key] = value
+        return value
+
+    def __load_value(self, key: str) -> Any:
+        """
+        Parses the value of a key, or creates a lazy view if it is an object in the following lines
+        :param key: Key
+        :raise: KeyError if the object has not that key
+        :raise: FullParseRequired if the value can not be parsed on its own
+        :return: Value
+        """
+        start, end = self.__get_segments()[key]
+        body_start = self.__object_body_start(start, end)
+        if body_start is not None:
+            indentation = self.__indentation + len(INDENT)
+            try:
+                lines = self.__scan_body(body_start, end, indentation)
+            except FullParseRequired:
+                # The value is parsed as a whole to raise the error or to find its pairs
+                return self.__document.parse_segment(start, end)[key]
+            return LazyObject(self.__document, body_start, end, indentation, lines, path=self.__path + (key,),
+                              segment=(start, end))
+        return self.__document.parse_segment(start, end)[key]
+
+    def __scan_body(self, start: int, end: int, indentation: int) -> Tuple[List[int], List[int]]:
+        """
+        Finds the lines of the pairs of a nested object, checking the lines before the first one
+        :param start: Start of the body of the object
+        :param end: End of the body of the object
+        :param indentation: Indentation of the keys of the object
+        :raise: FullParseRequired if the pairs can not be found or the lines before them are not valid
+        :return: Start positions of the lines of the pairs and of the lines of pairs with other indentations
+        """
+        other_lines: List[int] = []
+        scan = pre_scan(self.__document.text, start, end, indentation, other_lines)
+        if scan is None or len(scan[0]) == 0:
+            raise FullParseRequired
+        boundaries = scan[0]
+        if boundaries[0] > start:
+            self.__document.check_body_prefix(start, boundaries[0])
+        return boundaries, other_lines
+
+    def __object_body_start(self, start: int, end: int) -> Optional[int]:
+        """
+        Gets where the lines of the pairs of an object value start
+        :param start: Start of the segment of the pair
+        :param end: End of the segment of the pair
+        :return: Start of the line after the key line, or None if the value is not an object in the following lines
+        """
+        text = self.__document.text
+        # The segments start at lines where pre_scan() found a key
+        rest = OBJECT_KEY_LINE_REST_REGEX.match(text, KEY_REGEX.match(text, start).end())  # type: ignore[union-attr]
+        return rest.end() if rest is not None and rest.end() < end else None
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            return iter(self.__get_segments())
+        except FullParseRequired:
+            return iter(self.load())
+
+    def __len__(self) -> int:
+        try:
+            return len(self.__get_segments())
+        except FullParseRequired:
+            return len(self.load())
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            return key in self.__get_segments()
+        except FullParseRequired:
+            return key in self.load()
+
+    def load(self) -> Dict:
+        """
+        Parses the whole object (the pair of the object, or the whole text for the root object)
+        :raise: GuraError if the object is not valid
+        :return: Dict with the parsed values of the object, as gura.loads() returns them
+        """
+        if self.__segment is not None:
+            try:
+                return self.__document.parse_segment(*self.__segment)[self.__path[-1]]
+            except FullParseRequired:
+                pass
+
+        value = self.__document.full()
+        for part in self.__path:
+            value = value[part]
+        return value
+
+    def __repr__(self):
+        return f'LazyObject({self.load()!r})'
+
+
+def loads_lazy(text: str, env: Optional[Dict[str, str]] = None, variables: Optional[Dict[str, Any]] = None,
+               **options: Any) -> LazyObject:
+    """
+    Gets a lazy view of a text in Gura format. The lines of the pairs of an object are found when one of its keys is
+    accessed, and only the value of that key is parsed (if it is an object in the following lines, only the lines of
+    its pairs are found). Parts of the text which are never accessed are not validated. If a part can not be parsed
+    on its own (i.e. the text has imports), the whole text is parsed, so the values and raised errors are always the
+    same as gura.loads() ones
+    :param text: Text to be parsed
+    :param env: Mapping used instead of the environment variables. By default, a snapshot of os.environ is taken
+    :param variables: Variables defined before parsing the text
+    :param options: Rest of the arguments of GuraParser (parse_float, parse_int, numeric_arrays and iterative)
+    :return: Read-only mapping view of the text values
+    """
+    return LazyDocument(text, env=env, variables=variables, **options).root
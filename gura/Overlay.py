@@ -0,0 +1,103 @@
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, Tuple, List
+from gura.Diff import is_object
+
+
+class OverlayView(Mapping):
+    """
+    Read-only view of some objects merged in layers, where every layer overrides the ones below it. The value of a key
+    is the one of the topmost layer that has it. If that value is an object, the objects of the layers below are
+    merged with it too, so a nested view is returned. Any other value (including arrays) replaces the lower ones.
+    Layers are not copied: changes in them are seen by the view
+    """
+
+    def __init__(self, layers: Tuple[Mapping, ...]):
+        """
+        Use overlay() instead
+        :param layers: Objects from the bottom layer to the top one
+        """
+        self.__layers = layers
+
+    @property
+    def layers(self) -> Tuple[Mapping, ...]:
+        """
+        Gets the merged objects
+        :return: Objects from the bottom layer to the top one
+        """
+        return self.__layers
+
+    def __getitem__(self, key: str) -> Any:
+        objects: List[Any] = []
+        for layer in reversed(self.__layers):
+            if key not in layer:
+                continue
+            value = layer[key]
+            if not is_object(value):
+                if len(objects) == 0:
+                    return value
+                # A value which is not an object hides the layers below it
+                break
+            objects.append(value)
+
+        if len(objects) == 0:
+            raise KeyError(key)
+        return objects[0] if len(objects) == 1 else OverlayView(tuple(reversed(objects)))
+
+    def __iter__(self) -> Iterator[str]:
+        # Keys in the order they are defined, from the bottom layer to the top one
+        seen = set()
+        for layer in self.__layers:
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self) -> int:
+        if len(self.__layers) == 1:
+            return len(self.__layers[0])
+        return len(set().union(*self.__layers))
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self.__layers)
+
+    def flatten(self, *keys: str) -> Dict:
+        """
+        Materializes the merged object at a path in a new dict. Only the objects merged from several layers are
+        copied; the rest of values are shared with the layers
+        :param keys: Keys from this object to the object to flatten. By default, this object is flattened
+        :raise: KeyError if some key does not exist
+        :raise: TypeError if the value at the path is not an object
+        :return: Merged object
+        """
+        value: Any = self
+        for key in keys:
+            value = value[key]
+        if not is_object(value):
+            raise TypeError(f'The value at {".".join(keys)} is not an object')
+        return flatten_object(value)
+
+    def __repr__(self):
+        return f'OverlayView({self.flatten()!r})'
+
+
+def flatten_object(value: Mapping) -> Dict:
+    """
+    Materializes an object, copying the merged views in it
+    :param value: Object or merged view
+    :return: Dict with the values of the object
+    """
+    if not isinstance(value, OverlayView):
+        return dict(value)
+    return {key: flatten_object(item) if isinstance(item, OverlayView) else item for key, item in value.items()}
+
+
+def overlay(base: Mapping, *overrides: Mapping) -> OverlayView:
+    """
+    Merges some parsed values with others which override them (i.e. environment or host specific values) without
+    copying any of them. Lookups fall through the layers, so creating an overlay and reading some of its values costs
+    the same whatever the size of the base is. Use flatten() to get a dict
+    :param base: Base values
+    :param overrides: Values that override base, from the lowest priority to the highest one
+    :return: Read-only merged view
+    """
+    return OverlayView((base,) + overrides)
@@ -0,0 +1,365 @@
+import bisect
+import os
+import re
+import time
+from itertools import repeat
+from typing import Dict, Any, Optional, List, Tuple, Mapping, Iterable, Union
+from gura.GuraParser import specialized_parser
+from gura.Parser import GuraError
+
+# Segments are not made shorter than this, as sending a segment to another process costs more than parsing it
+MIN_SEGMENT_LENGTH = 256 * 1024
+
+# Segments (or chunks of files) per worker, so workers which get simpler ones can take another one
+SEGMENTS_PER_WORKER = 4
+
+# Chars which change the context of the next chars: strings delimiters, arrays brackets, comments and new lines. Keys
+# (and variables names) are found too, as a pair can follow a value in the same line
+PRE_SCAN_REGEX = re.compile(r'"""|\'\'\'|["\'\[\]#\n]|(?<![0-9A-Za-z_$])\$?[0-9A-Za-z_]+:')
+
+# Rest of each kind of string, including its closing delimiter
+STRING_END_REGEXES = {
+    '"""': re.compile(r'(?:[^"\\]|\\.|"(?!""))*"""', re.DOTALL),
+    "'''": re.compile(r"(?:[^']|'(?!''))*'''"),
+    '"': re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL),
+    "'": re.compile(r"[^']*'"),
+}
+
+# Starts of lines with a top-level pair, a variable definition or an import
+KEY_LINE_REGEX = re.compile(r'[0-9A-Za-z_]+:')
+INDENTED_KEY_LINE_REGEX = re.compile(r'[ \t]*[0-9A-Za-z_]+:')
+VARIABLE_LINE_REGEX = re.compile(r'\$[0-9A-Za-z_]+:')
+IMPORT_LINE_REGEX = re.compile(r'import[ \t]')
+
+# Rest of a key line when its value is a nested object (spaces and, maybe, a comment)
+OBJECT_KEY_LINE_REST_REGEX = re.compile(r'[ \t]*(?:#[^\n]*)?(?:\n|$)')
+
+# Errors raised while loading a file which are returned as its result by load_many(): reading errors, decoding
+# errors (UnicodeDecodeError is a ValueError), parsing errors and too deeply nested values
+LOAD_ERRORS = (GuraError, OSError, ValueError, RecursionError)
+LoadError = Union[GuraError, OSError, ValueError, RecursionError]
+
+# Imported files contents of the current worker process, shared by all the files it loads
+worker_import_cache: Dict[str, Tuple[int, int, str]] = {}
+
+
+def pre_scan(
+        text: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        indentation: int = 0,
+        other_lines: Optional[List[int]] = None
+) -> Optional[Tuple[List[int], List[Tuple[int, int]]]]:
+    """
+    Finds the lines where a top-level pair starts and the variables definitions which are not inside strings, arrays
+    or comments
+    :param text: Text to scan
+    :param start: Position where the scan starts. It must be the start of a line
+    :param end: Position where the scan ends. By default, the end of the text
+    :param indentation: Number of spaces before the keys of the pairs to find. If it is not 0, the region is the body
+    of a nested object, where there are no variables definitions nor imports
+    :param other_lines: If it is specified, the start positions of the lines of pairs with a different indentation are
+    appended to it
+    :return: Tuple with the start positions of the pairs lines and the (start, end) positions of the variables
+    definitions. None if the text has imports, pairs (or variables definitions) after a value in the same line or the
+    scan can not be done (i.e. an unclosed string)
+    """
+    if end is None:
+        end = len(text)
+    prefix = ' ' * indentation
+    boundaries = []
+    variables = []
+    variable_start = None
+    depth = 0
+    line_start: Optional[int] = start
+    current_line_start = start
+    pos = start
+    while True:
+        # Checks the line which starts at line_start, when it is not inside an array
+        if line_start is not None:
+            if depth == 0:
+                if variable_start is not None:
+                    variables.append((variable_start, line_start))
+                    variable_start = None
+                if text.startswith(prefix, line_start) \
+                        and KEY_LINE_REGEX.match(text, line_start + indentation, end) is not None:
+                    boundaries.append(line_start)
+                elif other_lines is not None and INDENTED_KEY_LINE_REGEX.match(text, line_start, end) is not None:
+                    other_lines.append(line_start)
+                elif VARIABLE_LINE_REGEX.match(text, line_start, end) is not None:
+                    variable_start = line_start
+                elif IMPORT_LINE_REGEX.match(text, line_start, end) is not None:
+                    return None
+            line_start = None
+
+        match = PRE_SCAN_REGEX.search(text, pos, end)
+        if match is None:
+            break
+
+        token = match.group()
+        pos = match.end()
+        if token == '\n':
+            line_start = current_line_start = pos
+        elif token[-1] == ':':
+            # Only keys after the indentation of the line start pairs
+            if depth == 0 and text[current_line_start:match.start()].strip(' \t') != '':
+                return None
+        elif token == '#':
+            new_line = text.find('\n', pos, end)
+            pos = end if new_line == -1 else new_line
+        elif token == '[':
+            depth += 1
+        elif token == ']':
+            depth -= 1
+            if depth < 0:
+                return None
+        else:
+            string_end = STRING_END_REGEXES[token].match(text, pos, end)
+            if string_end is None:
+                return None
+            pos = string_end.end()
+
+    if variable_start is not None:
+        variables.append((variable_start, end))
+    return boundaries, variables
+
+
+def in_object_bodies(text: str, boundaries: List[int], other_lines: List[int]) -> bool:
+    """
+    Checks that every line of a pair with a different indentation is in the body of a top-level object. Otherwise
+    (i.e. more indented lines after a value) the parser of a segment may not find the pairs where the serial one does
+    :param text: Scanned text
+    :param boundaries: Start positions of the lines of the top-level pairs
+    :param other_lines: Start positions of the lines of pairs with a different indentation
+    :return: True if all the lines are in the body of an object, False otherwise
+    """
+    for line_start in other_lines:
+        idx = bisect.bisect_right(boundaries, line_start) - 1
+        if idx < 0:
+            return False
+        # The boundaries are lines where pre_scan() found a key
+        key_end = KEY_LINE_REGEX.match(text, boundaries[idx]).end()  # type: ignore[union-attr]
+        if OBJECT_KEY_LINE_REST_REGEX.match(text, key_end) is None:
+            return False
+    return True
+
+
+def split_segments(text: str, boundaries: List[int], count: int) -> List[Tuple[int, int]]:
+    """
+    Splits a text in segments of similar length at some of the possible boundaries
+    :param text: Text to split
+    :param boundaries: Positions where a segment can start
+    :param count: Maximum number of segments
+    :return: List of (start, end) positions of the segments
+    """
+    length = max(len(text) // count, MIN_SEGMENT_LENGTH)
+    segments = []
+    start = 0
+    for boundary in boundaries:
+        if boundary - start >= length:
+            segments.append((start, boundary))
+            start = boundary
+    segments.append((start, len(text)))
+    return segments
+
+
+def parse_segment(segment: str, variables: Dict[str, Any], options: Dict[str, Any]) -> Dict:
+    """
+    Parses a segment of a text in a worker process
+    :param segment: Text of the segment
+    :param variables: Variables defined before the segment
+    :param options: Rest of the arguments of the parser
+    :raise: GuraError if the segment is not valid
+    :return: Parsed values
+    """
+    return specialized_parser()(variables=variables, **options).loads(segment)
+
+
+def parallel_loads(
+        text: str,
+        workers: int,
+        env: Optional[Mapping[str, str]] = None,
+        variables: Optional[Dict[str, Any]] = None,
+        **options: Any
+) -> Dict:
+    """
+    Parses a text in Gura format splitting it at top-level pairs and parsing the segments in a pool of processes.
+    Every segment gets the variables defined before it. If a segment is not valid or a top-level key is defined in
+    more than one segment, the text is parsed serially, so raised errors are always the same as loads() ones
+    :param text: Text to be parsed
+    :param workers: Number of processes
+    :param env: Mapping used instead of the environment variables. By default, a snapshot of os.environ is taken
+    :param variables: Variables defined before parsing the text
+    :param options: Rest of the arguments of GuraParser (parse_float, parse_int, numeric_arrays and iterative). They
+    must be picklable
+    :raise: ParseError if the syntax of text is invalid
+    :return: Dict with all the parsed values
+    """
+    # All the segments must see the same environment
+    if env is None:
+        env = os.environ.copy()
+    options['env'] = env
+    initial_variables = dict(variables) if variables is not None else {}
+
+    other_lines: List[int] = []
+    scan = pre_scan(text, other_lines=other_lines) if workers > 1 else None
+    segments = split_segments(text, scan[0], workers * SEGMENTS_PER_WORKER) if scan is not None else []
+    if scan is None or len(segments) < 2 or not in_object_bodies(text, scan[0], other_lines):
+        return parse_segment(text, initial_variables, options)
+
+    # concurrent.futures (and multiprocessing) are only imported when a pool is needed, as importing them is slow
+    from concurrent.futures import ProcessPoolExecutor
+    try:
+        segments_variables = segments_initial_variables(text, segments, scan[1], initial_variables, options)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                parse_segment,
+                [text[start:end] for start, end in segments],
+                segments_variables,
+                [options] * len(segments)
+            ))
+    except GuraError:
+        # The serial parsing raises the error with its position in the whole text
+        return parse_segment(text, initial_variables, options)
+
+    result: Dict[str, Any] = {}
+    for segment_result in results:
+        if not result.keys().isdisjoint(segment_result):
+            # The serial parsing raises DuplicatedKeyError (or any error found before it)
+            return parse_segment(text, initial_variables, options)
+        result.update(segment_result)
+    return result
+
+
+def segments_initial_variables(
+        text: str,
+        segments: List[Tuple[int, int]],
+        variables_definitions: List[Tuple[int, int]],
+        initial_variables: Dict[str, Any],
+        options: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Gets the variables defined before every segment, parsing the variables definitions in order
+    :param text: Whole text
+    :param segments: List of (start, end) positions of the segments
+    :param variables_definitions: List of (start, end) positions of the variables definitions
+    :param initial_variables: Variables defined before the text
+    :param options: Rest of the arguments of the parser
+    :raise: GuraError if some definition is not valid
+    :return: Variables for every segment
+    """
+    variables = initial_variables
+    result = []
+    definitions = iter(variables_definitions)
+    definition = next(definitions, None)
+    for start, _end in segments:
+        while definition is not None and definition[0] < start:
+            # Every definition is parsed with the variables defined before it, as loads() resets them
+            parser = specialized_parser()(variables=variables, **options)
+            parser.loads(text[definition[0]:definition[1]])
+            variables = parser.variables
+            definition = next(definitions, None)
+        result.append(dict(variables))
+    return result
+
+
+class LoadManyResults(list):
+    """
+    Results of load_many(): for every path, in the same order, its parsed values or the error raised while reading or
+    parsing it. It also reports the aggregate throughput
+    """
+    elapsed: float
+    total_bytes: int
+
+    def __init__(self, results: Iterable[Union[Dict, LoadError]], elapsed: float, total_bytes: int):
+        super(LoadManyResults, self).__init__(results)
+        self.elapsed = elapsed
+        self.total_bytes = total_bytes
+
+    @property
+    def errors(self) -> List[LoadError]:
+        """
+        Gets the errors of the files which could not be loaded
+        :return: List of errors
+        """
+        return [result for result in self if isinstance(result, LOAD_ERRORS)]
+
+    @property
+    def files_per_second(self) -> float:
+        """
+        Gets the number of files loaded per second
+        :return: Files per second
+        """
+        return len(self) / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """
+        Gets the number of bytes loaded per second
+        :return: Bytes per second
+        """
+        return self.total_bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return f'LoadManyResults({len(self)} files, {len(self.errors)} errors, {self.files_per_second:.1f} files/s, ' \
+               f'{self.bytes_per_second / (1024 * 1024):.2f} MiB/s)'
+
+
+def load_file_in_worker(path: str, options: Dict[str, Any]) -> Tuple[Union[Dict, LoadError], int]:
+    """
+    Loads a file in a worker process. Imported files are read from the worker import cache
+    :param path: Path of the file
+    :param options: Arguments of the parser
+    :return: Tuple with the parsed values (or the raised error) and the size of the file
+    """
+    try:
+        with open(path, 'r') as file:
+            size = os.fstat(file.fileno()).st_size
+            text = file.read()
+    except (OSError, ValueError) as e:
+        return e, 0
+
+    try:
+        return specialized_parser()(import_cache=worker_import_cache, **options).loads(text), size
+    except LOAD_ERRORS as e:
+        return e, size
+
+
+def load_many(
+        paths: Iterable[str],
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        env: Optional[Mapping[str, str]] = None,
+        **options: Any
+) -> LoadManyResults:
+    """
+    Loads many Gura files spreading them across a pool of processes. Every file is parsed as gura.loads() does with
+    its content (imports are relative to the current directory). Every worker keeps a cache with the content of the
+    imported files, so files imported by many others are read only once per worker
+    :param paths: Paths of the files
+    :param workers: Number of processes. By default, the number of CPUs. If it is 1, files are loaded in this process
+    :param chunksize: Number of files sent to a worker at a time. By default, the files are split in four chunks per
+    worker
+    :param env: Mapping used instead of the environment variables. By default, a snapshot of os.environ is taken
+    :param options: Rest of the arguments of GuraParser (parse_float, parse_int, numeric_arrays and iterative). They
+    must be picklable
+    :return: List with the parsed values of every file, or the error raised when loading it (see LOAD_ERRORS), in the
+    same order as paths. Its files_per_second and bytes_per_second attributes report the aggregate throughput
+    """
+    paths = list(paths)
+    options['env'] = env if env is not None else os.environ.copy()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(paths) // (workers * SEGMENTS_PER_WORKER))
+
+    start = time.perf_counter()
+    if workers == 1 or len(paths) <= 1:
+        loaded = [load_file_in_worker(path, options) for path in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            loaded = list(executor.map(load_file_in_worker, paths, repeat(options), chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    return LoadManyResults((result for result, _size in loaded), elapsed, sum(size for _result, size in loaded))
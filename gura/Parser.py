@@ -1,4 +1,4 @@
-from typing import Optional, Any
+from typing import Optional, Any, List, Tuple
 
 
 class GuraError(Exception):
@@ -12,6 +12,10 @@ class GuraError(Exception):
     def __str__(self):
         return '%s at line %s (text position = %s)' % (self.msg % self.args, self.line, self.pos)
 
+    def __reduce__(self):
+        # Errors are pickled to be sent from worker processes
+        return type(self), (self.pos, self.line, self.msg) + self.args
+
 
 class ParseError(GuraError):
     """Raises when Gura syntax is invalid"""
@@ -182,6 +186,37 @@ class Parser:
                 self.text[last_error_pos]
             )
 
+    def furthest_error(self, errors: List[Tuple[str, ParseError]]) -> ParseError:
+        """
+        Gets the error to raise when none of some rules matched, following the same criteria as match(): the error of
+        the rule that reached the furthest position or, if several rules reached it, a new error listing them
+        :param errors: Rules names and the errors they raised, in the order they were tried
+        :return: Error to raise
+        """
+        last_error_pos = -1
+        last_exception: Optional[ParseError] = None
+        last_error_rules: List[str] = []
+        for rule, e in errors:
+            if e.pos > last_error_pos:
+                last_exception = e
+                last_error_pos = e.pos
+                last_error_rules.clear()
+                last_error_rules.append(rule)
+            elif e.pos == last_error_pos:
+                last_error_rules.append(rule)
+
+        if last_exception is not None and len(last_error_rules) == 1:
+            return last_exception
+
+        last_error_pos = min(len(self.text) - 1, last_error_pos)
+        return ParseError(
+            last_error_pos,
+            self.line,
+            'Expected %s but got "%s"',
+            ', '.join(last_error_rules),
+            self.text[last_error_pos]
+        )
+
     def maybe_char(self, chars: Optional[str] = None) -> Optional[str]:
         """
         Like char() but returns None instead of raising ParseError
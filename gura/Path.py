@@ -0,0 +1,92 @@
+import re
+from typing import Any
+from gura.Diff import Path, format_path
+from gura.Lazy import LazyObject
+
+# Parts of a path: a key (maybe after a dot) or an index between brackets
+PATH_PART_REGEX = re.compile(r'(?:^|\.)([0-9A-Za-z_]+)|\[(-?[0-9]+)\]')
+
+# Value returned by PathAccessor.get() when there is no default value
+MISSING = object()
+
+
+def parse_path(path: str) -> Path:
+    """
+    Gets the keys and indexes of a path like servers[3].limits.rps
+    :param path: Text of the path
+    :raise: ValueError if the path is not valid
+    :return: Keys (strings) and indexes (ints) from the root to the value
+    """
+    parts = []
+    pos = 0
+    while pos < len(path):
+        match = PATH_PART_REGEX.match(path, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f'Invalid path "{path}" at position {pos}')
+        key, index = match.groups()
+        parts.append(key if key is not None else int(index))
+        pos = match.end()
+    if len(parts) == 0:
+        raise ValueError('Path can not be empty')
+    return tuple(parts)
+
+
+class PathAccessor:
+    """
+    Path compiled once to get the value at it from many parsed values. It works with the results of gura.loads() (and
+    any other mappings and sequences, like frozen, shared or overlaid values) and with lazy views of gura.loads_lazy(),
+    where only the values along the path are parsed
+    """
+    parts: Path
+
+    def __init__(self, path: str):
+        """
+        :param path: Text of the path, with keys separated by dots and indexes between brackets (i.e.
+        servers[3].limits.rps). Negative indexes count from the end of arrays
+        :raise: ValueError if the path is not valid
+        """
+        self.parts = parse_path(path)
+
+    def get(self, values: Any, default: Any = MISSING) -> Any:
+        """
+        Gets the value at the path
+        :param values: Parsed values or a lazy view
+        :param default: Value returned if the path does not exist. If it is not specified, an error is raised instead
+        :raise: KeyError, IndexError or TypeError if the path does not exist and there is no default value
+        :raise: GuraError if a lazy text is not valid
+        :return: Value at the path. Objects of lazy texts are parsed completely, so they are dicts
+        """
+        value = values
+        try:
+            for part in self.parts:
+                value = value[part]
+        except (KeyError, IndexError, TypeError):
+            if default is MISSING:
+                raise
+            return default
+        return value.load() if isinstance(value, LazyObject) else value
+
+    def __call__(self, values: Any, default: Any = MISSING) -> Any:
+        return self.get(values, default)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, PathAccessor) and self.parts == other.parts
+
+    def __hash__(self):
+        return hash(self.parts)
+
+    def __str__(self):
+        return format_path(self.parts)
+
+    def __repr__(self):
+        return f'PathAccessor({str(self)!r})'
+
+
+def path(text: str) -> PathAccessor:
+    """
+    Compiles a path to get the value at it from parsed values (see PathAccessor)
+    :param text: Text of the path, with keys separated by dots and indexes between brackets (i.e. servers[3].limits.rps)
+    :raise: ValueError if the path is not valid
+    :return: Accessor
+    """
+    return PathAccessor(text)
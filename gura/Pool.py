@@ -0,0 +1,72 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Type, Iterator
+from gura.GuraParser import GuraParser, specialized_parser
+
+
+class ParserPool:
+    """
+    Thread-safe pool of parsers created with the same arguments. A parser is used by only one thread at a time and it
+    is reset when it is returned to the pool, so texts parsed by different threads never share variables, imported
+    files or any other state. The pool is guarded by a lock (it does not rely on the GIL), so it is safe on
+    free-threaded builds too
+    """
+    parser_class: Type[GuraParser]
+    options: Dict[str, Any]
+    max_idle: int
+
+    def __init__(self, parser_class: Optional[Type[GuraParser]] = None, max_idle: int = 16, **options: Any):
+        """
+        :param parser_class: Class of the parsers. By default, the one used by gura.loads()
+        :param max_idle: Maximum number of parsers kept in the pool when they are not in use
+        :param options: Arguments of the parsers constructor. They are shared by all the parsers, so they must not be
+        modified while the pool is in use
+        """
+        self.parser_class = parser_class if parser_class is not None else specialized_parser()
+        self.options = options
+        self.max_idle = max_idle
+        self.__lock = threading.Lock()
+        self.__idle: List[GuraParser] = []
+
+    def acquire(self) -> GuraParser:
+        """
+        Takes a parser from the pool, creating a new one if all of them are in use. It must be returned with release()
+        :return: Parser for the exclusive use of the caller
+        """
+        with self.__lock:
+            if len(self.__idle) > 0:
+                return self.__idle.pop()
+        return self.parser_class(**self.options)
+
+    def release(self, parser: GuraParser):
+        """
+        Returns a parser to the pool. It is reset, so it does not keep the last parsed text alive. If the pool is full,
+        the parser is discarded
+        :param parser: Parser taken with acquire()
+        """
+        parser.reset()
+        with self.__lock:
+            if len(self.__idle) < self.max_idle:
+                self.__idle.append(parser)
+
+    @contextmanager
+    def parser(self) -> Iterator[GuraParser]:
+        """
+        Takes a parser from the pool for the duration of a with block
+        :return: Context manager which gives the parser
+        """
+        parser = self.acquire()
+        try:
+            yield parser
+        finally:
+            self.release(parser)
+
+    def loads(self, text: str) -> Any:
+        """
+        Parses a text in Gura format with a parser of the pool. It can be called from several threads at the same time
+        :param text: Text to be parsed
+        :raise: ParseError if the syntax of text is invalid
+        :return: Dict with all the parsed values (or an instance of `into` type if it was specified)
+        """
+        with self.parser() as parser:
+            return parser.loads(text)
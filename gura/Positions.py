@@ -0,0 +1,188 @@
+import bisect
+import re
+from array import array
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Tuple, Union, Iterator
+from gura.Diff import Path, format_path
+
+# Trailing spaces consumed after a value
+TRAILING_WS_CHARS = ' \t\f\v\r\n'
+
+# Line breaks, counting \r\n as only one
+LINE_BREAK_REGEX = re.compile(r'\r\n|[\f\v\r\n]')
+
+
+class PositionMap(Mapping):
+    """
+    Side table with the positions of the pairs of a parsed text, filled by GuraParser when it is created with
+    positions=True. Entries are stored in flat arrays in the order their values end (so the entries of a nested object
+    come right before its own entry), and the path of every entry is computed only when the map is queried. Besides
+    the pairs, it has an entry for every element of an array which is an object or an array (its key is the index), so
+    the pairs inside them have a path too. Scalar elements of arrays and pairs of imported files are not recorded.
+    As a mapping, it maps every path to the (start, end) offsets of its pair in the original text, from the first char
+    of the key to the last char of the value (excluded)
+    """
+    text: str
+    names: List[Union[str, int]]
+    firsts: array
+    starts: array
+    value_starts: array
+    ends: array
+
+    def __init__(self):
+        self.text = ''
+        self.names = []
+        # Index of the first entry of the values nested in every entry
+        self.firsts = array('q')
+        self.starts = array('q')
+        self.value_starts = array('q')
+        self.ends = array('q')
+        self.__imported_length = 0
+        self.__offset = 0
+        self.__index: Optional[Dict[Path, int]] = None
+        self.__line_starts: Optional[List[int]] = None
+
+    def add(self, text: str, name: Union[str, int], start: int, value_start: int, end: int, is_object: bool):
+        """
+        Records a parsed pair or array element. The entries of its nested values must have been already recorded
+        :param text: Text being parsed
+        :param name: Key of the pair or index of the element
+        :param start: Start of the key (or of the element)
+        :param value_start: Start of the value
+        :param end: Position after the last char matched by the value (trailing spaces are discarded)
+        :param is_object: True if the value is an object in the following lines
+        """
+        # The nested entries are the last ones recorded which start after the value start. Every nested object or
+        # array spans its own nested entries, so only the direct children are visited
+        first = len(self.names)
+        child_start = -1
+        while first > 0 and self.starts[first - 1] >= value_start:
+            child_start = self.starts[first - 1]
+            first = self.firsts[first - 1]
+
+        if is_object and child_start != -1:
+            # An object starts at its first key and ends with its last value
+            value_start = child_start
+            end = self.ends[-1]
+            if start == -1:
+                start = value_start
+        else:
+            while end > value_start and text[end - 1] in TRAILING_WS_CHARS:
+                end -= 1
+            if start == -1:
+                while value_start < end and text[value_start] in TRAILING_WS_CHARS:
+                    value_start += 1
+                start = value_start
+
+        self.names.append(name)
+        self.firsts.append(first)
+        self.starts.append(start)
+        self.value_starts.append(value_start)
+        self.ends.append(end)
+
+    def set_imported(self, imported_length: int, prefix_length: int):
+        """
+        Sets the part of the parsed text taken by imported files, which replace the imports of the original text
+        :param imported_length: Length of the content of the imported files at the beginning of the parsed text
+        :param prefix_length: Length of the replaced prefix of the original text (imports, variables and useless lines)
+        """
+        self.__imported_length = imported_length
+        self.__offset = imported_length - prefix_length
+
+    def finish(self, text: str):
+        """
+        Discards the entries of imported files and makes the rest of offsets relative to the original text
+        :param text: Original text
+        """
+        self.text = text
+        if self.__offset == 0 and self.__imported_length == 0:
+            return
+
+        # Imported files are at the beginning of the parsed text, so their entries are the first ones
+        skipped = 0
+        while skipped < len(self.names) and self.starts[skipped] < self.__imported_length:
+            skipped += 1
+        offset = self.__offset
+        self.names = self.names[skipped:]
+        self.firsts = array('q', (first - skipped for first in self.firsts[skipped:]))
+        self.starts = array('q', (start - offset for start in self.starts[skipped:]))
+        self.value_starts = array('q', (start - offset for start in self.value_starts[skipped:]))
+        self.ends = array('q', (end - offset for end in self.ends[skipped:]))
+        self.__imported_length = self.__offset = 0
+
+    def __get_index(self) -> Dict[Path, int]:
+        """
+        Computes the path of every entry (only once)
+        :return: Dict with the entry index of every path, in the order of the text
+        """
+        if self.__index is None:
+            paths: List[Path] = [()] * len(self.names)
+            # Entries whose nested entries include the current one, with their first nested entry
+            ancestors: List[Tuple[int, Path]] = []
+            for idx in reversed(range(len(self.names))):
+                while len(ancestors) > 0 and ancestors[-1][0] > idx:
+                    ancestors.pop()
+                path = (ancestors[-1][1] if len(ancestors) > 0 else ()) + (self.names[idx],)
+                paths[idx] = path
+                ancestors.append((self.firsts[idx], path))
+            order = sorted(range(len(paths)), key=lambda idx: (self.starts[idx], -idx))
+            self.__index = {paths[idx]: idx for idx in order}
+        return self.__index
+
+    def __entry(self, path: Union[str, Path]) -> int:
+        """
+        Gets the entry of a path
+        :param path: Tuple of keys and indexes or its text (i.e. servers[3].limits.rps)
+        :raise: KeyError if there is no pair at the path
+        :return: Index of the entry
+        """
+        if isinstance(path, str):
+            from gura.Path import parse_path
+            try:
+                path = parse_path(path)
+            except ValueError:
+                raise KeyError(path)
+        return self.__get_index()[path]
+
+    def __getitem__(self, path: Union[str, Path]) -> Tuple[int, int]:
+        idx = self.__entry(path)
+        return self.starts[idx], self.ends[idx]
+
+    def value_span(self, path: Union[str, Path]) -> Tuple[int, int]:
+        """
+        Gets the offsets of the value of a pair
+        :param path: Tuple of keys and indexes or its text (i.e. servers[3].limits.rps)
+        :raise: KeyError if there is no pair at the path
+        :return: Start and end (excluded) of the value. For objects, from the first key to the end of the last value
+        """
+        idx = self.__entry(path)
+        return self.value_starts[idx], self.ends[idx]
+
+    def line_column(self, offset: int) -> Tuple[int, int]:
+        """
+        Gets the line and the column of an offset of the text
+        :param offset: Offset in the text
+        :return: Line and column, both starting at 1
+        """
+        if self.__line_starts is None:
+            self.__line_starts = [0] + [match.end() for match in LINE_BREAK_REGEX.finditer(self.text)]
+        line = bisect.bisect_right(self.__line_starts, offset)
+        return line, offset - self.__line_starts[line - 1] + 1
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self.__get_index())
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, path: object) -> bool:
+        if not isinstance(path, (str, tuple)):
+            return False
+        try:
+            self.__entry(path)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __repr__(self):
+        return 'PositionMap({%s})' % ', '.join(f'{format_path(path)!r}: {self[path]}' for path in self)
@@ -0,0 +1,359 @@
+import os
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+from typing import Dict, Any, Optional, Iterator, Union, Tuple, Set, TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    # multiprocessing.shared_memory was added in Python 3.8, so it is only imported when values are shared
+    from multiprocessing.shared_memory import SharedMemory
+
+# Start of the encoding, followed by the offset of the root object
+MAGIC = b'GURA\x01'
+HEADER = struct.Struct('<5sI')
+
+# Records of the encoding: a one byte tag (an ASCII letter) followed by its data. Offsets and lengths are 32-bit
+# unsigned integers. Equal strings and scalars are encoded only once
+NULL_TAG = ord('n')
+TRUE_TAG = ord('t')
+FALSE_TAG = ord('f')
+INT_TAG = ord('i')  # 64-bit signed integer
+BIG_INT_TAG = ord('b')  # Length and decimal digits of an integer which does not fit in 64 bits
+FLOAT_TAG = ord('d')  # Double
+STRING_TAG = ord('s')  # Length and UTF-8 bytes
+ARRAY_TAG = ord('a')  # Count and the offsets of the items
+INT_ARRAY_TAG = ord('I')  # Count and the items of an array of 64-bit signed integers
+FLOAT_ARRAY_TAG = ord('D')  # Count and the items of an array of doubles
+# Count, the offsets of the key (a string record) and the value of every pair in order, and the indexes of the pairs
+# sorted by key, so a key is found with a binary search
+OBJECT_TAG = ord('o')
+
+UINT = struct.Struct('<I')
+INT = struct.Struct('<q')
+FLOAT = struct.Struct('<d')
+MAX_OFFSET = 2 ** 32 - 1
+MIN_INT = -2 ** 63
+MAX_INT = 2 ** 63 - 1
+
+# Names of the shared memories published by this process (see SharedValues.attach())
+published_names: Set[str] = set()
+
+
+class SharedEncoder:
+    """Encodes parsed values in the compact format read by the shared views"""
+    data: bytearray
+    scalars: Dict[Tuple[type, Any], int]
+
+    def __init__(self):
+        self.data = bytearray(HEADER.size)
+        self.scalars = {}
+
+    def encode(self, values: Dict) -> bytes:
+        """
+        Encodes the parsed values of a text
+        :param values: Parsed values
+        :raise: TypeError if some value can not be encoded
+        :raise: OverflowError if the encoding is larger than 4 GiB
+        :return: Encoded values
+        """
+        root = self.__encode_value(values)
+        HEADER.pack_into(self.data, 0, MAGIC, root)
+        return bytes(self.data)
+
+    def __encode_value(self, value: Any) -> int:
+        """
+        Appends the record of a value (after the records of its children)
+        :param value: Value to encode
+        :raise: TypeError if the value can not be encoded
+        :return: Offset of the record
+        """
+        if isinstance(value, list):
+            # Arrays of numbers of the same type are packed
+            if len(value) > 0 and all(type(item) is float for item in value):
+                return self.__append(FLOAT_ARRAY_TAG, struct.pack(f'<I{len(value)}d', len(value), *value))
+            if len(value) > 0 and all(type(item) is int and MIN_INT <= item <= MAX_INT for item in value):
+                return self.__append(INT_ARRAY_TAG, struct.pack(f'<I{len(value)}q', len(value), *value))
+            offsets = [self.__encode_value(item) for item in value]
+            return self.__append(ARRAY_TAG, struct.pack(f'<{len(offsets) + 1}I', len(offsets), *offsets))
+
+        if isinstance(value, dict):
+            keys = list(value.keys())
+            offsets = []
+            for key, item in value.items():
+                offsets += [self.__encode_value(key), self.__encode_value(item)]
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            table = struct.pack(f'<{len(offsets) + len(order) + 1}I', len(keys), *offsets, *order)
+            return self.__append(OBJECT_TAG, table)
+
+        # Scalars are keyed by type too, as 1, 1.0 and True are equal. Floats are keyed by their bytes, as -0.0 and 0.0
+        # are equal too (and NaN is not equal to itself)
+        scalar_key = (float, FLOAT.pack(value)) if type(value) is float else (type(value), value)
+        try:
+            return self.scalars[scalar_key]
+        except KeyError:
+            pass
+        except TypeError:
+            raise TypeError(f'Object of type {type(value).__name__} can not be shared')
+
+        if value is None:
+            offset = self.__append(NULL_TAG)
+        elif isinstance(value, bool):
+            offset = self.__append(TRUE_TAG if value else FALSE_TAG)
+        elif isinstance(value, int):
+            if MIN_INT <= value <= MAX_INT:
+                offset = self.__append(INT_TAG, INT.pack(value))
+            else:
+                digits = str(value).encode('ascii')
+                offset = self.__append(BIG_INT_TAG, UINT.pack(len(digits)), digits)
+        elif isinstance(value, float):
+            offset = self.__append(FLOAT_TAG, FLOAT.pack(value))
+        elif isinstance(value, str):
+            encoded = value.encode('utf-8')
+            offset = self.__append(STRING_TAG, UINT.pack(len(encoded)), encoded)
+        else:
+            raise TypeError(f'Object of type {type(value).__name__} can not be shared')
+
+        self.scalars[scalar_key] = offset
+        return offset
+
+    def __append(self, tag: int, *parts: bytes) -> int:
+        """
+        Appends a record
+        :param tag: Tag of the record
+        :param parts: Bytes of the data of the record
+        :raise: OverflowError if the encoding is larger than 4 GiB
+        :return: Offset of the record
+        """
+        offset = len(self.data)
+        if offset > MAX_OFFSET:
+            raise OverflowError('Shared values can not be larger than 4 GiB')
+        self.data.append(tag)
+        for part in parts:
+            self.data += part
+        return offset
+
+
+def decode_value(buffer: memoryview, offset: int) -> Any:
+    """
+    Decodes the record of a value. Objects and arrays are not decoded, views of them are returned instead
+    :param buffer: Encoded values
+    :param offset: Offset of the record
+    :return: Decoded value or view
+    """
+    tag = buffer[offset]
+    data = offset + 1
+    if tag == STRING_TAG:
+        length = UINT.unpack_from(buffer, data)[0]
+        start = data + UINT.size
+        return str(buffer[start:start + length], 'utf-8')
+    if tag == INT_TAG:
+        return INT.unpack_from(buffer, data)[0]
+    if tag == FLOAT_TAG:
+        return FLOAT.unpack_from(buffer, data)[0]
+    if tag == OBJECT_TAG:
+        return SharedMappingView(buffer, offset)
+    if tag == ARRAY_TAG or tag == INT_ARRAY_TAG or tag == FLOAT_ARRAY_TAG:
+        return SharedSequenceView(buffer, offset)
+    if tag == NULL_TAG:
+        return None
+    if tag == TRUE_TAG:
+        return True
+    if tag == FALSE_TAG:
+        return False
+    if tag == BIG_INT_TAG:
+        length = UINT.unpack_from(buffer, data)[0]
+        start = data + UINT.size
+        return int(buffer[start:start + length].tobytes())
+    raise ValueError(f'Invalid shared record at offset {offset}')
+
+
+def unshare(value: Any) -> Any:
+    """
+    Decodes a value completely, getting regular dicts and lists from the views
+    :param value: Value or view got from shared values
+    :return: Copy of the value
+    """
+    if isinstance(value, SharedMappingView):
+        return {key: unshare(item) for key, item in value.items()}
+    if isinstance(value, SharedSequenceView):
+        return [unshare(item) for item in value]
+    return value
+
+
+class SharedMappingView(Mapping):
+    """
+    Read-only view of an encoded object. Keys are found with a binary search over the sorted pairs, decoding only the
+    compared keys, and values are decoded every time they are accessed
+    """
+
+    def __init__(self, buffer: memoryview, offset: int):
+        self.__buffer = buffer
+        self.__offset = offset
+        self.__len = UINT.unpack_from(buffer, offset + 1)[0]
+
+    def __pair_offset(self, index: int) -> int:
+        """
+        Gets the position of the offsets of a pair
+        :param index: Index of the pair, in order
+        :return: Position of the offset of the key, followed by the offset of the value
+        """
+        return self.__offset + 1 + UINT.size * (1 + 2 * index)
+
+    def __key(self, index: int) -> str:
+        """
+        Decodes the key of a pair
+        :param index: Index of the pair, in order
+        :return: Key
+        """
+        return decode_value(self.__buffer, UINT.unpack_from(self.__buffer, self.__pair_offset(index))[0])
+
+    def __getitem__(self, key: str) -> Any:
+        if not isinstance(key, str):
+            raise KeyError(key)
+        buffer = self.__buffer
+        order_offset = self.__pair_offset(self.__len)
+        low, high = 0, self.__len
+        while low < high:
+            middle = (low + high) // 2
+            index = UINT.unpack_from(buffer, order_offset + UINT.size * middle)[0]
+            middle_key = self.__key(index)
+            if middle_key == key:
+                return decode_value(buffer, UINT.unpack_from(buffer, self.__pair_offset(index) + UINT.size)[0])
+            if middle_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.__key(index) for index in range(self.__len))
+
+    def __len__(self) -> int:
+        return self.__len
+
+    def __repr__(self):
+        return f'SharedMappingView({unshare(self)!r})'
+
+
+class SharedSequenceView(Sequence):
+    """Read-only view of an encoded array. Items are decoded every time they are accessed"""
+
+    def __init__(self, buffer: memoryview, offset: int):
+        self.__buffer = buffer
+        self.__offset = offset
+        tag = buffer[offset]
+        # Packed numbers are read directly, other items by their offsets
+        self.__item = INT if tag == INT_ARRAY_TAG else FLOAT if tag == FLOAT_ARRAY_TAG else None
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('Shared array index out of range')
+        items_offset = self.__offset + 1 + UINT.size
+        if self.__item is not None:
+            return self.__item.unpack_from(self.__buffer, items_offset + self.__item.size * index)[0]
+        item_offset = UINT.unpack_from(self.__buffer, items_offset + UINT.size * index)[0]
+        return decode_value(self.__buffer, item_offset)
+
+    def __len__(self) -> int:
+        return UINT.unpack_from(self.__buffer, self.__offset + 1)[0]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (list, tuple, Sequence)) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(item == other_item for item, other_item in zip(self, other))
+
+    def __repr__(self):
+        return f'SharedSequenceView({unshare(self)!r})'
+
+
+class SharedValues:
+    """
+    Parsed values published in a block of shared memory, so other processes can read them without parsing the text or
+    unpickling the values. The values are encoded in a compact format which is read lazily through read-only views
+    (root is a Mapping, and nested objects and arrays are Mapping and Sequence views)
+    """
+    memory: 'SharedMemory'
+    root: SharedMappingView
+
+    def __init__(self, memory: 'SharedMemory'):
+        """
+        Use publish() or attach() instead
+        :param memory: Shared memory with encoded values
+        :raise: ValueError if the shared memory does not contain encoded values
+        """
+        self.memory = memory
+        # The buffer is only None once the memory is closed
+        buffer = cast(memoryview, memory.buf)
+        magic, root = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f'Shared memory "{memory.name}" does not contain Gura values')
+        self.root = SharedMappingView(buffer, root)
+
+    @classmethod
+    def publish(cls, values: Dict, name: Optional[str] = None) -> 'SharedValues':
+        """
+        Encodes values in a new block of shared memory. The publisher must call unlink() when the values are no longer
+        needed
+        :param values: Values to publish (i.e. the result of gura.loads()). Only objects, arrays, strings, numbers,
+        booleans and nulls can be published
+        :param name: Name of the shared memory. By default, a unique name is generated
+        :raise: TypeError if some value can not be published
+        :return: Published values
+        """
+        from multiprocessing import shared_memory
+        data = SharedEncoder().encode(values)
+        memory = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        cast(memoryview, memory.buf)[:len(data)] = data
+        published_names.add(memory.name)
+        return cls(memory)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedValues':
+        """
+        Attaches to values published by another process
+        :param name: Name of the shared memory
+        :raise: FileNotFoundError if there is no shared memory with that name
+        :raise: ValueError if the shared memory does not contain encoded values
+        :return: Published values
+        """
+        from multiprocessing import shared_memory
+        if sys.version_info >= (3, 13):
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            memory = shared_memory.SharedMemory(name=name)
+            # Before Python 3.13 the resource tracker destroys the memory when an attached process exits. It is not
+            # unregistered in the publisher (or its forked children, which share its tracker), as it must be destroyed
+            # if the publisher exits without unlinking it
+            if os.name == 'posix' and memory.name not in published_names:
+                from multiprocessing import resource_tracker
+                # The tracker registered the private name (with the leading slash)
+                resource_tracker.unregister(memory._name, 'shared_memory')  # type: ignore[attr-defined]
+        return cls(memory)
+
+    @property
+    def name(self) -> str:
+        """
+        Gets the name of the shared memory, to be sent to the processes that attach to it
+        :return: Name of the shared memory
+        """
+        return self.memory.name
+
+    def close(self):
+        """Closes the access of this process to the shared memory. Views can not be read after it"""
+        self.memory.close()
+
+    def unlink(self):
+        """Destroys the shared memory. It must be called once, by the publisher"""
+        self.memory.unlink()
+        published_names.discard(self.memory.name)
+
+    def __enter__(self) -> 'SharedValues':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,134 @@
+import os
+import threading
+from concurrent.futures import Future
+from types import MappingProxyType
+from typing import Dict, Any, Tuple, Optional
+from gura.GuraParser import load_file
+from gura.Watcher import FileVersion, file_version, cache_versions
+
+# Key of a load: absolute path of the file and its version
+LoadKey = Tuple[str, FileVersion]
+
+
+def freeze(value: Any) -> Any:
+    """
+    Gets an immutable version of a parsed value, so it can be shared by many readers: objects become read-only
+    mappings and arrays become tuples. Other values (i.e. built with into or the object hooks) are kept as they are
+    :param value: Parsed value
+    :return: Frozen value
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class SingleFlightLoader:
+    """
+    Loads Gura files parsing every version of a file (identified by its modification time and size) only once, even
+    if it is requested by many threads or tasks at the same time: the first request parses it and the rest wait for
+    that parse and share its result. Results are frozen (see freeze()) as they are shared. The last loaded version of
+    every file is kept, so later requests get it while neither the file nor any of the files it imports (directly or
+    not) are modified. Errors are not kept: they are raised to the requests that waited for the failed parse and the
+    next request parses the file again
+    """
+    options: Dict[str, Any]
+
+    def __init__(self, **options: Any):
+        """
+        :param options: Arguments of loads() used to parse the files (but import_cache)
+        """
+        self.options = options
+        self.__lock = threading.Lock()
+        self.__in_flight: Dict[LoadKey, Future] = {}
+        # Last loaded version of every file, with the versions of all the files that were read to parse it
+        self.__loaded: Dict[str, Tuple[Dict[str, FileVersion], Future]] = {}
+
+    def load(self, path: str) -> Any:
+        """
+        Loads the current version of a file, waiting for its parse if another thread is already doing it
+        :param path: Path of the file
+        :raise: OSError if the file can not be read
+        :raise: ParseError if the syntax of the file content is invalid
+        :return: Frozen parsed values
+        """
+        future, key = self.__start(path)
+        if key is not None:
+            self.__run(future, key)
+        return future.result()
+
+    async def load_async(self, path: str) -> Any:
+        """
+        Like load() but the parse is run in the default executor of the running event loop, and the requests wait for
+        it without blocking the loop. Threads and tasks share the same parses
+        :param path: Path of the file
+        :raise: OSError if the file can not be read
+        :raise: ParseError if the syntax of the file content is invalid
+        :return: Frozen parsed values
+        """
+        # asyncio is only imported by async callers, which have already imported it
+        import asyncio
+        future, key = self.__start(path)
+        if key is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.__run, future, key)
+        return await asyncio.wrap_future(future)
+
+    def clear(self):
+        """Forgets the loaded versions of all the files. Parses in progress are not affected"""
+        with self.__lock:
+            self.__loaded.clear()
+
+    def __start(self, path: str) -> Tuple[Future, Optional[LoadKey]]:
+        """
+        Gets the future result of the current version of a file, registering a new parse if there is none in progress
+        :param path: Path of the file
+        :raise: OSError if the file does not exist
+        :return: Tuple with the future and, if the caller must run the parse with __run(), its key (None otherwise)
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        key = (path, version)
+        with self.__lock:
+            loaded = self.__loaded.get(path)
+        # The imported files are checked outside the lock, as they are only read
+        if loaded is not None:
+            versions, loaded_future = loaded
+            if versions[path] == version and all(file_version(file) == versions[file] for file in versions
+                                                 if file != path):
+                return loaded_future, None
+
+        with self.__lock:
+            future = self.__in_flight.get(key)
+            if future is not None:
+                return future, None
+
+            future = Future()
+            self.__in_flight[key] = future
+            return future, key
+
+    def __run(self, future: Future, key: LoadKey):
+        """
+        Parses a file and sets the result (or the raised error) of its future
+        :param future: Future registered by __start()
+        :param key: Key of the load
+        """
+        path, version = key
+        import_cache: Dict[str, Tuple[int, int, str]] = {}
+        try:
+            value = freeze(load_file(path, import_cache=import_cache, **self.options))
+        except BaseException as e:
+            with self.__lock:
+                del self.__in_flight[key]
+            future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        with self.__lock:
+            del self.__in_flight[key]
+            versions = cache_versions(import_cache)
+            versions[path] = version
+            self.__loaded[path] = (versions, future)
+        future.set_result(value)
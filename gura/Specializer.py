@@ -0,0 +1,249 @@
+import ast
+import inspect
+import sys
+import textwrap
+from typing import Dict, List, Optional, Tuple, Type, TypeVar, cast
+from gura.Parser import Parser
+
+# Parser class to be specialized
+ParserT = TypeVar('ParserT', bound=Parser)
+
+
+class RuleCallsTransformer(ast.NodeTransformer):
+    """
+    Replaces the calls to the generic matching methods (match(), maybe_match(), char(), maybe_char(), keyword() and
+    maybe_keyword()) whose arguments are known at generation time with calls to specialized methods. The code of those
+    methods is generated by this transformer too
+    """
+    constants: Dict[str, str]
+    helpers: Dict[Tuple, str]
+    helpers_code: List[str]
+    replaced_calls: int
+
+    def __init__(self, constants: Dict[str, str]):
+        self.constants = constants
+        self.helpers = {}
+        self.helpers_code = []
+        self.replaced_calls = 0
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        func = node.func
+        if not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == 'self'
+                and len(node.keywords) == 0):
+            return node
+
+        args = self.__get_constant_args(node.args)
+        if args is None:
+            return node
+
+        if func.attr in ('match', 'maybe_match') and len(args) > 0:
+            name = self.__get_helper((func.attr,) + args, self.__generate_match)
+        elif func.attr in ('char', 'maybe_char') and len(args) <= 1:
+            name = self.__get_helper((func.attr, args[0] if len(args) == 1 else None), self.__generate_char)
+        elif func.attr in ('keyword', 'maybe_keyword') and len(args) > 0:
+            name = self.__get_helper((func.attr,) + args, self.__generate_keyword)
+        else:
+            return node
+
+        self.replaced_calls += 1
+        return ast.copy_location(ast.Call(
+            func=ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr=name, ctx=ast.Load()),
+            args=[],
+            keywords=[]
+        ), node)
+
+    def __get_constant_args(self, args: List[ast.expr]) -> Optional[Tuple[str, ...]]:
+        """
+        Gets the values of the arguments of a call if all of them are strings known at generation time
+        :param args: Arguments of the call
+        :return: Tuple of strings or None if some of the arguments is not known
+        """
+        values = []
+        for arg in args:
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                values.append(arg.value)
+            elif isinstance(arg, ast.Name) and arg.id in self.constants:
+                values.append(self.constants[arg.id])
+            else:
+                return None
+        return tuple(values)
+
+    def __get_helper(self, key: Tuple, generate) -> str:
+        """
+        Gets the name of the specialized method for a call, generating its code the first time
+        :param key: Called method and its arguments
+        :param generate: Function which returns the code of the method given its name and the key
+        :return: Name of the specialized method
+        """
+        try:
+            return self.helpers[key]
+        except KeyError:
+            name = f'_{key[0]}_{len(self.helpers)}'
+            self.helpers[key] = name
+            self.helpers_code.append(generate(name, key))
+            return name
+
+    @staticmethod
+    def __generate_match(name: str, key: Tuple) -> str:
+        """
+        Generates a method which tries some rules in order, calling their methods directly. It restores the position
+        and raises the same errors as match(). maybe_match() variants return None instead of raising
+        :param name: Name of the method
+        :param key: 'match' or 'maybe_match' followed by the rules names
+        :return: Code of the method
+        """
+        kind, rules = key[0], key[1:]
+        lines = [
+            f'def {name}(self):',
+            '    initial_pos = self.pos',
+            '    initial_line = self.line',
+        ]
+        for idx, rule in enumerate(rules):
+            lines += [
+                '    try:',
+                f'        return self.{rule}()',
+                '    except ParseError:' if kind == 'maybe_match' else '    except ParseError as e:',
+                '        self.pos = initial_pos',
+                '        self.line = initial_line',
+            ]
+            if kind == 'maybe_match':
+                continue
+            if len(rules) == 1:
+                lines.append('        raise')
+            else:
+                lines.append('        error_%d = e' % idx)
+
+        if kind == 'maybe_match':
+            lines.append('    return None')
+        elif len(rules) > 1:
+            errors = ', '.join(f'({rule!r}, error_{idx})' for idx, rule in enumerate(rules))
+            lines.append(f'    raise self.furthest_error([{errors}])')
+        return '\n'.join(lines)
+
+    @staticmethod
+    def __generate_char(name: str, key: Tuple) -> str:
+        """
+        Generates a method which matches a specific set of chars with inlined comparisons, like char(). maybe_char()
+        variants return None instead of raising
+        :param name: Name of the method
+        :param key: 'char' or 'maybe_char' followed by the chars to match (or None to match any char)
+        :return: Code of the method
+        """
+        kind, chars = key
+        raises = kind == 'char'
+        lines = [f'def {name}(self):', '    if self.pos >= self.len:']
+        if raises:
+            expected = 'next character' if chars is None else '[%s]' % chars
+            lines.append(f'        raise ParseError(self.pos + 1, self.line, '
+                         f'"Expected %s but got end of string", {expected!r})')
+        else:
+            lines.append('        return None')
+        lines.append('    next_char = self.text[self.pos + 1]')
+
+        if chars is None:
+            lines += ['    self.pos += 1', '    return next_char']
+            return '\n'.join(lines)
+
+        single_chars = ''
+        conditions = []
+        for char_range in Parser().split_char_ranges(chars):
+            if len(char_range) == 1:
+                single_chars += char_range
+            else:
+                conditions.append(f'{char_range[0]!r} <= next_char <= {char_range[2]!r}')
+        if len(single_chars) > 0:
+            conditions.append(f'next_char in {single_chars!r}')
+
+        lines += [
+            f'    if {" or ".join(conditions)}:',
+            '        self.pos += 1',
+            '        return next_char',
+        ]
+        if raises:
+            lines.append(f'    raise ParseError(self.pos + 1, self.line, '
+                         f'"Expected chars [%s] but got \\"%s\\"" % ({chars!r}, next_char))')
+        else:
+            lines.append('    return None')
+        return '\n'.join(lines)
+
+    @staticmethod
+    def __generate_keyword(name: str, key: Tuple) -> str:
+        """
+        Generates a method which matches some specific keywords, like keyword(). maybe_keyword() variants return None
+        instead of raising
+        :param name: Name of the method
+        :param key: 'keyword' or 'maybe_keyword' followed by the keywords
+        :return: Code of the method
+        """
+        kind, keywords = key[0], key[1:]
+        raises = kind == 'keyword'
+        joined = ', '.join(keywords)
+        lines = [f'def {name}(self):', '    if self.pos >= self.len:']
+        if raises:
+            lines.append(f'        raise ParseError(self.pos, self.line, '
+                         f'"Expected \\"%s\\" but got end of string", {joined!r})')
+        else:
+            lines.append('        return None')
+
+        for keyword in keywords:
+            lines += [
+                f'    if self.text.startswith({keyword!r}, self.pos + 1):',
+                f'        self.pos += {len(keyword)}',
+                f'        return {keyword!r}',
+            ]
+        if raises:
+            lines.append(f'    raise ParseError(self.pos + 1, self.line, '
+                         f'"Expected \\"%s\\" but got \\"%s\\"", {joined!r}, self.text[self.pos + 1])')
+        else:
+            lines.append('    return None')
+        return '\n'.join(lines)
+
+
+def generate_source(cls: Type[Parser]) -> str:
+    """
+    Generates the code of a subclass of a parser where the rules methods call specialized methods instead of the
+    generic match(), char() and keyword() methods. Only the methods defined in the class itself are specialized
+    :param cls: Parser class. Its source code must be available
+    :raise: OSError if the source code of the class can not be retrieved
+    :return: Code of a class with the same name as cls (so private names are mangled in the same way) that must be
+    executed in a namespace where __base__ is cls
+    """
+    module = sys.modules[cls.__module__]
+    constants = {name: value for name, value in vars(module).items() if name.isupper() and isinstance(value, str)}
+    class_def = cast(ast.ClassDef, ast.parse(textwrap.dedent(inspect.getsource(cls))).body[0])
+
+    transformer = RuleCallsTransformer(constants)
+    methods = []
+    for statement in class_def.body:
+        if not isinstance(statement, ast.FunctionDef):
+            continue
+        replaced_calls = transformer.replaced_calls
+        transformed = transformer.visit(statement)
+        if transformer.replaced_calls > replaced_calls:
+            methods.append(ast.unparse(transformed))
+
+    body = methods + transformer.helpers_code
+    return f'class {cls.__name__}(__base__):\n' + '\n\n'.join(textwrap.indent(code, '    ') for code in body) + '\n'
+
+
+def specialize(cls: Type[ParserT], name: str) -> Type[ParserT]:
+    """
+    Generates a subclass of a parser with specialized rules methods (see generate_source()). It behaves exactly like
+    the original class but avoids matching rules by their names and checking chars against ranges at runtime
+    :param cls: Parser class. Its source code must be available
+    :param name: Name of the new class
+    :raise: OSError if the source code of the class can not be retrieved
+    :return: Generated class
+    """
+    source = generate_source(cls)
+    namespace = dict(vars(sys.modules[cls.__module__]))
+    namespace['__base__'] = cls
+    exec(compile(source, f'<specialized {cls.__name__}>', 'exec'), namespace)
+
+    specialized = namespace[cls.__name__]
+    specialized.__name__ = name
+    specialized.__qualname__ = name
+    specialized.__module__ = cls.__module__
+    specialized.generated_source = source
+    return specialized
@@ -0,0 +1,430 @@
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Mapping, Tuple
+from gura.GuraParser import GuraParser, SCALAR_KEYWORDS, NUMBER_REGEX, FLOAT_CHARS_REGEX, specialized_parser
+
+# Chars that delimit the values of a Gura text. All the rest of the chars belong to keys, scalars or whitespaces
+STRUCTURAL_CHARS = '"\'\\$\n[],:#'
+STRUCTURAL_REGEX = re.compile('[' + re.escape(STRUCTURAL_CHARS) + ']')
+
+# Texts shorter than this are indexed with the regex, as converting them for NumPy costs more than scanning them
+NUMPY_MIN_LENGTH = 4096
+
+# Whitespaces and new lines which are left to the rules parser, as they have special rules (i.e. tabs in indentation)
+UNSUPPORTED_CHARS_REGEX = re.compile(r'[\t\f\v\r]')
+
+SPACES_REGEX = re.compile(' *')
+KEY_REGEX = re.compile('[0-9A-Za-z_]+')
+
+NUMBER_BASES = {'0x': 16, '0o': 8, '0b': 2}
+
+
+class UnsupportedSyntaxError(Exception):
+    """Raises when the structural engine finds something it does not handle, so the rules parser is used instead"""
+    pass
+
+
+@lru_cache(maxsize=None)
+def get_numpy() -> Any:
+    """
+    Imports NumPy the first time a long text is indexed, so it is not imported by the rest of the callers
+    :return: NumPy module, or None if it is not installed
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def structural_index(text: str) -> List[int]:
+    """
+    Finds, in one pass, the positions of all the structural chars of a text. NumPy is used if it is installed and the
+    text is long enough and ASCII (so bytes positions are the same as chars positions)
+    :param text: Text to index
+    :return: Sorted list of positions
+    """
+    numpy = get_numpy() if len(text) >= NUMPY_MIN_LENGTH else None
+    if numpy is not None:
+        try:
+            data = text.encode('ascii')
+        except UnicodeEncodeError:
+            # Bytes positions would not be chars positions
+            pass
+        else:
+            buffer = numpy.frombuffer(data, dtype=numpy.uint8)
+            structural_bytes = numpy.frombuffer(STRUCTURAL_CHARS.encode('ascii'), dtype=numpy.uint8)
+            return numpy.flatnonzero(numpy.isin(buffer, structural_bytes)).tolist()
+    return [match.start() for match in STRUCTURAL_REGEX.finditer(text)]
+
+
+def number_value(token: str) -> Any:
+    """
+    Gets the value of a number in the same way as GuraParser
+    :param token: Number as string
+    :raise: UnsupportedSyntaxError if it is not a valid number
+    :return: Int or float
+    """
+    try:
+        base = NUMBER_BASES.get(token[:2])
+        if base is not None:
+            return int(token[2:], base)
+
+        if token[-3:] in ('inf', 'nan'):
+            return float(token)
+
+        return float(token) if FLOAT_CHARS_REGEX.search(token, 1) is not None else int(token)
+    except ValueError:
+        raise UnsupportedSyntaxError
+
+
+class StructuralParser(GuraParser):
+    """
+    Two-stage parser for large machine-generated texts. First, the positions of all the structural chars are indexed
+    in one bulk pass (see structural_index()). Then values are built jumping between indexed positions: keys are the
+    slices before colons, scalars the slices between delimiters and strings the slices between quotes, without
+    matching char by char. Texts with constructions it does not handle (imports, multiline strings, objects inside
+    arrays, comments inside arrays, tabs, etc.) or with errors are parsed by the rules parser, so results and errors
+    are always the same as loads()
+    """
+    index: List[int]
+    length: int
+
+    def __init__(self, env: Optional[Mapping[str, str]] = None, variables: Optional[Dict[str, Any]] = None):
+        super(StructuralParser, self).__init__(env=env, variables=variables)
+        self.index = []
+        self.length = 0
+
+    def loads(self, text: str) -> Dict:
+        """
+        Parses a text in Gura format
+        :param text: Text to be parsed
+        :raise: ParseError if the syntax of text is invalid
+        :return: Dict with all the parsed values
+        """
+        self.reset()
+        initial_variables = dict(self.variables)
+        try:
+            return self.__parse(text)
+        except UnsupportedSyntaxError:
+            self.variables = initial_variables
+            parser = specialized_parser()(env=self.env, variables=initial_variables)
+            result = parser.loads(text)
+            self.variables = parser.variables
+            return result
+
+    def __parse(self, text: str) -> Dict:
+        """
+        Parses a text with the structural index
+        :param text: Text to be parsed
+        :raise: UnsupportedSyntaxError if the text must be parsed by the rules parser
+        :return: Dict with all the parsed values
+        """
+        if UNSUPPORTED_CHARS_REGEX.search(text) is not None:
+            raise UnsupportedSyntaxError
+
+        self.text = text
+        self.len = len(text) - 1
+        self.line = 1
+        self.length = len(text)
+        self.environment = self.env
+
+        # The end of the text is indexed too, so every line finishes in an indexed position
+        self.index = structural_index(text)
+        self.index.append(self.length)
+
+        index = self.index
+        root: Dict[str, Any] = {}
+        blocks = [root]  # Objects being filled, the one at position n has indentation 4 * n
+        is_opened = False  # If the last pair has no value, so the next one must be its first child
+        i = 0  # Position in index of the first structural char of the current line
+        start = 0  # Position in text of the start of the current line
+        while start < self.length:
+            # The regex can match an empty string, so it always matches
+            first = SPACES_REGEX.match(text, start).end()  # type: ignore[union-attr]
+            p = index[i]
+            if first == p:
+                char = self.__char_at(p)
+                if char == '':
+                    # Whitespaces at the end of the text are a valid line only if they finish in a new line
+                    if first > start:
+                        raise UnsupportedSyntaxError
+                    break
+                if char == '$' and first == start:
+                    i = self.__variable(i)
+                elif char == '\n' or char == '#':
+                    i = self.__line_end(i, first - 1)
+                else:
+                    raise UnsupportedSyntaxError
+                start = index[i] + 1
+                i += 1
+                continue
+
+            # Pairs: key, colon and value
+            key = text[first:p]
+            indentation = first - start
+            if self.__char_at(p) != ':' or KEY_REGEX.fullmatch(key) is None or indentation % 4 != 0:
+                raise UnsupportedSyntaxError
+
+            level = indentation // 4
+            if is_opened:
+                if level != len(blocks) - 1:
+                    raise UnsupportedSyntaxError
+            elif level < len(blocks):
+                del blocks[level + 1:]
+            else:
+                raise UnsupportedSyntaxError
+
+            block = blocks[level]
+            if key in block:
+                raise UnsupportedSyntaxError
+
+            value, i, is_opened = self.__pair_value(i + 1, p)
+            block[key] = value
+            if is_opened:
+                blocks.append(value)
+
+            start = index[i] + 1
+            i += 1
+
+        if is_opened or len(root) == 0:
+            raise UnsupportedSyntaxError
+        return root
+
+    def __char_at(self, pos: int) -> str:
+        """
+        Gets the char at a specific position
+        :param pos: Position in text
+        :return: Char or empty string if it is the end of the text
+        """
+        return self.text[pos] if pos < self.length else ''
+
+    def __line_end(self, i: int, pos: int, is_primitive: bool = False) -> int:
+        """
+        Checks that the rest of a line contains only whitespaces and, optionally, a comment
+        :param i: Position in index of the next structural char
+        :param pos: Position in text of the last consumed char
+        :param is_primitive: True if the last value is a primitive of a pair, which consumes the whitespaces after it.
+        Otherwise, whitespaces at the end of the text are not valid
+        :raise: UnsupportedSyntaxError if the line contains something else
+        :return: Position in index of the new line char (or the end of the text) which finishes the line
+        """
+        index = self.index
+        p = index[i]
+        gap = self.text[pos + 1:p]
+        if gap.strip(' ') != '' or p == self.length and gap != '' and not is_primitive:
+            raise UnsupportedSyntaxError
+
+        char = self.__char_at(p)
+        if char == '#':
+            while self.__char_at(index[i]) not in ('\n', ''):
+                i += 1
+        elif char != '\n' and char != '':
+            raise UnsupportedSyntaxError
+        return i
+
+    def __pair_value(self, i: int, colon: int) -> Tuple[Any, int, bool]:
+        """
+        Parses the value of a pair and the rest of its line
+        :param i: Position in index of the first structural char after the colon
+        :param colon: Position in text of the colon
+        :raise: UnsupportedSyntaxError if the value is not handled
+        :return: Tuple with the value, the position in index of the end of the line and True if the pair has no value,
+        so it is the parent of the next pairs (the value is the new empty object in that case)
+        """
+        p = self.index[i]
+        token = self.text[colon + 1:p].strip(' ')
+        if token != '':
+            return self.__scalar(token), self.__line_end(i, p - 1, True), False
+
+        char = self.__char_at(p)
+        if char == '\n' or char == '#':
+            return {}, self.__line_end(i, p - 1), True
+        if char == '[':
+            value, i, end = self.__array(i)
+            return value, self.__line_end(i, end), False
+
+        value, i, end = self.__quoted_value(i)
+        return value, self.__line_end(i, end, True), False
+
+    def __variable(self, i: int) -> int:
+        """
+        Parses a variable definition line
+        :param i: Position in index of the dollar sign
+        :raise: UnsupportedSyntaxError if the value is not handled or the variable was already defined
+        :return: Position in index of the end of the line
+        """
+        text = self.text
+        index = self.index
+        p = index[i]
+        colon = index[i + 1]
+        key = text[p + 1:colon]
+        if self.__char_at(colon) != ':' or KEY_REGEX.fullmatch(key) is None or key in self.variables:
+            raise UnsupportedSyntaxError
+
+        i += 2
+        q = index[i]
+        token = text[colon + 1:q].strip(' ')
+        if token != '':
+            if NUMBER_REGEX.fullmatch(token) is None:
+                raise UnsupportedSyntaxError
+            value, end = number_value(token), q - 1
+        else:
+            value, i, end = self.__quoted_value(i)
+
+        self.variables[key] = value
+        return self.__line_end(i, end)
+
+    @staticmethod
+    def __scalar(token: str) -> Any:
+        """
+        Gets the value of a keyword or a number
+        :param token: Text between delimiters, without whitespaces
+        :raise: UnsupportedSyntaxError if it is not a valid keyword or number
+        :return: Value
+        """
+        if token in SCALAR_KEYWORDS:
+            return SCALAR_KEYWORDS[token]
+        if token == 'empty':
+            return {}
+        if NUMBER_REGEX.fullmatch(token) is None:
+            raise UnsupportedSyntaxError
+        return number_value(token)
+
+    def __quoted_value(self, i: int) -> Tuple[Any, int, int]:
+        """
+        Parses a string or a variable value
+        :param i: Position in index of the opening quote or the dollar sign
+        :raise: UnsupportedSyntaxError if it is not a string nor a variable, or it is not handled
+        :return: Tuple with the value, the position in index of the next structural char and the position in text of
+        the last char of the value
+        """
+        text = self.text
+        index = self.index
+        p = index[i]
+        quote = self.__char_at(p)
+        if quote == '$':
+            return self.__delegate(p, 'variable_value')
+        if quote != '"' and quote != "'" or text.startswith(quote * 3, p):
+            raise UnsupportedSyntaxError
+
+        i += 1
+        while True:
+            q = index[i]
+            char = self.__char_at(q)
+            if char == quote:
+                return text[p + 1:q], i + 1, q
+            if char == '\n' or char == '':
+                raise UnsupportedSyntaxError
+            if quote == '"' and (char == '\\' or char == '$'):
+                # Escape sequences and variables are left to the rules method
+                return self.__delegate(p, 'basic_string')
+            i += 1
+
+    def __delegate(self, pos: int, rule: str) -> Tuple[Any, int, int]:
+        """
+        Parses a value with a rule method of GuraParser
+        :param pos: Position in text where the value starts
+        :param rule: Name of the rule method
+        :raise: UnsupportedSyntaxError if the rule raises an error
+        :return: Tuple with the value, the position in index of the next structural char and the position in text of
+        the last char of the value
+        """
+        self.pos = pos - 1
+        try:
+            value = getattr(self, rule)().value
+        except Exception:
+            # The rules parser raises the same error with the right line
+            raise UnsupportedSyntaxError
+        return value, bisect_right(self.index, self.pos), self.pos
+
+    def __array(self, i: int) -> Tuple[List, int, int]:
+        """
+        Parses an array of scalars, strings, variables values and nested arrays. Nested arrays are kept in an explicit
+        stack. New lines between elements follow the same rules as GuraParser
+        :param i: Position in index of the opening bracket
+        :raise: UnsupportedSyntaxError if some element is not handled or the array is not valid
+        :return: Tuple with the array, the position in index of the next structural char and the position in text of
+        the closing bracket
+        """
+        text = self.text
+        index = self.index
+        pos = index[i]  # Last consumed char
+        i += 1
+        result: List[Any] = []
+        arrays = [result]
+        is_expecting_element = True  # After the opening bracket or a comma
+        new_lines = 0  # New lines between the last element and the next structural char
+        while True:
+            p = index[i]
+            gap = text[pos + 1:p]
+            char = self.__char_at(p)
+
+            if is_expecting_element:
+                token = gap.strip(' ')
+                if token != '':
+                    if ' ' in token:
+                        raise UnsupportedSyntaxError
+                    arrays[-1].append(self.__scalar(token))
+                    is_expecting_element = False
+                    new_lines = 0
+
+                    # The char after the element is checked as any other separator
+                    pos = p - 1
+                    continue
+
+                if char == '[':
+                    nested: List[Any] = []
+                    arrays[-1].append(nested)
+                    arrays.append(nested)
+                elif char == '"' or char == "'" or char == '$':
+                    value, i, pos = self.__quoted_value(i)
+                    arrays[-1].append(value)
+                    is_expecting_element = False
+                    new_lines = 0
+                    continue
+                elif char != '\n' and char != ']':
+                    raise UnsupportedSyntaxError
+            elif gap.strip(' ') != '':
+                raise UnsupportedSyntaxError
+            elif char == ',':
+                # A comma can be in the next line of the element, at its beginning
+                if new_lines > 1 or new_lines == 1 and gap != '':
+                    raise UnsupportedSyntaxError
+                is_expecting_element = True
+            elif char == '\n':
+                new_lines += 1
+            elif char == ']':
+                # The closing bracket can be up to two lines after the element, at the beginning of the line
+                if new_lines > 2 or new_lines == 2 and gap != '':
+                    raise UnsupportedSyntaxError
+            else:
+                raise UnsupportedSyntaxError
+
+            if char == ']':
+                arrays.pop()
+                if len(arrays) == 0:
+                    return result, i + 1, p
+                is_expecting_element = False
+                new_lines = 0
+
+            pos = p
+            i += 1
+
+
+def loads_indexed(
+        text: str,
+        env: Optional[Mapping[str, str]] = None,
+        variables: Optional[Dict[str, Any]] = None
+) -> Dict:
+    """
+    Parses a text in Gura format with the two-stage structural engine (see StructuralParser). Useful for large
+    machine-generated texts. The result is always the same as loads()
+    :param text: Text to be parsed
+    :param env: Mapping used instead of the environment variables
+    :param variables: Variables defined before parsing the text, as if they were defined at its beginning
+    :raise: ParseError if the syntax of text is invalid
+    :return: Dict with all the parsed values
+    """
+    return StructuralParser(env=env, variables=variables).loads(text)
@@ -0,0 +1,184 @@
+import os
+import re
+import secrets
+from typing import Dict, Any, Optional, List, Mapping, Tuple, Union, Iterable
+from gura.GuraParser import GuraParser, MatchResult, VariableNotDefinedError
+
+# Parts of a string with variables: literal strings at even indexes and references ids at odd indexes
+Segments = Tuple[Union[str, int], ...]
+
+# Tree with the sites to fill: keys (or list indexes) to the children which contain variables, and the segments of
+# the strings with variables as leaves
+Sites = Dict[Union[str, int], Union['Sites', Segments]]
+
+
+class LateBoundVariables:
+    """
+    Environment used while compiling a template. Every lookup of a variable not defined in the text records the
+    reference and returns a unique marker, which is replaced by the variable value when the template is rendered
+    """
+    parser: GuraParser
+    nonce: str
+    references: List[Tuple[str, int, int]]
+    marker_regex: re.Pattern
+
+    def __init__(self, parser: GuraParser):
+        self.parser = parser
+        self.nonce = secrets.token_hex(8)
+        self.references = []
+        self.marker_regex = re.compile(f'\0{self.nonce}:(\\d+)\0')
+
+    def get(self, key: str, _default: Any = None) -> str:
+        """
+        Records a reference to a variable
+        :param key: Variable name
+        :param _default: Unused, every variable is considered as defined
+        :return: Marker of the reference
+        """
+        self.references.append((key, self.parser.pos, self.parser.line))
+        return f'\0{self.nonce}:{len(self.references) - 1}\0'
+
+
+class TemplateParser(GuraParser):
+    """Parser which keeps the variables not defined in the text unresolved"""
+    late_bound: LateBoundVariables
+
+    def __init__(self):
+        self.late_bound = LateBoundVariables(self)
+        super(TemplateParser, self).__init__(env=self.late_bound)
+
+    def gura_import(self) -> MatchResult:
+        """
+        Matches import sentence. The path of the imported file must be known while compiling
+        :raise: VariableNotDefinedError if the path has variables not defined in the text
+        :return: MatchResult with the path of the imported file
+        """
+        result = super(TemplateParser, self).gura_import()
+        match = self.late_bound.marker_regex.search(result.value)
+        if match is not None:
+            key, pos, line = self.late_bound.references[int(match.group(1))]
+            raise VariableNotDefinedError(
+                pos,
+                line,
+                f'Variable "{key}" is used in an import, so it must be defined in Gura'
+            )
+        return result
+
+    def compile(self, text: str) -> 'GuraTemplate':
+        """
+        Parses a text in Gura format recording where the variables not defined in it are used
+        :param text: Text to be parsed
+        :raise: ParseError if the syntax of text is invalid
+        :return: Template to render the text with different values for those variables
+        """
+        value = self.loads(text)
+        sites = self.__collect_sites(value)
+        return GuraTemplate(value, sites if isinstance(sites, dict) else {}, self.late_bound.references)
+
+    def __collect_sites(self, value: Any) -> Optional[Union[Sites, Segments]]:
+        """
+        Gets the sites of a parsed value where variables are used
+        :param value: Parsed value
+        :return: Sites tree, segments if value is a string with variables or None if there are no variables in value
+        """
+        if isinstance(value, str):
+            if self.late_bound.nonce not in value:
+                return None
+            parts = self.late_bound.marker_regex.split(value)
+            return tuple(int(part) if idx % 2 == 1 else part for idx, part in enumerate(parts))
+
+        children: Iterable[Tuple[Union[str, int], Any]]
+        if isinstance(value, dict):
+            children = value.items()
+        elif isinstance(value, list):
+            children = enumerate(value)
+        else:
+            return None
+
+        sites = {}
+        for key, child in children:
+            child_sites = self.__collect_sites(child)
+            if child_sites is not None:
+                sites[key] = child_sites
+        return sites if len(sites) > 0 else None
+
+
+class GuraTemplate:
+    """
+    Gura text parsed once that can be rendered many times with different values for the variables that are not
+    defined in it. Only the strings that use those variables (and the objects and arrays that contain them) are
+    created again in every render, the rest of values are shared between the results
+    """
+    value: Dict
+    sites: Sites
+    references: List[Tuple[str, int, int]]
+
+    def __init__(self, value: Dict, sites: Sites, references: List[Tuple[str, int, int]]):
+        self.value = value
+        self.sites = sites
+        self.references = references
+
+    @property
+    def variables(self) -> List[str]:
+        """
+        Gets the names of the variables that must be specified to render the template
+        :return: List of variable names without duplicates
+        """
+        return list(dict.fromkeys(key for key, _pos, _line in self.references))
+
+    def render(self, variables: Optional[Mapping[str, str]] = None) -> Dict:
+        """
+        Generates the result of parsing the template text with specific values for its variables
+        :param variables: Values of the variables. If it is not specified, environment variables are used
+        :raise: VariableNotDefinedError if some of the variables has no value
+        :return: Dict with all the parsed values
+        """
+        if variables is None:
+            variables = os.environ
+        return self.__fill(self.value, self.sites, variables)
+
+    def __fill(self, value: Any, sites: Union[Sites, Segments], variables: Mapping[str, str]) -> Any:
+        """
+        Creates a copy of a value with its sites filled
+        :param value: Value to copy
+        :param sites: Sites of the value
+        :param variables: Values of the variables
+        :return: Value with the variables values
+        """
+        if isinstance(sites, tuple):
+            return ''.join(self.__get_variable_value(part, variables) if isinstance(part, int) else part
+                           for part in sites)
+
+        result: Any = dict(value) if isinstance(value, dict) else list(value)
+        for key, child_sites in sites.items():
+            result[key] = self.__fill(value[key], child_sites, variables)
+        return result
+
+    def __get_variable_value(self, reference: int, variables: Mapping[str, str]) -> str:
+        """
+        Gets the value of a referenced variable
+        :param reference: Id of the reference
+        :param variables: Values of the variables
+        :raise: VariableNotDefinedError if the variable has no value
+        :return: Variable value
+        """
+        key, pos, line = self.references[reference]
+        try:
+            return variables[key]
+        except KeyError:
+            raise VariableNotDefinedError(
+                pos,
+                line,
+                f'Variable "{key}" is not defined in Gura nor in the template variables'
+            )
+
+
+def compile(text: str) -> GuraTemplate:
+    """
+    Parses a text in Gura format once to render it with different values for its variables. Variables not defined in
+    the text are resolved when the template is rendered instead of while parsing
+    :param text: Text to be parsed
+    :raise: ParseError if the syntax of text is invalid
+    :return: Template whose render() method generates the parsed dicts
+    """
+    return TemplateParser().compile(text)
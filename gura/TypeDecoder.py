@@ -0,0 +1,147 @@
+import types
+import typing
+from typing import Dict, Any, Optional, Callable, Union, List, Tuple
+
+
+class TypeDecoder:
+    """
+    Builds instances of a target type (dataclasses or classes with __slots__) from the objects generated by the
+    parser, and knows the type expected for every child value. Lists and dicts with typed values have decoders too, so
+    the objects inside them can be built
+    """
+    field_hints: Dict[str, Any]
+    value_hint: Any
+    element_hint: Any
+    build: Optional[Callable[[Dict], Any]]
+    children: Dict[str, Optional['TypeDecoder']]
+
+    def __init__(
+            self,
+            build: Optional[Callable[[Dict], Any]] = None,
+            field_hints: Optional[Dict[str, Any]] = None,
+            value_hint: Any = None,
+            element_hint: Any = None
+    ):
+        self.build = build
+        self.field_hints = field_hints if field_hints is not None else {}
+        self.value_hint = value_hint
+        self.element_hint = element_hint
+        self.children = {}
+
+    def child(self, key: str) -> Optional['TypeDecoder']:
+        """
+        Gets the decoder for the value of a specific key of the objects handled by this decoder
+        :param key: Key of the child value
+        :return: Decoder of the child value or None if the value must be kept as it is parsed
+        """
+        try:
+            return self.children[key]
+        except KeyError:
+            pass
+
+        # Children decoders are computed lazily as types could be recursive
+        hint = self.field_hints.get(key, self.value_hint)
+        decoder = get_decoder(hint) if hint is not None else None
+        self.children[key] = decoder
+        return decoder
+
+    def element(self) -> Optional['TypeDecoder']:
+        """
+        Gets the decoder for the elements of the lists handled by this decoder
+        :return: Decoder of the elements or None if they must be kept as they are parsed
+        """
+        return get_decoder(self.element_hint) if self.element_hint is not None else None
+
+
+def dataclass_fields(cls: type) -> Optional[Tuple[Any, ...]]:
+    """
+    Gets the fields of a dataclass. The class is checked as dataclasses.is_dataclass() does, so the dataclasses module
+    (added in Python 3.7) is only imported for dataclasses
+    :param cls: Class to check
+    :return: Fields of the class, or None if it is not a dataclass
+    """
+    if not hasattr(cls, '__dataclass_fields__'):
+        return None
+    import dataclasses
+    return dataclasses.fields(cls)
+
+
+# Type of unions defined with the | operator (Python 3.10+)
+UnionType = getattr(types, 'UnionType', Union)
+
+# Decoders by type hint, generated the first time they are needed
+DECODERS: Dict[Any, Optional[TypeDecoder]] = {}
+
+
+def get_decoder(hint: Any) -> Optional[TypeDecoder]:
+    """
+    Gets the decoder for a type hint, generating it if it is the first time it is used
+    :param hint: Type or type hint (i.e. List[MyClass] or Optional[MyClass])
+    :return: Decoder for the hint or None if values of that type do not need to be built
+    """
+    try:
+        return DECODERS[hint]
+    except KeyError:
+        decoder = generate_decoder(hint)
+        DECODERS[hint] = decoder
+        return decoder
+    except TypeError:
+        # Unhashable hint
+        return generate_decoder(hint)
+
+
+def generate_decoder(hint: Any) -> Optional[TypeDecoder]:
+    """
+    Generates the decoder for a type hint
+    :param hint: Type or type hint
+    :return: Decoder for the hint or None if values of that type do not need to be built
+    """
+    # typing.get_origin() and typing.get_args() were added in Python 3.8. Before Python 3.7, the origin of List[int]
+    # is List instead of list. Unions defined with the | operator have no origin
+    origin = UnionType if type(hint) is UnionType else getattr(hint, '__origin__', None)
+    args: Tuple[Any, ...] = getattr(hint, '__args__', None) or ()
+
+    if origin is Union or origin is UnionType:
+        not_none_args = [arg for arg in args if arg is not type(None)]
+        return get_decoder(not_none_args[0]) if len(not_none_args) == 1 else None
+
+    if origin is list or origin is List:
+        return TypeDecoder(element_hint=args[0] if len(args) > 0 else None)
+
+    if origin is dict or origin is Dict:
+        return TypeDecoder(value_hint=args[1] if len(args) > 1 else None)
+
+    if not isinstance(hint, type):
+        return None
+
+    fields = dataclass_fields(hint)
+    if fields is not None:
+        names = {field.name for field in fields if field.init}
+        field_hints = {name: field_hint for name, field_hint in typing.get_type_hints(hint).items() if name in names}
+        return TypeDecoder(build=lambda values: hint(**values), field_hints=field_hints)
+
+    if any('__slots__' in vars(base) for base in hint.__mro__[:-1]):
+        field_hints = typing.get_type_hints(hint)
+        slots_class: Any = hint
+        if slots_class.__init__ is not object.__init__:
+            return TypeDecoder(build=lambda values: hint(**values), field_hints=field_hints)
+
+        # Every slot is a required field (__dict__ and __weakref__ slots are not fields)
+        slot_names: List[str] = []
+        for base in hint.__mro__[:-1]:
+            slots = vars(base).get('__slots__', ())
+            slot_names.extend(name for name in ([slots] if isinstance(slots, str) else slots)
+                         if name not in ('__dict__', '__weakref__'))
+
+        def build_slots(values: Dict) -> Any:
+            missing = [name for name in slot_names if name not in values]
+            if len(missing) > 0:
+                raise TypeError(f'{hint.__name__}() missing required fields: {", ".join(map(repr, missing))}')
+            instance = slots_class.__new__(slots_class)
+            for key, value in values.items():
+                setattr(instance, key, value)
+            return instance
+
+        return TypeDecoder(build=build_slots, field_hints=field_hints)
+
+    return None
@@ -0,0 +1,188 @@
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, Tuple, List
+from gura.GuraParser import specialized_parser
+from gura.Parallel import LOAD_ERRORS
+
+# Version of a file: modification time (in nanoseconds) and size. None if the file does not exist
+FileVersion = Optional[Tuple[int, int]]
+
+
+def file_version(path: str) -> FileVersion:
+    """
+    Gets the current version of a file
+    :param path: Path of the file
+    :return: Modification time and size of the file or None if it can not be accessed
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def cache_versions(import_cache: Dict[str, Tuple[int, int, str]]) -> Dict[str, FileVersion]:
+    """
+    Gets the versions of the files read by a parse. Every imported file (including the nested imports) is recorded in
+    the import cache of the parse with the version that was read, so a later change of any of them can be detected
+    :param import_cache: Import cache passed to the parser
+    :return: Dict with the version of every imported file
+    """
+    return {path: (mtime, size) for path, (mtime, size, _content) in import_cache.items()}
+
+
+class Watcher:
+    """
+    Keeps the parsed values of a Gura file up to date. It polls the modification times of the file and of all the
+    files it imports (directly or not), waits until they stop changing (so a burst of writes causes only one reload)
+    and parses the file again. The new values replace the current ones only if the parse succeeds, in a single
+    assignment, so readers of `value` always get a complete result
+    """
+    path: str
+    value: Any
+    on_change: Optional[Callable[[Any, Any], None]]
+    on_error: Optional[Callable[[Exception], None]]
+    interval: float
+    debounce: float
+    options: Dict[str, Any]
+
+    def __init__(
+            self,
+            path: str,
+            on_change: Optional[Callable[[Any, Any], None]] = None,
+            on_error: Optional[Callable[[Exception], None]] = None,
+            interval: float = 1.0,
+            debounce: float = 0.5,
+            **options: Any
+    ):
+        """
+        Loads the file. Call start() to watch it in a background thread or poll() to check it manually
+        :param path: Path of the file. Its imports are relative to the current directory, as in gura.load_file()
+        :param on_change: Function called with the previous and the new values after every successful reload
+        :param on_error: Function called with the error raised by a failed reload (or by on_change). The previous
+        values are kept
+        :param interval: Seconds between polls of the background thread
+        :param debounce: Seconds the files must stay unchanged before reloading them
+        :param options: Rest of the arguments of gura.loads()
+        :raise: OSError if the file can not be read
+        :raise: ParseError if the syntax of the file content is invalid
+        """
+        self.path = path
+        self.on_change = on_change
+        self.on_error = on_error
+        self.interval = interval
+        self.debounce = debounce
+        self.options = options
+        self.__versions: Dict[str, FileVersion] = {}
+        self.__pending: Optional[Dict[str, FileVersion]] = None
+        self.__pending_since = 0.0
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        self.value = self.__load(self.__versions)
+
+    @property
+    def files(self) -> List[str]:
+        """
+        Gets the watched files: the root file and all the files imported in its last parse
+        :return: Paths of the files
+        """
+        return list(self.__versions)
+
+    def __load(self, versions: Dict[str, FileVersion]) -> Any:
+        """
+        Parses the file
+        :param versions: Dict where the versions of the files that are read are set, even if the parse fails
+        :raise: OSError if some file can not be read
+        :raise: UnicodeDecodeError if some file is not valid text
+        :raise: ParseError if the syntax of some file content is invalid
+        :return: Parsed values
+        """
+        versions[self.path] = file_version(self.path)
+        import_cache: Dict[str, Tuple[int, int, str]] = {}
+        try:
+            with open(self.path, 'r') as file:
+                text = file.read()
+            return specialized_parser()(import_cache=import_cache, **self.options).loads(text)
+        finally:
+            versions.update(cache_versions(import_cache))
+
+    def poll(self) -> bool:
+        """
+        Checks the watched files and reloads them if they changed and have not changed again for debounce seconds
+        :raise: The error of the reload (GuraError, OSError, UnicodeDecodeError... see LOAD_ERRORS) if it fails and
+        there is no on_error function
+        :return: True if the values were replaced
+        """
+        with self.__lock:
+            current = {path: file_version(path) for path in self.__versions}
+            if current == self.__versions:
+                self.__pending = None
+                return False
+
+            now = time.monotonic()
+            if current != self.__pending:
+                # New changes: waits until they stop
+                self.__pending = current
+                self.__pending_since = now
+            if now - self.__pending_since < self.debounce:
+                return False
+            self.__pending = None
+
+            previous = value = self.value
+            # The versions of a failed parse are kept too, so it is not repeated until some file changes again
+            previous_versions, self.__versions = self.__versions, {}
+            try:
+                value = self.__load(self.__versions)
+                error = None
+            except LOAD_ERRORS as e:
+                error = e
+                # Files that were not read (i.e. a missing imported file) are still watched, so the parse is repeated
+                # when they come back
+                for path in previous_versions:
+                    self.__versions.setdefault(path, current[path])
+            self.value = value
+
+        if error is not None:
+            if self.on_error is None:
+                raise error
+            self.on_error(error)
+            return False
+
+        if self.on_change is not None:
+            self.on_change(previous, value)
+        return True
+
+    def start(self) -> 'Watcher':
+        """
+        Starts polling the files in a daemon thread every interval seconds
+        :return: The watcher itself
+        """
+        if self.__thread is None:
+            self.__stop.clear()
+            self.__thread = threading.Thread(target=self.__run, name=f'gura-watcher-{self.path}', daemon=True)
+            self.__thread.start()
+        return self
+
+    def stop(self):
+        """Stops the polling thread and waits for it"""
+        if self.__thread is not None:
+            self.__stop.set()
+            self.__thread.join()
+            self.__thread = None
+
+    def __run(self):
+        """Polls the files until the watcher is stopped. Errors are reported to on_error and polling goes on"""
+        while not self.__stop.wait(self.interval if self.__pending is None else min(self.interval, self.debounce)):
+            try:
+                self.poll()
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+
+    def __enter__(self) -> 'Watcher':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
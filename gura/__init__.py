@@ -1,11 +1,30 @@
 from gura.GuraParser import GuraParser, InvalidIndentationError, DuplicatedVariableError, DuplicatedKeyError, \
-    VariableNotDefinedError, DuplicatedImportError, loads, dumps
+    VariableNotDefinedError, DuplicatedImportError, InvalidTypeError, GuraPrelude, loads, dumps, iterdumps, dump, \
+    register_encoder, compile_prelude, load_file
 from gura.Parser import ParseError, GuraError
+from gura.Incremental import IncrementalDumper, TrackedDict, TrackedList, track
+from gura.Document import GuraDocument, loads_document
+from gura.Template import GuraTemplate, compile
+from gura.Structural import StructuralParser, loads_indexed
+from gura.Pool import ParserPool
+from gura.SingleFlight import SingleFlightLoader
+from gura.Shared import SharedValues
+from gura.Watcher import Watcher
+from gura.Diff import Change, ChangeType, diff, patch
+from gura.Overlay import OverlayView, overlay
+from gura.Lazy import LazyObject, loads_lazy
+from gura.Path import PathAccessor, path
+from gura.Positions import PositionMap
+from gura.Parallel import LoadManyResults, load_many
 
 __version__ = "1.4.4"
 
 loads = loads
+load_file = load_file
 dumps = dumps
+iterdumps = iterdumps
+dump = dump
+register_encoder = register_encoder
 GuraError = GuraError
 ParseError = ParseError
 InvalidIndentationError = InvalidIndentationError
@@ -13,3 +32,33 @@ DuplicatedVariableError = DuplicatedVariableError
 DuplicatedKeyError = DuplicatedKeyError
 VariableNotDefinedError = VariableNotDefinedError
 DuplicatedImportError = DuplicatedImportError
+InvalidTypeError = InvalidTypeError
+IncrementalDumper = IncrementalDumper
+TrackedDict = TrackedDict
+TrackedList = TrackedList
+track = track
+GuraDocument = GuraDocument
+loads_document = loads_document
+GuraTemplate = GuraTemplate
+compile = compile
+GuraPrelude = GuraPrelude
+compile_prelude = compile_prelude
+StructuralParser = StructuralParser
+loads_indexed = loads_indexed
+LoadManyResults = LoadManyResults
+load_many = load_many
+ParserPool = ParserPool
+SingleFlightLoader = SingleFlightLoader
+SharedValues = SharedValues
+Watcher = Watcher
+Change = Change
+ChangeType = ChangeType
+diff = diff
+patch = patch
+OverlayView = OverlayView
+overlay = overlay
+LazyObject = LazyObject
+loads_lazy = loads_lazy
+PathAccessor = PathAccessor
+path = path
+PositionMap = PositionMap
@@ -108,6 +108,34 @@ class TestArraysGura(unittest.TestCase):
         parsed_data = self.__get_file_parsed_data('array_in_object_trailing_comma.ura')
         self.assertDictEqual(parsed_data, self.expected_inside_object)
 
+    def test_scalars(self):
+        """Tests arrays with all kind of scalars, which are parsed by a fast path"""
+        os.environ['gura_arrays_test_var'] = 'from env'
+        parsed_data = gura.loads(
+            '$var: 5\n'
+            'scalars: [null, true, false, empty, "basic", "with \\"escape\\"", \'literal\', """multi\nline""", '
+            '$var, $gura_arrays_test_var, 0x10, 1_000, 1.5, -inf,\n]'
+        )
+        del os.environ['gura_arrays_test_var']
+        self.assertListEqual(
+            parsed_data['scalars'],
+            [None, True, False, {}, 'basic', 'with "escape"', 'literal', 'multi\nline', 5, 'from env', 16, 1000, 1.5,
+             float('-inf')]
+        )
+
+    def test_scalars_errors(self):
+        """Tests that errors in arrays of scalars are reported in the same line and position"""
+        with self.assertRaises(gura.ParseError) as context:
+            gura.loads('a: [\n    1,\n    2\n]\nb: [3 4]')
+        self.assertEqual(context.exception.line, 5)
+
+        with self.assertRaises(gura.ParseError) as context:
+            gura.loads('a: [1, 2-3]')
+        self.assertEqual(context.exception.line, 1)
+
+        with self.assertRaises(gura.InvalidIndentationError):
+            gura.loads('a: [1,\t]')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,101 @@
+import copy
+import unittest
+from unittest import mock
+import gura
+from gura import Change, ChangeType
+from gura.Diff import format_path
+from gura.SingleFlight import freeze
+
+
+class TestDiffGura(unittest.TestCase):
+    old: dict
+    new: dict
+
+    def setUp(self):
+        self.old = gura.loads(
+            'database:\n'
+            '    host: "localhost"\n'
+            '    port: 5432\n'
+            '    replicas: ["a", "b", "c"]\n'
+            'cache:\n'
+            '    ttl: 60\n'
+            'workers: 4\n'
+        )
+        self.new = gura.loads(
+            'database:\n'
+            '    host: "localhost"\n'
+            '    port: 5433\n'
+            '    replicas: ["a", "x"]\n'
+            'workers: 4.0\n'
+            'queue:\n'
+            '    size: 10\n'
+        )
+
+    def test_diff(self):
+        """Tests that added, removed and changed paths are found"""
+        self.assertEqual(gura.diff(self.old, self.new), [
+            Change(ChangeType.REMOVED, ('cache',), old={'ttl': 60}),
+            Change(ChangeType.CHANGED, ('database', 'port'), old=5432, new=5433),
+            Change(ChangeType.CHANGED, ('database', 'replicas', 1), old='b', new='x'),
+            Change(ChangeType.REMOVED, ('database', 'replicas', 2), old='c'),
+            Change(ChangeType.CHANGED, ('workers',), old=4, new=4.0),
+            Change(ChangeType.ADDED, ('queue',), new={'size': 10}),
+        ])
+
+    def test_equal(self):
+        """Tests that equal values have no changes"""
+        self.assertEqual(gura.diff(self.old, copy.deepcopy(self.old)), [])
+
+    def test_nan(self):
+        """Tests that NaN values are not changed, as they are not equal to themselves"""
+        content = 'x: nan\nvalues: [1.5, -nan]\n'
+        self.assertEqual(gura.diff(gura.loads(content), gura.loads(content)), [])
+        self.assertEqual(gura.diff({'x': float('nan')}, {'x': 1.0})[0].path, ('x',))
+        self.assertEqual(gura.diff({'x': 'nan'}, {'x': float('nan')})[0].change_type, ChangeType.CHANGED)
+
+    def test_shared_subtrees(self):
+        """Tests that subtrees which are the same object are not compared"""
+        new = dict(self.old)
+        new['workers'] = 5
+        with mock.patch('gura.Diff.diff_values', wraps=gura.Diff.diff_values) as diff_values:
+            changes = gura.diff(self.old, new)
+        self.assertEqual(changes, [Change(ChangeType.CHANGED, ('workers',), old=4, new=5)])
+        # The root and its three values, but not the content of the shared objects
+        self.assertEqual(diff_values.call_count, 4)
+
+    def test_patch(self):
+        """Tests that changes are applied to the old values without modifying them"""
+        original = copy.deepcopy(self.old)
+        patched = gura.patch(self.old, gura.diff(self.old, self.new))
+        self.assertEqual(patched, self.new)
+        self.assertEqual(self.old, original)
+
+    def test_patch_shares_unchanged_subtrees(self):
+        """Tests that only the objects along the changed paths are copied"""
+        new = copy.deepcopy(self.old)
+        new['database']['replicas'].append('d')
+        patched = gura.patch(self.old, gura.diff(self.old, new))
+        self.assertEqual(patched, new)
+        self.assertIs(patched['cache'], self.old['cache'])
+        self.assertIsNot(patched['database'], self.old['database'])
+
+    def test_patch_frozen(self):
+        """Tests that frozen values can be compared and patched"""
+        old = freeze(self.old)
+        new = freeze(self.new)
+        self.assertEqual(gura.patch(old, gura.diff(old, new)), self.new)
+
+    def test_root_change(self):
+        """Tests the changes of values of different kinds"""
+        self.assertEqual(gura.diff({'a': [1]}, {'a': {'b': 1}}),
+                         [Change(ChangeType.CHANGED, ('a',), old=[1], new={'b': 1})])
+        self.assertEqual(gura.patch([1], gura.diff([1], {'a': 1})), {'a': 1})
+
+    def test_format_path(self):
+        """Tests the text of the paths"""
+        self.assertEqual(format_path(('servers', 3, 'limits', 'rps')), 'servers[3].limits.rps')
+        self.assertEqual(format_path((0, 'name')), '[0].name')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import glob
+import unittest
+import gura
+from gura import ParseError
+import os
+
+
+class TestDocumentGura(unittest.TestCase):
+    file_dir: str
+    content: str
+
+    def setUp(self):
+        self.file_dir = os.path.dirname(os.path.abspath(__file__))
+        full_test_path = os.path.join(self.file_dir, 'tests-files/commented.ura')
+        with open(full_test_path, 'r') as file:
+            self.content = file.read()
+
+    def test_lossless(self):
+        """Tests that a document without edits keeps the original text of all the valid test files"""
+        for file_path in glob.glob(os.path.join(self.file_dir, '../*/tests-files/*.ura')):
+            with open(file_path, 'r') as file:
+                content = file.read()
+            try:
+                document = gura.loads_document(content)
+            except (gura.GuraError, OSError):
+                continue
+            self.assertEqual(document.text, content)
+
+    def test_spans(self):
+        """Tests spans of keys, values and comments"""
+        document = gura.loads_document(self.content)
+        node = document.node('services.nginx.port')
+        self.assertEqual(self.content[node.key_start:node.key_end], 'port')
+        self.assertEqual(self.content[node.value_start:node.value_end], '80')
+
+        node = document.node('title')
+        self.assertEqual(self.content[node.start:node.end], 'title: "Gura Example"  # Inline comment\n')
+
+        node = document.node('hosts')
+        self.assertEqual(self.content[node.value_start:node.value_end], '[\n  "alpha",  # First host\n  "omega"\n]')
+
+        comments = [self.content[start:end] for start, end in document.comments]
+        self.assertListEqual(comments, ['# Service configuration', '# Inline comment', '# Web server',
+                                        '# First host'])
+
+    def test_set(self):
+        """Tests that setting a value only modifies its span"""
+        document = gura.loads_document(self.content)
+        document.set('services.nginx.port', 8080)
+        self.assertEqual(document.text, self.content.replace('port: 80\n', 'port: 8080\n'))
+
+        document.set(('services', 'apache'), {'port': 82})
+        parsed_data = gura.loads(document.text)
+        self.assertDictEqual(parsed_data['services'], {'nginx': {'host': '127.0.0.1', 'port': 8080},
+                                                       'apache': {'port': 82}})
+        self.assertIn('# Web server', document.text)
+
+    def test_insert(self):
+        """Tests inserting keys at the end of objects"""
+        document = gura.loads_document(self.content)
+        document.set('services.nginx.workers', 4)
+        document.set('services.redis', {'port': 6379})
+        document.set('services.redis.host', 'localhost')
+        document.set('debug', True)
+        parsed_data = gura.loads(document.text)
+        self.assertDictEqual(parsed_data['services']['nginx'], {'host': '127.0.0.1', 'port': 80, 'workers': 4})
+        self.assertDictEqual(parsed_data['services']['redis'], {'port': 6379, 'host': 'localhost'})
+        self.assertTrue(parsed_data['debug'])
+        self.assertTrue(document.text.startswith(self.content[:self.content.index('        port: 80\n')]))
+        self.assertTrue(document.text.endswith(self.content[self.content.index('hosts'):] + 'debug: true'))
+
+    def test_insert_nested_and_parent(self):
+        """Tests inserting keys in a nested object and in its parent at the end of the text"""
+        for content in ['x1:\n    c: null\n', 'x1:\n    c: null']:
+            document = gura.loads_document(content)
+            document.set('new3', 's')
+            document.set('x1.new2', {'q': 2})
+            document.set('x1.new1', {'q': 2})
+            self.assertDictEqual(gura.loads(document.text), {
+                'x1': {'c': None, 'new2': {'q': 2}, 'new1': {'q': 2}},
+                'new3': 's'
+            })
+
+        document = gura.loads_document('x1:\n    y:\n        c: null\nlast: 1\n')
+        document.set('x1.m', 3)
+        document.set('x1.y.n', {'q': 2})
+        self.assertEqual(document.text, 'x1:\n    y:\n        c: null\n        n:\n            q: 2\n    m: 3\n'
+                                        'last: 1\n')
+
+    def test_delete(self):
+        """Tests deleting keys"""
+        document = gura.loads_document(self.content)
+        document.delete('title')
+        document.delete('services.apache')
+        self.assertNotIn('Inline comment', document.text)
+        self.assertDictEqual(gura.loads(document.text)['services'], {'nginx': {'host': '127.0.0.1', 'port': 80}})
+
+        # An object without keys becomes an empty object
+        document.delete('services.nginx.host')
+        document.delete('services.nginx.port')
+        self.assertDictEqual(gura.loads(document.text)['services'], {'nginx': {}})
+
+        with self.assertRaises(KeyError):
+            document.delete('title')
+
+    def test_errors(self):
+        """Tests invalid edits"""
+        document = gura.loads_document(self.content)
+        with self.assertRaises(KeyError):
+            document.set('invalid.port', 5)
+        with self.assertRaises(TypeError):
+            document.set('title.sub_key', 5)
+        with self.assertRaises(ParseError):
+            gura.loads_document('invalid: [')
+
+
+if __name__ == '__main__':
+    unittest.main()
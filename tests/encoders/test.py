@@ -0,0 +1,110 @@
+import dataclasses
+import datetime
+import unittest
+from decimal import Decimal
+from enum import Enum
+from typing import NamedTuple, List, Dict
+import gura
+from gura.GuraParser import CUSTOM_ENCODERS, ENCODERS, BUILTIN_ENCODERS
+
+
+class Color(Enum):
+    RED = 'red'
+    GREEN = 'green'
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+@dataclasses.dataclass
+class Server:
+    host: str
+    port: int
+    color: Color
+    tags: List[str]
+    limits: Dict
+
+
+@dataclasses.dataclass
+class Cluster:
+    name: str
+    servers: List[Server]
+    origin: Point
+
+
+class TestEncodersGura(unittest.TestCase):
+
+    def setUp(self):
+        self.cluster = Cluster(
+            name='main',
+            servers=[
+                Server('10.0.0.1', 80, Color.RED, ['a', 'b'], {'rps': 100}),
+                Server('10.0.0.2', 81, Color.GREEN, [], {}),
+            ],
+            origin=Point(1, 2)
+        )
+        self.expected = {
+            'name': 'main',
+            'servers': [
+                {'host': '10.0.0.1', 'port': 80, 'color': 'red', 'tags': ['a', 'b'], 'limits': {'rps': 100}},
+                {'host': '10.0.0.2', 'port': 81, 'color': 'green', 'tags': [], 'limits': {}},
+            ],
+            'origin': {'x': 1, 'y': 2}
+        }
+
+    def tearDown(self):
+        CUSTOM_ENCODERS.clear()
+        ENCODERS.clear()
+        ENCODERS.update(BUILTIN_ENCODERS)
+
+    def test_dataclasses(self):
+        """Tests dumping dataclasses, NamedTuples and enums"""
+        self.assertEqual(gura.dumps(self.cluster), gura.dumps(self.expected))
+        self.assertDictEqual(gura.loads(gura.dumps({'cluster': self.cluster})), {'cluster': self.expected})
+
+    def test_cached_encoders(self):
+        """Tests that encoders are generated once per type"""
+        gura.dumps(self.cluster)
+        encoder = ENCODERS[Server]
+        gura.dumps(self.cluster)
+        self.assertIs(ENCODERS[Server], encoder)
+
+    def test_tuples_and_decimals(self):
+        """Tests dumping tuples and Decimal values"""
+        data = {'values': (1, 2, 3), 'price': Decimal('10.25'), 'inf': Decimal('-Infinity')}
+        self.assertEqual(gura.dumps(data), 'values: [1, 2, 3]\nprice: 10.25\ninf: -inf')
+
+    def test_default(self):
+        """Tests the default function for values which can not be dumped"""
+        date = datetime.date(2021, 10, 1)
+        with self.assertRaises(TypeError):
+            gura.dumps({'date': date})
+
+        result = gura.dumps({'date': date}, default=lambda value: value.isoformat())
+        self.assertEqual(result, 'date: "2021-10-01"')
+
+    def test_register_encoder(self):
+        """Tests encoders registered for a type"""
+        gura.register_encoder(datetime.date, lambda value: {'year': value.year, 'month': value.month})
+        self.assertDictEqual(gura.loads(gura.dumps({'date': datetime.date(2021, 10, 1)})),
+                             {'date': {'year': 2021, 'month': 10}})
+
+    def test_encoded_once(self):
+        """Tests that nested objects and arrays are encoded only once"""
+        calls = []
+        encoder_type, encode = ENCODERS[dict]
+        ENCODERS[dict] = (encoder_type, lambda value: calls.append(value) or encode(value))
+        data = {'a': {'b': {'c': 1}, 'd': {}}, 'e': [{'f': 2}, {}]}
+        self.assertDictEqual(gura.loads(gura.dumps(data)), data)
+        self.assertEqual(len(calls), 6)
+
+    def test_invalid_conversion(self):
+        """Tests that a default function that returns values of the same type raises an error"""
+        with self.assertRaises(TypeError):
+            gura.dumps({'value': object()}, default=lambda value: object())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from decimal import Decimal
+import unittest
+import gura
+
+
+class TestHooksGura(unittest.TestCase):
+    content: str
+
+    def setUp(self):
+        self.content = '''
+price: 10.25
+count: 3
+hex: 0xff
+server:
+    host: "127.0.0.1"
+    port: 8080
+users: [
+    name: "Carlos"
+    age: 49,
+
+    name: "Aníbal"
+    age: 60
+]
+empty_obj: empty
+'''
+
+    def test_parse_float(self):
+        """Tests that floats are converted with a custom function"""
+        parsed_data = gura.loads(self.content, parse_float=Decimal)
+        self.assertEqual(parsed_data['price'], Decimal('10.25'))
+        self.assertIsInstance(parsed_data['price'], Decimal)
+        self.assertIsInstance(parsed_data['count'], int)
+
+    def test_parse_int(self):
+        """Tests that integers (including hexadecimal ones) are converted with a custom function"""
+        parsed_data = gura.loads(self.content, parse_int=float)
+        self.assertEqual(parsed_data['count'], 3.0)
+        self.assertIsInstance(parsed_data['count'], float)
+        self.assertEqual(parsed_data['hex'], 255.0)
+        self.assertEqual(parsed_data['server']['port'], 8080.0)
+
+    def test_parse_float_special(self):
+        """Tests that inf and nan are passed to parse_float too"""
+        parsed_data = gura.loads('a: inf\nb: -inf', parse_float=str)
+        self.assertDictEqual(parsed_data, {'a': 'inf', 'b': '-inf'})
+
+    def test_object_hook(self):
+        """Tests that every object, including nested ones, the ones in arrays and the root is converted"""
+        parsed_data = gura.loads(self.content, object_hook=lambda obj: ('obj', sorted(obj)))
+        self.assertEqual(parsed_data[0], 'obj')
+        self.assertEqual(parsed_data[1], ['count', 'empty_obj', 'hex', 'price', 'server', 'users'])
+
+        parsed_data = gura.loads(self.content, object_hook=OrderedDict)
+        self.assertIsInstance(parsed_data, OrderedDict)
+        self.assertIsInstance(parsed_data['server'], OrderedDict)
+        self.assertIsInstance(parsed_data['users'][1], OrderedDict)
+        self.assertIsInstance(parsed_data['empty_obj'], OrderedDict)
+        self.assertEqual(parsed_data['users'][1]['name'], 'Aníbal')
+
+    def test_object_pairs_hook(self):
+        """Tests that object_pairs_hook receives the pairs in order and has priority over object_hook"""
+        parsed_data = gura.loads(
+            'b: 1\na:\n    d: true\n    c: false',
+            object_pairs_hook=lambda pairs: pairs,
+            object_hook=lambda obj: self.fail('object_hook must not be called')
+        )
+        self.assertEqual(parsed_data, [('b', 1), ('a', [('d', True), ('c', False)])])
+
+    def test_without_hooks(self):
+        """Tests that the result is not changed when no hook is defined"""
+        self.assertEqual(gura.loads(self.content, object_hook=None), gura.loads(self.content))
+
+    def test_invalid_number(self):
+        """Tests that hooks are not called with invalid numbers"""
+        with self.assertRaises(gura.ParseError):
+            gura.loads('a: 1.2.3', parse_float=Decimal)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -80,6 +80,36 @@ class TestImportingGura(unittest.TestCase):
             'from_original': False
         })
 
+    def test_prelude(self):
+        """Tests using a prelude with variables and imports compiled once"""
+        prelude = gura.compile_prelude('$common_path: "tests/importing/tests-files"\n'
+                                       '$number: 5\n'
+                                       'import "$common_path/one.ura"\n'
+                                       'import "$common_path/two.ura"')
+        self.assertDictEqual(dict(prelude.variables), {'common_path': 'tests/importing/tests-files', 'number': 5})
+
+        content = 'from_original_1: [1, 2, $number]\nfrom_original_2: false'
+        for _ in range(2):
+            parsed_data = gura.loads(content, context=prelude)
+            self.assertDictEqual(parsed_data, self.expected)
+
+        # Values of the prelude are not shared between results
+        parsed_data['from_file_two']['name'] = 'Carlos'
+        self.assertDictEqual(gura.loads(content, context=prelude), self.expected)
+
+    def test_prelude_duplicated(self):
+        """Tests that prelude variables, keys and imports can not be defined again"""
+        prelude = gura.compile_prelude('$number: 5\nimport "tests/importing/tests-files/three.ura"')
+        with self.assertRaises(DuplicatedVariableError):
+            gura.loads('$own: 1\n$own: 2', context=prelude)
+        with self.assertRaises(DuplicatedVariableError):
+            gura.loads('$number: 6', context=prelude)
+        with self.assertRaises(DuplicatedKeyError) as context:
+            gura.loads('a: 1\nfrom_file_three: false', context=prelude)
+        self.assertEqual(context.exception.line, 2)
+        with self.assertRaises(DuplicatedImportError):
+            gura.loads('import "tests/importing/tests-files/three.ura"', context=prelude)
+
     def test_parse_error_1(self):
         """Tests errors invalid importing sentence (there are blanks before import)"""
         with self.assertRaises(ParseError):
@@ -0,0 +1,90 @@
+import copy
+import unittest
+from typing import Dict
+import gura
+from gura import IncrementalDumper, TrackedDict, TrackedList
+import os
+
+
+class TestIncrementalGura(unittest.TestCase):
+    file_dir: str
+    parsed_data: Dict
+
+    def setUp(self):
+        self.file_dir = os.path.dirname(os.path.abspath(__file__))
+        full_test_path = os.path.join(self.file_dir, '../full/tests-files/full.ura')
+        with open(full_test_path, 'r') as file:
+            self.parsed_data = gura.loads(file.read())
+
+    def test_track(self):
+        """Tests that track converts all the nested dicts and lists"""
+        tracked = gura.track(self.parsed_data)
+        self.assertIsInstance(tracked, TrackedDict)
+        self.assertIsInstance(tracked['services']['nginx'], TrackedDict)
+        self.assertIsInstance(tracked['tango_singers'], TrackedList)
+        self.assertIsInstance(tracked['tango_singers'][0]['user1'], TrackedDict)
+        self.assertDictEqual(tracked, self.parsed_data)
+
+    def test_version(self):
+        """Tests that modifying a nested value changes the version of all its ancestors but not of its siblings"""
+        tracked = gura.track(self.parsed_data)
+        root_version = tracked.version
+        services_version = tracked['services'].version
+        apache_version = tracked['services']['apache'].version
+
+        tracked['services']['nginx']['port'] = 8080
+        self.assertNotEqual(tracked.version, root_version)
+        self.assertNotEqual(tracked['services'].version, services_version)
+        self.assertEqual(tracked['services']['apache'].version, apache_version)
+
+        list_version = tracked['tango_singers'].version
+        tracked['tango_singers'][1]['user2']['year_of_birth'] = 1915
+        self.assertNotEqual(tracked['tango_singers'].version, list_version)
+
+    def test_dumps(self):
+        """Tests that the output after several modifications is the same as the one of a full dumps"""
+        tracked = gura.track(self.parsed_data)
+        dumper = IncrementalDumper()
+        self.assertEqual(dumper.dumps(tracked), gura.dumps(self.parsed_data))
+
+        tracked['services']['nginx']['port'] = 8080
+        tracked['tango_singers'].append({'user3': {'name': 'Astor'}})
+        tracked['new_key'] = {'nested': [1, 2, {'a': 'b'}]}
+        del tracked['int1']
+        tracked['new_key']['nested'][2]['a'] = 'c'
+
+        expected = copy.deepcopy(self.parsed_data)
+        expected['services']['nginx']['port'] = 8080
+        expected['tango_singers'].append({'user3': {'name': 'Astor'}})
+        expected['new_key'] = {'nested': [1, 2, {'a': 'c'}]}
+        del expected['int1']
+        self.assertEqual(dumper.dumps(tracked), gura.dumps(expected))
+        self.assertEqual(''.join(dumper.iterdumps(tracked, chunk_size=16)), gura.dumps(expected))
+
+    def test_reuses_unchanged(self):
+        """Tests that unchanged subtrees are not rendered again"""
+        tracked = gura.track(self.parsed_data)
+        dumper = IncrementalDumper()
+        dumper.dumps(tracked)
+        apache_pieces = dumper.rendered[id(tracked['services']['apache'])][3]
+        nginx_pieces = dumper.rendered[id(tracked['services']['nginx'])][3]
+
+        tracked['services']['nginx']['port'] = 8080
+        dumper.dumps(tracked)
+        self.assertIs(dumper.rendered[id(tracked['services']['apache'])][3], apache_pieces)
+        self.assertIsNot(dumper.rendered[id(tracked['services']['nginx'])][3], nginx_pieces)
+
+    def test_forgets_deleted(self):
+        """Tests that rendered pieces of collected objects are discarded"""
+        tracked = gura.track({'a': {'b': 1}, 'c': 2})
+        dumper = IncrementalDumper()
+        dumper.dumps(tracked)
+        child_id = id(tracked['a'])
+        self.assertIn(child_id, dumper.rendered)
+        del tracked['a']
+        self.assertNotIn(child_id, dumper.rendered)
+        self.assertEqual(dumper.dumps(tracked), 'c: 2')
+
+
+if __name__ == '__main__':
+    unittest.main()
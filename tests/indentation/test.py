@@ -44,6 +44,18 @@ class TestIndentationGura(unittest.TestCase):
         with self.assertRaises(InvalidIndentationError):
             self.__get_file_parsed_data('with_tabs.ura')
 
+    def test_closing_several_blocks(self):
+        """Tests closing several indentation blocks in the same line"""
+        parsed_data = gura.loads('a:\n    b:\n        c:\n            d: 1\n    e: 2\nf: 3')
+        self.assertDictEqual(parsed_data, {'a': {'b': {'c': {'d': 1}}, 'e': 2}, 'f': 3})
+
+    def test_tab_position(self):
+        """Tests the position reported when a tab is found after some spaces"""
+        with self.assertRaises(InvalidIndentationError) as context:
+            gura.loads('a:\n  \tb: 1')
+        self.assertEqual(context.exception.pos, 5)
+        self.assertEqual(context.exception.line, 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import gura
+from gura import ParseError, InvalidIndentationError, DuplicatedKeyError
+import os
+
+
+class TestIterativeGura(unittest.TestCase):
+    file_dir: str
+
+    def setUp(self):
+        self.file_dir = os.path.dirname(os.path.abspath(__file__))
+
+    def __get_test_file_content(self, folder: str, file_name: str) -> str:
+        """
+        Gets the content of a file of the tests of another folder
+        :param folder: Folder of the tests which contains the file
+        :param file_name: File name to get the content
+        :return: File content
+        """
+        full_test_path = os.path.join(self.file_dir, f'../{folder}/tests-files/{file_name}')
+        with open(full_test_path, 'r') as file:
+            return file.read()
+
+    def test_same_result(self):
+        """Tests that iterative mode gets the same result as the recursive one"""
+        for folder, file_name in [('full', 'full.ura'), ('arrays', 'normal.ura'), ('objects', 'normal.ura')]:
+            content = self.__get_test_file_content(folder, file_name)
+            self.assertEqual(gura.loads(content, env={}, iterative=True), gura.loads(content, env={}))
+
+    def test_deep_arrays(self):
+        """Tests parsing arrays nested deeper than the recursion limit"""
+        depth = 5000
+        parsed_data = gura.loads('a: ' + '[' * depth + '1' + ']' * depth, iterative=True)
+
+        value = parsed_data['a']
+        for _ in range(depth):
+            self.assertEqual(len(value), 1)
+            value = value[0]
+        self.assertEqual(value, 1)
+
+    def test_deep_objects(self):
+        """Tests parsing objects nested deeper than the recursion limit"""
+        depth = 1500
+        content = '\n'.join(' ' * (4 * level) + f'key{level}:' for level in range(depth)) + ' true\nlast: 1'
+        parsed_data = gura.loads(content, iterative=True)
+
+        value = parsed_data
+        for level in range(depth):
+            value = value[f'key{level}']
+        self.assertIs(value, True)
+        self.assertEqual(parsed_data['last'], 1)
+
+    def test_errors(self):
+        """Tests that iterative mode raises the same errors as the recursive one"""
+        for content, error_type in [
+            ('a: [1, 2', ParseError),
+            ('a: [[1], [2]', ParseError),
+            ('a:\n    b: 1\n     c: 2', InvalidIndentationError),
+            ('a:\n    b: 1\n    b: 2', DuplicatedKeyError),
+        ]:
+            with self.assertRaises(error_type) as recursive_error:
+                gura.loads(content)
+            with self.assertRaises(error_type) as iterative_error:
+                gura.loads(content, iterative=True)
+            self.assertEqual(str(iterative_error.exception), str(recursive_error.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+from array import array
+import importlib.util
+import math
+import unittest
+import gura
+
+
+class TestNumericArraysGura(unittest.TestCase):
+    content: str
+
+    def setUp(self):
+        self.content = '''
+ints: [1, 2, 3_000, -4]
+floats: [
+    0.5,  # A comment
+    2,
+
+    -inf
+]
+trailing_comma: [
+    1,
+    2,
+]
+nested: [[1, 2], [3]]
+mixed: [1, "two"]
+hex: [0xff, 2]
+big: [99999999999999999999999]
+empty_list: []
+after: 5
+'''
+
+    def test_array(self):
+        """Tests that flat numeric arrays are returned as compact arrays"""
+        parsed_data = gura.loads(self.content, numeric_arrays='array')
+        self.assertEqual(parsed_data['ints'], array('q', [1, 2, 3000, -4]))
+        self.assertEqual(parsed_data['floats'], array('d', [0.5, 2.0, -math.inf]))
+        self.assertEqual(parsed_data['trailing_comma'], array('q', [1, 2]))
+        self.assertEqual(parsed_data['nested'], [array('q', [1, 2]), array('q', [3])])
+        self.assertEqual(parsed_data['after'], 5)
+
+    def test_not_compact(self):
+        """Tests that arrays which can not be represented as compact arrays are kept as lists"""
+        parsed_data = gura.loads(self.content, numeric_arrays='array')
+        self.assertEqual(parsed_data['mixed'], [1, 'two'])
+        self.assertEqual(parsed_data['hex'], [255, 2])
+        self.assertEqual(parsed_data['big'], [99999999999999999999999])
+        self.assertEqual(parsed_data['empty_list'], [])
+
+    def test_same_values(self):
+        """Tests that values are the same as the ones in the default mode"""
+        parsed_data = gura.loads(self.content, numeric_arrays='array')
+        expected = gura.loads(self.content)
+        self.assertEqual(list(parsed_data['ints']), expected['ints'])
+        self.assertEqual(gura.loads(gura.dumps(parsed_data)), expected)
+
+    def test_line_numbers(self):
+        """Tests that errors after compact arrays are reported in the right line"""
+        with self.assertRaises(gura.ParseError) as context:
+            gura.loads('a: [\n    1,\n    2\n]\nb: [3 4]', numeric_arrays='array')
+        self.assertEqual(context.exception.line, 5)
+
+    def test_invalid_number(self):
+        """Tests that invalid numbers raise the same error than in the default mode"""
+        with self.assertRaises(gura.ParseError):
+            gura.loads('a: [1, 2-3]', numeric_arrays='array')
+
+    def test_invalid_kind(self):
+        """Tests that unknown kinds of numeric arrays are rejected"""
+        with self.assertRaises(ValueError):
+            gura.loads('a: [1, 2]', numeric_arrays='tuple')
+
+    @unittest.skipUnless(importlib.util.find_spec('numpy') is not None, 'NumPy is not installed')
+    def test_numpy(self):
+        """Tests that flat numeric arrays are returned as NumPy arrays"""
+        import numpy
+        parsed_data = gura.loads(self.content, numeric_arrays='numpy')
+        self.assertIsInstance(parsed_data['ints'], numpy.ndarray)
+        self.assertEqual(parsed_data['ints'].dtype, numpy.int64)
+        self.assertEqual(parsed_data['floats'].dtype, numpy.float64)
+        self.assertEqual(parsed_data['ints'].tolist(), [1, 2, 3000, -4])
+
+
+if __name__ == '__main__':
+    unittest.main()
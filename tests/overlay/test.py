@@ -0,0 +1,87 @@
+import unittest
+import gura
+from gura import OverlayView
+
+
+class TestOverlayGura(unittest.TestCase):
+    base: dict
+    environment: dict
+    host: dict
+
+    def setUp(self):
+        self.base = gura.loads(
+            'database:\n'
+            '    host: "localhost"\n'
+            '    port: 5432\n'
+            '    options:\n'
+            '        timeout: 30\n'
+            '        ssl: false\n'
+            'hosts: ["a", "b"]\n'
+            'debug: false\n'
+        )
+        self.environment = gura.loads(
+            'database:\n'
+            '    host: "db.example.com"\n'
+            '    options:\n'
+            '        ssl: true\n'
+            'hosts: ["c"]\n'
+        )
+        self.host = gura.loads(
+            'database:\n'
+            '    port: 6432\n'
+            'debug: true\n'
+            'name: "host-1"\n'
+        )
+
+    def test_lookups(self):
+        """Tests that lookups fall through the layers"""
+        merged = gura.overlay(self.base, self.environment, self.host)
+        self.assertEqual(merged['database']['host'], 'db.example.com')
+        self.assertEqual(merged['database']['port'], 6432)
+        self.assertEqual(merged['database']['options']['timeout'], 30)
+        self.assertEqual(merged['database']['options']['ssl'], True)
+        self.assertEqual(merged['hosts'], ['c'])
+        self.assertEqual(merged['debug'], True)
+        self.assertEqual(list(merged), ['database', 'hosts', 'debug', 'name'])
+        self.assertEqual(len(merged), 4)
+        self.assertNotIn('missing', merged)
+        with self.assertRaises(KeyError):
+            merged['missing']
+
+    def test_no_copies(self):
+        """Tests that objects defined in only one layer are the layer objects"""
+        merged = gura.overlay(self.base, self.host)
+        self.assertIs(merged['database']['options'], self.base['database']['options'])
+        self.assertIsInstance(merged['database'], OverlayView)
+
+    def test_hidden_objects(self):
+        """Tests that a value which is not an object hides the objects below it"""
+        merged = gura.overlay({'a': {'b': 1}}, {'a': 'text'}, {'a': {'c': 2}})
+        self.assertEqual(merged['a'], {'c': 2})
+        self.assertEqual(gura.overlay({'a': {'b': 1}}, {'a': None})['a'], None)
+
+    def test_flatten(self):
+        """Tests that flattened paths are materialized in dicts"""
+        merged = gura.overlay(self.base, self.environment, self.host)
+        self.assertEqual(merged.flatten('database'), {
+            'host': 'db.example.com',
+            'port': 6432,
+            'options': {'timeout': 30, 'ssl': True},
+        })
+        flattened = merged.flatten()
+        self.assertIs(type(flattened['database']['options']), dict)
+        self.assertEqual(flattened, merged)
+        with self.assertRaises(TypeError):
+            merged.flatten('hosts')
+        with self.assertRaises(KeyError):
+            merged.flatten('missing')
+
+    def test_read_only(self):
+        """Tests that the view can not be modified"""
+        merged = gura.overlay(self.base, self.host)
+        with self.assertRaises(TypeError):
+            merged['debug'] = False
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import locale
+import unittest
+import os
+import tempfile
+from unittest import mock
+import gura
+from gura import DuplicatedKeyError, DuplicatedVariableError, ParseError
+from gura.Parallel import pre_scan, split_segments, worker_import_cache
+
+
+class TestParallelGura(unittest.TestCase):
+    content: str
+
+    def setUp(self):
+        # Segments are split at every top-level pair
+        patcher = mock.patch('gura.Parallel.MIN_SEGMENT_LENGTH', 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.content = '$host: "localhost"\n' \
+                       'first:\n' \
+                       '    url: "http://$host"\n' \
+                       'servers: [\n' \
+                       'not_a_key: 1\n' \
+                       ']\n' \
+                       '$port: 8080\n' \
+                       'second:\n' \
+                       '    description: """\n' \
+                       'not_a_key: 3\n' \
+                       '"""\n' \
+                       '    port: $port\n' \
+                       '# third: 4\n' \
+                       'third: [$port]\n'
+
+    def test_pre_scan(self):
+        """Tests that segments boundaries are only found at top-level pairs"""
+        boundaries, variables = pre_scan(self.content)
+        self.assertEqual([self.content[boundary:].split(':')[0] for boundary in boundaries],
+                         ['first', 'servers', 'second', 'third'])
+        self.assertEqual([self.content[start:end] for start, end in variables], ['$host: "localhost"\n',
+                                                                                 '$port: 8080\n'])
+        self.assertEqual(len(split_segments(self.content, boundaries, 100)), 5)
+
+    def test_pre_scan_inline_pairs(self):
+        """Tests that texts with pairs after a value in the same line can not be split"""
+        self.assertIsNone(pre_scan('first: 1  second: 2\n'))
+        self.assertIsNone(pre_scan('first: "a"$var: 2\n'))
+        self.assertIsNotNone(pre_scan('first: "a: b"  # c: d\n'))
+
+    def test_same_result(self):
+        """Tests that the result is the same as the serial parsing, with variables visible across segments"""
+        parsed_data = gura.loads(self.content, workers=2)
+        self.assertEqual(parsed_data, gura.loads(self.content))
+        self.assertEqual(list(parsed_data.keys()), ['first', 'servers', 'second', 'third'])
+        self.assertEqual(parsed_data['third'], [8080])
+
+    def test_errors(self):
+        """Tests that errors are the same as the serial parsing ones"""
+        for content, error_type in [
+            (self.content + 'first: 2\n', DuplicatedKeyError),
+            (self.content + '$host: "other"\n', DuplicatedVariableError),
+            (self.content + 'fourth: [1, 2\n', ParseError),
+            # A more indented pair after a value, which would be a top-level pair in the segment that starts there
+            ('first: "p"\nflat: 19\n    nested: "q"\nlast: 1\n', ParseError),
+        ]:
+            with self.assertRaises(error_type) as serial_error:
+                gura.loads(content)
+            with self.assertRaises(error_type) as parallel_error:
+                gura.loads(content, workers=2)
+            self.assertEqual(str(parallel_error.exception), str(serial_error.exception))
+
+    def __write_files(self, directory: str):
+        """
+        Writes some Gura files to load
+        :param directory: Directory where the files are written
+        :return: List of paths, the last one does not exist
+        """
+        common_path = os.path.join(directory, 'common.ura')
+        with open(common_path, 'w') as file:
+            file.write('$region: "eu"\n')
+
+        paths = []
+        for idx, content in enumerate([f'import "{common_path}"\nname: "app-$region"', 'invalid: [1', 'port: 8080']):
+            path = os.path.join(directory, f'file_{idx}.ura')
+            with open(path, 'w') as file:
+                file.write(content)
+            paths.append(path)
+        paths.append(os.path.join(directory, 'missing.ura'))
+        return paths
+
+    def test_load_many(self):
+        """Tests loading many files in a pool of processes, getting results and errors in order"""
+        with tempfile.TemporaryDirectory() as directory:
+            paths = self.__write_files(directory)
+            results = gura.load_many(paths, workers=2, chunksize=1)
+
+        self.assertEqual(results[0], {'name': 'app-eu'})
+        self.assertIsInstance(results[1], ParseError)
+        self.assertEqual(results[2], {'port': 8080})
+        self.assertIsInstance(results[3], FileNotFoundError)
+        self.assertEqual(len(results.errors), 2)
+        self.assertGreater(results.total_bytes, 0)
+        self.assertGreater(results.files_per_second, 0)
+
+    @unittest.skipUnless(locale.getpreferredencoding(False).lower().replace('-', '') == 'utf8',
+                         'Files are not decoded as UTF-8')
+    def test_load_many_decoding_errors(self):
+        """Tests that files which can not be decoded or are too deeply nested get their errors in order"""
+        with tempfile.TemporaryDirectory() as directory:
+            paths = self.__write_files(directory)
+            invalid_path = os.path.join(directory, 'latin_1.ura')
+            with open(invalid_path, 'wb') as file:
+                file.write('name: "café"\n'.encode('latin-1'))
+            nested_path = os.path.join(directory, 'nested.ura')
+            with open(nested_path, 'w') as file:
+                file.write('value: ' + '[' * 5000 + ']' * 5000 + '\n')
+            results = gura.load_many([invalid_path, paths[2], nested_path], workers=2, chunksize=1)
+
+        self.assertIsInstance(results[0], UnicodeDecodeError)
+        self.assertEqual(results[1], {'port': 8080})
+        self.assertIsInstance(results[2], RecursionError)
+        self.assertEqual(len(results.errors), 2)
+
+    def test_load_many_import_cache(self):
+        """Tests that imported files are read once per worker while they are not modified"""
+        with tempfile.TemporaryDirectory() as directory:
+            paths = self.__write_files(directory)
+            common_path = os.path.join(directory, 'common.ura')
+            worker_import_cache.clear()
+            gura.load_many(paths[:1] * 3, workers=1)
+            self.assertEqual(list(worker_import_cache.keys()), [common_path])
+
+            with mock.patch('builtins.open', wraps=open) as mocked_open:
+                results = gura.load_many(paths[:1] * 3, workers=1)
+            opened_paths = [call.args[0] for call in mocked_open.call_args_list]
+            self.assertNotIn(common_path, opened_paths)
+            self.assertEqual(list(results), [{'name': 'app-eu'}] * 3)
+
+            with open(common_path, 'w') as file:
+                file.write('$region: "us-east"\n')
+            self.assertEqual(gura.load_many(paths[:1], workers=1)[0], {'name': 'app-us-east'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import gura
+from gura import LazyObject, ParseError
+
+
+class TestPathGura(unittest.TestCase):
+    content: str
+
+    def setUp(self):
+        self.content = '$rps: 100\n' \
+                       'servers: [\n' \
+                       '    [1, 2],\n' \
+                       '    "b"\n' \
+                       ']\n' \
+                       'service:\n' \
+                       '    # Limits of the service\n' \
+                       '    limits:\n' \
+                       '        rps: $rps\n' \
+                       '        burst: [1, 2, 3]\n' \
+                       '    description: """\n' \
+                       'not_a_key: 1\n' \
+                       '"""\n' \
+                       '$timeout: 30\n' \
+                       'client:\n' \
+                       '    timeout: $timeout\n'
+
+    def test_parse(self):
+        """Tests that paths are split in keys and indexes"""
+        self.assertEqual(gura.path('servers[3].limits.rps').parts, ('servers', 3, 'limits', 'rps'))
+        self.assertEqual(gura.path('matrix[0][-1]').parts, ('matrix', 0, -1))
+        self.assertEqual(str(gura.path('servers[3].limits.rps')), 'servers[3].limits.rps')
+        for invalid in ['', 'a..b', 'a.', 'a[b]', 'a[1]b', 'a b', 'a-b']:
+            with self.assertRaises(ValueError):
+                gura.path(invalid)
+
+    def test_plain_values(self):
+        """Tests the accessor over the results of loads()"""
+        values = gura.loads('servers: ["a", "b"]\nservice:\n    limits:\n        rps: 100\n')
+        self.assertEqual(gura.path('servers[-1]').get(values), 'b')
+        self.assertEqual(gura.path('service.limits.rps')(values), 100)
+        self.assertEqual(gura.path('service.limits').get(values), {'rps': 100})
+        self.assertEqual(gura.path('service.missing').get(values, None), None)
+        self.assertEqual(gura.path('servers[5]').get(values, 0), 0)
+        with self.assertRaises(KeyError):
+            gura.path('service.missing').get(values)
+        with self.assertRaises(IndexError):
+            gura.path('servers[5]').get(values)
+
+    def test_lazy_values(self):
+        """Tests that lazy lookups get the same values as loads()"""
+        values = gura.loads(self.content)
+        lazy = gura.loads_lazy(self.content)
+        for path in ['servers[0][1]', 'servers[1]', 'service.limits.rps', 'service.limits.burst[2]', 'service.limits',
+                     'service.description', 'client.timeout', 'service']:
+            self.assertEqual(gura.path(path).get(lazy), gura.path(path).get(values))
+        self.assertIsInstance(lazy['service'], LazyObject)
+        self.assertEqual(list(lazy), ['servers', 'service', 'client'])
+        self.assertEqual(lazy.load(), values)
+
+    def test_only_path_is_parsed(self):
+        """Tests that lazy lookups only parse the values along the path, so errors in other values are not found"""
+        content = self.content + 'invalid: [1, 2\n'
+        with mock.patch('gura.Lazy.specialized_parser', wraps=gura.Lazy.specialized_parser) as parser:
+            lazy = gura.loads_lazy(content)
+            self.assertEqual(gura.path('service.limits.rps').get(lazy), 100)
+        # The definition of $rps and the value of rps
+        self.assertEqual(parser.call_count, 2)
+        with self.assertRaises(ParseError):
+            lazy.load()
+
+    def test_full_parse_fallback(self):
+        """Tests that texts which can not be parsed by parts get the same values and errors as loads()"""
+        for content in [
+            'first: 1  second: 2\n',  # A pair after a value in the same line
+            'first: 1\n    second: 2\n',  # A more indented pair after a value
+        ]:
+            self.assertEqual(gura.path('second').get(gura.loads_lazy(content)), 2)
+            self.assertEqual(gura.loads_lazy(content).load(), gura.loads(content))
+
+        content = 'first:\n    second: 1\n    second: 2\n'  # Duplicated keys
+        with self.assertRaises(gura.DuplicatedKeyError) as loads_error:
+            gura.loads(content)
+        with self.assertRaises(gura.DuplicatedKeyError) as lazy_error:
+            gura.path('first.second').get(gura.loads_lazy(content))
+        self.assertEqual(str(lazy_error.exception), str(loads_error.exception))
+
+    def test_imports(self):
+        """Tests that texts with imports are parsed as a whole"""
+        with tempfile.TemporaryDirectory() as directory:
+            imported_path = os.path.join(directory, 'imported.ura')
+            with open(imported_path, 'w') as file:
+                file.write('imported:\n    value: 1\n')
+            lazy = gura.loads_lazy(f'import "{imported_path}"\nlocal: 2\n')
+            self.assertEqual(gura.path('imported.value').get(lazy), 1)
+            self.assertEqual(lazy.load(), {'imported': {'value': 1}, 'local': 2})
+
+    def test_lazy_errors(self):
+        """Tests that errors in the accessed values are the same as loads() ones"""
+        content = 'first: 1\nsecond: [1,\n'
+        with self.assertRaises(ParseError) as loads_error:
+            gura.loads(content)
+        with self.assertRaises(ParseError) as lazy_error:
+            gura.path('second').get(gura.loads_lazy(content))
+        self.assertEqual(str(lazy_error.exception), str(loads_error.exception))
+
+    def test_lazy_prefix_errors(self):
+        """Tests that the text before the first pair is checked"""
+        content = '$port: 80\n!!garbage!!\nd: 2\n'
+        with self.assertRaises(ParseError) as loads_error:
+            gura.loads(content)
+        with self.assertRaises(ParseError) as lazy_error:
+            dict(gura.loads_lazy(content))
+        self.assertEqual(str(lazy_error.exception), str(loads_error.exception))
+        self.assertEqual(dict(gura.loads_lazy('$port: 80\n# Comment\n\n$host: "a"\nd: $port\ne: $host\n')),
+                         {'d': 80, 'e': 'a'})
+
+    def test_lazy_nested_prefix_errors(self):
+        """Tests that the lines of a nested object before its first pair are checked for every access path"""
+        content = 'server:\n    port 8080\n    host: "x"\n'
+        with self.assertRaises(ParseError) as loads_error:
+            gura.loads(content)
+        for get in [
+            lambda lazy: gura.path('server.host').get(lazy),
+            lambda lazy: gura.path('server').get(lazy),
+            lambda lazy: dict(lazy['server']),
+        ]:
+            with self.assertRaises(ParseError) as lazy_error:
+                get(gura.loads_lazy(content))
+            self.assertEqual(str(lazy_error.exception), str(loads_error.exception))
+
+        lazy = gura.loads_lazy('server:\n    # Comment\n\n    host: "x"\n')
+        self.assertIsInstance(lazy['server'], LazyObject)
+        self.assertEqual(dict(lazy['server']), {'host': 'x'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import gura
+from gura import GuraParser, ParserPool, ParseError, VariableNotDefinedError
+
+
+class TestPoolGura(unittest.TestCase):
+    def test_reuse_parser(self):
+        """Tests that a parser can parse several texts which define the same variables"""
+        parser = GuraParser(variables={'initial': 'value'})
+        self.assertEqual(parser.loads('$name: "first"\nkey: "$name $initial"'), {'key': 'first value'})
+        self.assertEqual(parser.loads('$name: "second"\nkey: $name'), {'key': 'second'})
+
+    def test_reuse_after_error(self):
+        """Tests that the state left by a text that raised an error is discarded"""
+        parser = GuraParser()
+        with self.assertRaises(ParseError):
+            parser.loads('$name: "first"\nkey: [1')
+        with self.assertRaises(VariableNotDefinedError):
+            parser.loads('key: $name')
+        self.assertEqual(parser.loads('$name: "second"\nkey: $name'), {'key': 'second'})
+
+    def test_reset(self):
+        """Tests that reset() restores the initial variables and imported files and releases the text"""
+        prelude = gura.compile_prelude('$from_prelude: 1')
+        parser = GuraParser(variables={'initial': 2}, context=prelude)
+        parser.loads('$defined: 3\nkey: $defined')
+        self.assertIn('defined', parser.variables)
+        parser.reset()
+        self.assertEqual(parser.variables, {'initial': 2, 'from_prelude': 1})
+        self.assertEqual(parser.imported_files, set())
+        self.assertEqual(parser.text, '')
+
+    def test_pool_reuses_parsers(self):
+        """Tests that released parsers are taken again and that the pool keeps at most max_idle parsers"""
+        pool = ParserPool(max_idle=1)
+        with pool.parser() as first:
+            with pool.parser() as second:
+                self.assertIsNot(first, second)
+        with pool.parser() as parser:
+            self.assertIn(parser, (first, second))
+            self.assertEqual(parser.text, '')
+
+    def test_pool_options(self):
+        """Tests that the parsers of the pool are created with its options"""
+        pool = ParserPool(env={'user': 'gura'}, parse_int=str)
+        self.assertEqual(pool.loads('name: $user\nnumber: 5'), {'name': 'gura', 'number': '5'})
+
+    def test_concurrent_loads(self):
+        """Tests that concurrent loads in several threads always get the values of their own text"""
+        pool = ParserPool(max_idle=4)
+        texts = [f'$id: {i}\n$name: "item {i}"\nitem:\n    id: $id\n    name: "$name"\n    values: [$id, {i * 2}]'
+                 for i in range(50)]
+        expected = [{'item': {'id': i, 'name': f'item {i}', 'values': [i, i * 2]}} for i in range(50)]
+        barrier = threading.Barrier(8)
+
+        def load_all(offset: int):
+            barrier.wait()
+            return [pool.loads(texts[(offset + idx) % len(texts)]) for idx in range(len(texts) * 4)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(load_all, range(8)))
+
+        for offset, thread_results in enumerate(results):
+            self.assertEqual(thread_results, [expected[(offset + idx) % len(texts)]
+                                              for idx in range(len(texts) * 4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
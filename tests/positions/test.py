@@ -0,0 +1,113 @@
+import os
+import unittest
+import gura
+from gura import GuraParser, PositionMap
+
+
+class TestPositionsGura(unittest.TestCase):
+    content: str
+
+    def setUp(self):
+        self.file_dir = os.path.dirname(os.path.abspath(__file__))
+        self.content = '# Service\n' \
+                       '$port: 8080\n' \
+                       'title: "Example"   # Title\n' \
+                       'service:\n' \
+                       '    port: $port\n' \
+                       '    hosts: [ "a", "b" ]\n' \
+                       'servers: [\n' \
+                       '    name: "alpha"\n' \
+                       '    limits:\n' \
+                       '        rps: 100,\n' \
+                       '    [\n' \
+                       '        name: "beta"\n' \
+                       '    ]\n' \
+                       ']\n'
+
+    def __get_text(self, positions: PositionMap, path: str, value: bool = False) -> str:
+        """
+        Gets the text of a recorded span
+        :param positions: Recorded positions
+        :param path: Path of the pair
+        :param value: True to get only the value of the pair
+        :return: Text of the span
+        """
+        start, end = positions.value_span(path) if value else positions[path]
+        return self.content[start:end]
+
+    def test_spans(self):
+        """Tests the spans of pairs, values and array elements"""
+        values, positions = gura.loads(self.content, positions=True)
+        self.assertEqual(values['service']['port'], 8080)
+        self.assertEqual(self.__get_text(positions, 'title'), 'title: "Example"')
+        self.assertEqual(self.__get_text(positions, 'title', value=True), '"Example"')
+        self.assertEqual(self.__get_text(positions, 'service.port', value=True), '$port')
+        self.assertEqual(self.__get_text(positions, 'service.hosts', value=True), '[ "a", "b" ]')
+        self.assertEqual(self.__get_text(positions, 'service'), 'service:\n    port: $port\n    hosts: [ "a", "b" ]')
+        self.assertEqual(self.__get_text(positions, 'service', value=True), 'port: $port\n    hosts: [ "a", "b" ]')
+        self.assertEqual(self.__get_text(positions, 'servers[0]'), 'name: "alpha"\n    limits:\n        rps: 100')
+        self.assertEqual(self.__get_text(positions, 'servers[0].limits.rps'), 'rps: 100')
+        self.assertEqual(self.__get_text(positions, 'servers[1]'), '[\n        name: "beta"\n    ]')
+        self.assertEqual(self.__get_text(positions, ('servers', 1, 0, 'name')), 'name: "beta"')
+
+    def test_paths(self):
+        """Tests that every pair is recorded in the order of the text and scalar elements are not"""
+        _values, positions = gura.loads(self.content, positions=True)
+        self.assertEqual(list(positions), [
+            ('title',), ('service',), ('service', 'port'), ('service', 'hosts'), ('servers',), ('servers', 0),
+            ('servers', 0, 'name'), ('servers', 0, 'limits'), ('servers', 0, 'limits', 'rps'), ('servers', 1),
+            ('servers', 1, 0), ('servers', 1, 0, 'name')
+        ])
+        self.assertEqual(len(positions), 12)
+        self.assertIn('servers[1][0].name', positions)
+        self.assertNotIn('service.hosts[0]', positions)
+        self.assertNotIn('invalid path', positions)
+        with self.assertRaises(KeyError):
+            _ = positions['missing']
+
+    def test_line_column(self):
+        """Tests the conversion of offsets to lines and columns"""
+        _values, positions = gura.loads(self.content, positions=True)
+        self.assertEqual(positions.line_column(positions['title'][0]), (3, 1))
+        self.assertEqual(positions.line_column(positions['servers[0].limits.rps'][0]), (10, 9))
+        self.assertEqual(positions.line_column(0), (1, 1))
+
+        _values, positions = gura.loads('a: 1\r\nb: 2\r\n', positions=True)
+        self.assertEqual(positions.line_column(positions['b'][0]), (2, 1))
+
+    def test_iterative(self):
+        """Tests that the iterative parser records the same positions"""
+        _values, positions = gura.loads(self.content, positions=True)
+        _values, iterative_positions = gura.loads(self.content, positions=True, iterative=True)
+        self.assertEqual(dict(iterative_positions), dict(positions))
+        self.assertEqual(iterative_positions.value_span('servers[1]'), positions.value_span('servers[1]'))
+
+    def test_imports(self):
+        """Tests that offsets are relative to the original text and pairs of imported files are not recorded"""
+        content = f'import "{self.file_dir}/../importing/tests-files/one.ura"\n' \
+                  '$name: "b"\n' \
+                  'other: $name\n'
+        values, positions = gura.loads(content, positions=True)
+        self.assertIn('other', values)
+        self.assertEqual(list(positions), [('other',)])
+        start, end = positions['other']
+        self.assertEqual(content[start:end], 'other: $name')
+        self.assertEqual(positions.line_column(start), (3, 1))
+
+    def test_disabled(self):
+        """Tests that positions are not recorded by default and are discarded by every parse"""
+        parser = GuraParser()
+        parser.loads(self.content)
+        self.assertIsNone(parser.position_map)
+        self.assertIsInstance(gura.loads('a: 1'), dict)
+
+        parser = GuraParser(positions=True)
+        parser.loads('a: 1')
+        first_map = parser.position_map
+        parser.loads('b: 2')
+        self.assertEqual(list(parser.position_map), [('b',)])
+        self.assertEqual(list(first_map), [('a',)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import math
+import subprocess
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Mapping, Sequence
+import gura
+from gura import SharedValues
+from gura.Shared import unshare
+
+
+def read_in_worker(name: str) -> dict:
+    """Attaches to shared values in another process and reads some of them"""
+    with SharedValues.attach(name) as shared:
+        service = shared.root['services']['api']
+        return {'host': service['host'], 'ports': list(service['ports']), 'weights': service['weights'][-1]}
+
+
+class TestSharedGura(unittest.TestCase):
+    values: dict
+
+    def setUp(self):
+        self.values = gura.loads(
+            'services:\n'
+            '    api:\n'
+            '        host: "api.example.com"\n'
+            '        ports: [80, 443]\n'
+            '        weights: [0.25, 0.75]\n'
+            '        tags: ["público", "api", 1, null, true, false]\n'
+            '    empty: empty\n'
+            'big_number: 18446744073709551616\n'
+            'nothing: null\n'
+            'names: []\n'
+        )
+        self.shared = SharedValues.publish(self.values)
+        self.addCleanup(self.shared.unlink)
+        self.addCleanup(self.shared.close)
+
+    def test_views(self):
+        """Tests that the published values are read through read-only views"""
+        root = self.shared.root
+        self.assertIsInstance(root, Mapping)
+        self.assertIsInstance(root['services']['api']['tags'], Sequence)
+        self.assertEqual(root, self.values)
+        self.assertEqual(unshare(root), self.values)
+        self.assertEqual(list(root), ['services', 'big_number', 'nothing', 'names'])
+        self.assertEqual(root['services']['api']['tags'][-4:], [1, None, True, False])
+        self.assertEqual(root['services']['api']['ports'][1], 443)
+        self.assertIsInstance(root['services']['api']['weights'][0], float)
+        self.assertEqual(root['big_number'], 2 ** 64)
+        self.assertNotIn('missing', root)
+        with self.assertRaises(KeyError):
+            root['missing']
+        with self.assertRaises(IndexError):
+            root['names'][0]
+        with self.assertRaises(TypeError):
+            root['nothing'] = 1
+
+    def test_lookup_without_index(self):
+        """Tests that keys are found in objects with many pairs"""
+        values = {f'key_{idx}': idx for idx in range(1000)}
+        with SharedValues.publish(values) as shared:
+            try:
+                self.assertTrue(all(shared.root[key] == value for key, value in values.items()))
+                self.assertEqual(len(shared.root), 1000)
+            finally:
+                shared.unlink()
+
+    def test_signed_zeros(self):
+        """Tests that -0.0 and 0.0 are not encoded as the same scalar"""
+        with SharedValues.publish({'negative': -0.0, 'positive': 0.0, 'nan': [math.nan, 'a']}) as shared:
+            try:
+                self.assertEqual(math.copysign(1, shared.root['negative']), -1)
+                self.assertEqual(math.copysign(1, shared.root['positive']), 1)
+                self.assertTrue(math.isnan(shared.root['nan'][0]))
+            finally:
+                shared.unlink()
+
+    def test_lazy_import(self):
+        """Tests that importing gura does not import multiprocessing.shared_memory (missing before Python 3.8)"""
+        output = subprocess.run([sys.executable, '-c', 'import sys, gura; print("multiprocessing.shared_memory" in '
+                                 'sys.modules)'], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), 'False')
+
+    def test_attach(self):
+        """Tests that another process reads the values without parsing the text"""
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(read_in_worker, self.shared.name).result()
+        self.assertEqual(result, {'host': 'api.example.com', 'ports': [80, 443], 'weights': 0.75})
+        # The memory is not destroyed when the worker exits
+        with SharedValues.attach(self.shared.name) as shared:
+            self.assertEqual(shared.root['services']['api']['host'], 'api.example.com')
+
+    def test_closed(self):
+        """Tests that views can not be read after closing the shared values"""
+        with SharedValues.attach(self.shared.name) as shared:
+            services = shared.root['services']
+        with self.assertRaises(ValueError):
+            services['api']
+
+    def test_unsupported_values(self):
+        """Tests that values that are not Gura values can not be published"""
+        with self.assertRaises(TypeError):
+            SharedValues.publish({'values': {1, 2}})
+
+    def test_invalid_memory(self):
+        """Tests that attaching to a missing memory raises an error"""
+        with self.assertRaises(FileNotFoundError):
+            SharedValues.attach('gura_missing_shared_values')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import gura
+from gura import ParseError, SingleFlightLoader
+from gura.SingleFlight import freeze
+
+
+class TestSingleFlightGura(unittest.TestCase):
+    file_path: str
+
+    def setUp(self):
+        file_descriptor, self.file_path = tempfile.mkstemp(suffix='.ura')
+        os.close(file_descriptor)
+        self.addCleanup(os.remove, self.file_path)
+        self.__write('$name: "gura"\nservice:\n    name: $name\n    ports: [80, 443]\n')
+
+    def __write(self, content: str):
+        """Writes the test file changing its modification time"""
+        with open(self.file_path, 'w') as file:
+            file.write(content)
+        stat = os.stat(self.file_path)
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def __count_parses(self):
+        """Patches load_file() to count its calls"""
+        patcher = mock.patch('gura.SingleFlight.load_file', side_effect=gura.load_file)
+        load_file = patcher.start()
+        self.addCleanup(patcher.stop)
+        return load_file
+
+    def test_load_file(self):
+        """Tests that load_file() parses the content of a file"""
+        self.assertEqual(gura.load_file(self.file_path), {'service': {'name': 'gura', 'ports': [80, 443]}})
+
+    def test_freeze(self):
+        """Tests that objects and arrays are frozen recursively"""
+        frozen = freeze({'service': {'ports': [80, {'tls': True}]}})
+        self.assertEqual(frozen, {'service': {'ports': (80, {'tls': True})}})
+        with self.assertRaises(TypeError):
+            frozen['service']['other'] = 1
+        with self.assertRaises(TypeError):
+            frozen['service']['ports'][1]['tls'] = False
+
+    def test_concurrent_loads(self):
+        """Tests that concurrent loads of the same version of a file share one parse and its result"""
+        load_file = self.__count_parses()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_load_file(path, **options):
+            started.set()
+            release.wait()
+            return gura.load_file(path, **options)
+
+        load_file.side_effect = slow_load_file
+        loader = SingleFlightLoader()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(loader.load, self.file_path) for _ in range(8)]
+            started.wait()
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(load_file.call_count, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(results[0], {'service': {'name': 'gura', 'ports': (80, 443)}})
+
+    def test_new_version(self):
+        """Tests that a modified file is parsed again and that the same version is not"""
+        load_file = self.__count_parses()
+        loader = SingleFlightLoader()
+        first = loader.load(self.file_path)
+        self.assertIs(loader.load(self.file_path), first)
+        self.__write('service: "modified"\n')
+        self.assertEqual(loader.load(self.file_path), {'service': 'modified'})
+        self.assertEqual(load_file.call_count, 2)
+
+    def test_new_import_version(self):
+        """Tests that a file is parsed again when a file it imports is modified"""
+        load_file = self.__count_parses()
+        file_descriptor, import_path = tempfile.mkstemp(suffix='.ura')
+        os.close(file_descriptor)
+        self.addCleanup(os.remove, import_path)
+        with open(import_path, 'w') as file:
+            file.write('port: 80\n')
+        self.__write(f'import "{import_path}"\nservice: "gura"\n')
+
+        loader = SingleFlightLoader()
+        first = loader.load(self.file_path)
+        self.assertEqual(first, {'port': 80, 'service': 'gura'})
+        self.assertIs(loader.load(self.file_path), first)
+
+        with open(import_path, 'w') as file:
+            file.write('port: 8080\n')
+        stat = os.stat(import_path)
+        os.utime(import_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(loader.load(self.file_path), {'port': 8080, 'service': 'gura'})
+        self.assertEqual(load_file.call_count, 2)
+
+    def test_errors_are_not_kept(self):
+        """Tests that a failed parse is raised and the next request parses the file again"""
+        load_file = self.__count_parses()
+        loader = SingleFlightLoader()
+        self.__write('service: [\n')
+        with self.assertRaises(ParseError):
+            loader.load(self.file_path)
+        with self.assertRaises(ParseError):
+            loader.load(self.file_path)
+        self.assertEqual(load_file.call_count, 2)
+
+    def test_missing_file(self):
+        """Tests that loading a missing file raises OSError"""
+        with self.assertRaises(OSError):
+            SingleFlightLoader().load(self.file_path + '.missing')
+
+    def test_load_async(self):
+        """Tests that concurrent tasks share one parse and its result"""
+        load_file = self.__count_parses()
+        loader = SingleFlightLoader(env={'user': 'gura'})
+        self.__write('user: $user\n')
+
+        async def load_all():
+            return await asyncio.gather(*(loader.load_async(self.file_path) for _ in range(8)))
+
+        results = asyncio.run(load_all())
+        self.assertEqual(load_file.call_count, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(results[0], {'user': 'gura'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import unittest
+import glob
+from unittest import mock
+from gura import GuraParser, GuraError
+from gura.GuraParser import specialized_parser
+from gura.Specializer import generate_source
+import os
+
+
+class TestSpecializedGura(unittest.TestCase):
+    file_dir: str
+
+    def setUp(self):
+        self.file_dir = os.path.dirname(os.path.abspath(__file__))
+
+    @unittest.skipIf(sys.version_info < (3, 9), 'ast.unparse() is needed to generate the parser')
+    def test_generated(self):
+        """Tests that the generated parser does not match rules or chars by their names"""
+        parser_class = specialized_parser()
+        self.assertTrue(issubclass(parser_class, GuraParser))
+        self.assertIsNot(parser_class, GuraParser)
+
+        source = generate_source(GuraParser)
+        for generic_call in ['self.match(', 'self.maybe_match(', 'self.char(', 'getattr(']:
+            self.assertNotIn(generic_call, source)
+
+    def test_fallback(self):
+        """Tests that GuraParser is used in Python versions where the parser can not be generated"""
+        with mock.patch.object(sys, 'version_info', (3, 8, 0)):
+            self.assertIs(specialized_parser.__wrapped__(), GuraParser)
+
+    def test_same_result(self):
+        """Tests that the generated parser gets the same results and errors as GuraParser for all the tests files"""
+        parser_class = specialized_parser()
+        tests_dir = os.path.dirname(self.file_dir)
+        for file_path in glob.glob(os.path.join(tests_dir, '*/tests-files/*.ura')):
+            if 'importing' in file_path:
+                continue
+
+            with open(file_path, 'r') as file:
+                content = file.read()
+
+            # Truncated contents check the errors too
+            for text in [content, content[:len(content) // 2]]:
+                with self.subTest(file=file_path, length=len(text)):
+                    self.assertEqual(repr(self.__parse(parser_class, text)), repr(self.__parse(GuraParser, text)))
+
+    @staticmethod
+    def __parse(parser_class, text: str):
+        """
+        Parses a text with a specific parser class
+        :param parser_class: Parser class to use
+        :param text: Text to parse
+        :return: Parsed data or the type, message and position of the raised error
+        """
+        try:
+            return parser_class(env={}).loads(text)
+        except GuraError as e:
+            return type(e), str(e)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import gzip
+import io
+import unittest
+from typing import Dict
+import gura
+import os
+
+
+class TestStreamingGura(unittest.TestCase):
+    file_dir: str
+    parsed_data: Dict
+
+    def setUp(self):
+        self.file_dir = os.path.dirname(os.path.abspath(__file__))
+        full_test_path = os.path.join(self.file_dir, '../full/tests-files/full.ura')
+        with open(full_test_path, 'r') as file:
+            self.parsed_data = gura.loads(file.read())
+
+    def test_iterdumps(self):
+        """Tests that chunks generated by iterdumps are the same as dumps result"""
+        chunks = list(gura.iterdumps(self.parsed_data, chunk_size=64))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), gura.dumps(self.parsed_data))
+
+    def test_iterdumps_chunk_size(self):
+        """Tests that all the chunks but the last one have at least chunk_size characters"""
+        chunks = list(gura.iterdumps(self.parsed_data, chunk_size=100))
+        for chunk in chunks[:-1]:
+            self.assertGreaterEqual(len(chunk), 100)
+
+    def test_iterdumps_large_array(self):
+        """Tests that a long array in one line is yielded in groups of elements instead of as a whole"""
+        values = {'values': list(range(20000))}
+        chunks = list(gura.iterdumps(values, chunk_size=1024))
+        self.assertEqual(''.join(chunks), gura.dumps(values))
+        self.assertGreater(len(chunks), 10)
+        self.assertLess(max(len(chunk) for chunk in chunks), len(gura.dumps(values)) // 5)
+
+    def test_iterdumps_scalar(self):
+        """Tests iterdumps with a non object value"""
+        self.assertEqual(list(gura.iterdumps([1, 2, 3])), ['[1, 2, 3]'])
+
+    def test_dump(self):
+        """Tests dump method writing to a file-like object"""
+        output = io.StringIO()
+        gura.dump(self.parsed_data, output, chunk_size=32)
+        self.assertEqual(output.getvalue(), gura.dumps(self.parsed_data))
+        self.assertDictEqual(gura.loads(output.getvalue()), self.parsed_data)
+
+    def test_dump_gzip(self):
+        """Tests dump method writing to a compressed stream"""
+        buffer = io.BytesIO()
+        with gzip.open(buffer, 'wt', encoding='utf-8') as file:
+            gura.dump(self.parsed_data, file)
+        content = gzip.decompress(buffer.getvalue()).decode('utf-8')
+        self.assertDictEqual(gura.loads(content), self.parsed_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
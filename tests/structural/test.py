@@ -0,0 +1,93 @@
+import unittest
+import glob
+import importlib.util
+from unittest import mock
+import gura
+from gura import GuraError
+from gura.Structural import StructuralParser, structural_index
+import os
+
+
+class TestStructuralGura(unittest.TestCase):
+    file_dir: str
+
+    def setUp(self):
+        self.file_dir = os.path.dirname(os.path.abspath(__file__))
+        self.content = '$port: 8080\n' \
+                       '$host: "localhost"\n' \
+                       'service:\n' \
+                       '    name: "api-$host"  # Comment\n' \
+                       '    ports: [$port, 8081,\n' \
+                       '        8082]\n' \
+                       '    limits:\n' \
+                       '        rps: 1_000\n' \
+                       '        ratio: 0.5\n' \
+                       '\n' \
+                       '    tags: [["a", \'b\'], [], empty, null]\n' \
+                       'escaped: "\\u0041\\n"\n' \
+                       'enabled: true\n'
+
+    def test_index(self):
+        """Tests the positions found by the structural index"""
+        self.assertEqual(structural_index('a: [1, "b"]\n'), [1, 3, 5, 7, 9, 10, 11])
+
+    @unittest.skipUnless(importlib.util.find_spec('numpy') is not None, 'NumPy is not installed')
+    def test_index_numpy(self):
+        """Tests that the index computed with NumPy is the same as the computed with the regex"""
+        text = self.content.replace('\\u0041', 'u') * 200
+        with mock.patch('gura.Structural.get_numpy', return_value=None):
+            expected = structural_index(text)
+        self.assertEqual(structural_index(text), expected)
+
+    def test_structural(self):
+        """Tests that the structural engine parses a text without using the rules parser"""
+        with mock.patch('gura.Structural.specialized_parser') as rules_parser:
+            parsed_data = gura.loads_indexed(self.content)
+        rules_parser.assert_not_called()
+        self.assertEqual(parsed_data, gura.loads(self.content))
+        self.assertEqual(parsed_data['service']['ports'], [8080, 8081, 8082])
+
+    def test_same_result(self):
+        """Tests that the result and the errors are the same as loads() for all the tests files"""
+        tests_dir = os.path.dirname(self.file_dir)
+        for file_path in glob.glob(os.path.join(tests_dir, '*/tests-files/*.ura')):
+            if 'importing' in file_path:
+                continue
+
+            with open(file_path, 'r') as file:
+                content = file.read()
+
+            for text in [content, content[:len(content) // 2]]:
+                with self.subTest(file=file_path, length=len(text)):
+                    self.assertEqual(repr(self.__parse(gura.loads_indexed, text)),
+                                     repr(self.__parse(gura.loads, text)))
+
+    def test_errors(self):
+        """Tests that invalid texts raise the same errors as loads()"""
+        for text in ['a: [1, 2', 'a:\n    b: 1\n    b: 2', 'a:\n     b: 1', 'a: 1\n  ', '$a: 1\n$a: 2\nb: $a',
+                     'a: $undefined', 'a:']:
+            with self.subTest(text=text):
+                self.assertEqual(repr(self.__parse(gura.loads_indexed, text)), repr(self.__parse(gura.loads, text)))
+
+    def test_variables(self):
+        """Tests that the variables defined in the text are available after parsing"""
+        parser = StructuralParser(variables={'base': 1})
+        parser.loads('$other: 2\na: $base')
+        self.assertEqual(parser.variables, {'base': 1, 'other': 2})
+
+    @staticmethod
+    def __parse(loads, text: str):
+        """
+        Parses a text with a specific loads function
+        :param loads: Function to use
+        :param text: Text to parse
+        :return: Parsed data or the type and message of the raised error
+        """
+        try:
+            return loads(text, env={})
+        except GuraError as e:
+            return type(e), str(e)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import time
+import unittest
+import gura
+from gura import VariableNotDefinedError
+
+
+class TestTemplateGura(unittest.TestCase):
+    content: str
+
+    def setUp(self):
+        self.content = '''
+$port: "8080"
+$url: "http://$host:$port"
+tenant: $tenant
+server:
+    url: $url
+    port: $port
+    name: "Server of $tenant"
+hosts: ["$host", "localhost", $tenant]
+literal: '$tenant'
+'''
+
+    def test_render(self):
+        """Tests rendering a template with different variables"""
+        template = gura.compile(self.content)
+        self.assertListEqual(sorted(template.variables), ['host', 'tenant'])
+
+        for tenant in ['acme', 'initech']:
+            variables = {'tenant': tenant, 'host': f'{tenant}.com'}
+            self.assertDictEqual(template.render(variables), gura.loads(self.content, env=variables))
+
+    def test_values_not_shared(self):
+        """Tests that rendered values with variables are not shared between renders"""
+        template = gura.compile(self.content)
+        first = template.render({'tenant': 'acme', 'host': 'acme.com'})
+        second = template.render({'tenant': 'initech', 'host': 'initech.com'})
+        self.assertEqual(first['server']['name'], 'Server of acme')
+        self.assertEqual(second['server']['name'], 'Server of initech')
+        self.assertEqual(first['hosts'], ['acme.com', 'localhost', 'acme'])
+
+    def test_env_variables(self):
+        """Tests rendering with environment variables"""
+        env_var_name = f'env_var_{time.time_ns()}'
+        template = gura.compile(f'test: ${env_var_name}')
+        os.environ[env_var_name] = 'from_env'
+        self.assertDictEqual(template.render(), {'test': 'from_env'})
+        del os.environ[env_var_name]
+
+    def test_not_defined(self):
+        """Tests that missing variables are reported when rendering"""
+        template = gura.compile('a: 1\nb: $missing')
+        with self.assertRaises(VariableNotDefinedError) as context:
+            template.render({})
+        self.assertEqual(context.exception.line, 2)
+
+    def test_import_with_variable(self):
+        """Tests that variables used in imports must be defined in the text"""
+        with self.assertRaises(VariableNotDefinedError):
+            gura.compile('import "$folder/file.ura"\na: 1')
+
+
+if __name__ == '__main__':
+    unittest.main()
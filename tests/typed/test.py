@@ -0,0 +1,99 @@
+import dataclasses
+import subprocess
+import sys
+import unittest
+from typing import List, Optional, Dict
+import gura
+from gura import InvalidTypeError
+import os
+
+
+@dataclasses.dataclass
+class Service:
+    host: str
+    port: int
+
+
+@dataclasses.dataclass
+class Singer:
+    name: str
+    surname: str
+    year_of_birth: int
+    testing_nested: Optional[Dict[str, int]] = None
+
+
+class Limits:
+    __slots__ = ('rps', 'burst')
+    rps: int
+    burst: int
+
+
+@dataclasses.dataclass
+class Config:
+    services: Dict[str, Service]
+    tango_singers: List[Dict[str, Singer]]
+    limits: Limits
+    title: str = 'default'
+
+
+class TestTypedGura(unittest.TestCase):
+    file_dir: str
+
+    def setUp(self):
+        self.file_dir = os.path.dirname(os.path.abspath(__file__))
+
+    def __get_file_content(self, file_name) -> str:
+        """
+        Gets the content of a specific file
+        :param file_name: File name to get the content
+        :return: File content
+        """
+        full_test_path = os.path.join(self.file_dir, f'tests-files/{file_name}')
+        with open(full_test_path, 'r') as file:
+            return file.read()
+
+    def test_into(self):
+        """Tests building dataclasses and classes with __slots__ while parsing"""
+        config = gura.loads(self.__get_file_content('config.ura'), into=Config)
+        self.assertIsInstance(config, Config)
+        self.assertEqual(config.title, 'Typed')
+        self.assertEqual(config.services['nginx'], Service('127.0.0.1', 80))
+        self.assertEqual(config.services['apache'], Service('10.10.10.4', 81))
+        self.assertEqual(config.tango_singers[0]['user1'], Singer('Carlos', 'Gardel', 1890, {'nested_1': 1}))
+        self.assertEqual(config.tango_singers[1]['user2'], Singer('Aníbal', 'Troilo', 1914))
+        self.assertIsInstance(config.limits, Limits)
+        self.assertEqual((config.limits.rps, config.limits.burst), (100, 20))
+
+    def test_into_without_type(self):
+        """Tests that values are kept as they are parsed when the type is not a class"""
+        self.assertDictEqual(gura.loads('a: 1', into=Dict[str, int]), {'a': 1})
+
+    @unittest.skipUnless(sys.version_info >= (3, 10), 'The | operator for types was added in Python 3.10')
+    def test_into_union_operator(self):
+        """Tests that optional types defined with the | operator are built"""
+        hint = eval('Dict[str, Limits | None]')
+        limits = gura.loads('limits:\n    rps: 100\n    burst: 20', into=hint)['limits']
+        self.assertIsInstance(limits, Limits)
+
+    def test_invalid_type(self):
+        """Tests errors when the parsed object does not match the type"""
+        with self.assertRaises(InvalidTypeError):
+            gura.loads('host: "localhost"\nport: 80\nextra: true', into=Service)
+
+        with self.assertRaises(InvalidTypeError):
+            gura.loads('service:\n    host: "localhost"', into=Dict[str, Service])
+
+        # Every slot is a required field, as dataclasses fields without default
+        with self.assertRaises(InvalidTypeError) as error:
+            gura.loads('limits:\n    rps: 100', into=Dict[str, Limits])
+        self.assertIn("'burst'", str(error.exception))
+
+    def test_lazy_dataclasses_import(self):
+        """Tests that importing gura does not import dataclasses (missing before Python 3.7)"""
+        output = subprocess.run([sys.executable, '-c', 'import sys, gura; print("dataclasses" in sys.modules)'],
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -64,6 +64,36 @@ class TestVariablesGura(unittest.TestCase):
         self.assertDictEqual(parsed_data, {"test": env_value})
         os.unsetenv(env_var_name)
 
+    def test_env_mapping(self):
+        """Tests using a custom mapping instead of environment variables"""
+        env_var_name = f'env_var_{time.time_ns()}'
+        parsed_data = gura.loads(f'test: ${env_var_name}\nin_string: "${env_var_name}!"', env={env_var_name: 'tenant'})
+        self.assertDictEqual(parsed_data, {'test': 'tenant', 'in_string': 'tenant!'})
+
+        # Real environment variables are not used
+        os.environ[env_var_name] = 'from_env'
+        with self.assertRaises(VariableNotDefinedError):
+            gura.loads(f'test: ${env_var_name}', env={})
+        del os.environ[env_var_name]
+
+    def test_env_snapshot(self):
+        """Tests that a parser takes the environment variables once per call"""
+        env_var_name = f'env_var_{time.time_ns()}'
+        os.environ[env_var_name] = 'first'
+        parser = gura.GuraParser()
+        self.assertDictEqual(parser.loads(f'test: ${env_var_name}'), {'test': 'first'})
+        os.environ[env_var_name] = 'second'
+        self.assertDictEqual(parser.loads(f'test: ${env_var_name}'), {'test': 'second'})
+        del os.environ[env_var_name]
+
+    def test_preseeded_variables(self):
+        """Tests variables defined before parsing"""
+        parsed_data = gura.loads('$own: 2\ntest: $seeded\nown: $own', variables={'seeded': 1})
+        self.assertDictEqual(parsed_data, {'test': 1, 'own': 2})
+
+        with self.assertRaises(DuplicatedVariableError):
+            gura.loads('$seeded: 2', variables={'seeded': 1})
+
     def test_invalid_variable(self):
         """Tests invalid variable value type"""
         with self.assertRaises(ParseError):
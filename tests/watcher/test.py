@@ -0,0 +1,123 @@
+import locale
+import os
+import tempfile
+import threading
+import unittest
+from typing import Union
+from gura import Watcher, ParseError
+
+
+class TestWatcherGura(unittest.TestCase):
+    directory: str
+
+    def setUp(self):
+        temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        self.directory = temporary_directory.name
+        self.root_path = self.__write('root.ura', f'import "{self.__path("imported.ura")}"\nname: "root"\n')
+        self.imported_path = self.__write('imported.ura', f'import "{self.__path("nested.ura")}"\nport: 80\n')
+        self.nested_path = self.__write('nested.ura', 'host: "localhost"\n')
+
+    def __path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def __write(self, name: str, content: Union[str, bytes]) -> str:
+        """Writes a file making sure its modification time changes"""
+        path = self.__path(name)
+        mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+        with open(path, 'wb' if isinstance(content, bytes) else 'w') as file:
+            file.write(content)
+        os.utime(path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+        return path
+
+    def test_initial_load(self):
+        """Tests that the file is loaded when the watcher is created and all the imported files are watched"""
+        watcher = Watcher(self.root_path)
+        self.assertEqual(watcher.value, {'host': 'localhost', 'port': 80, 'name': 'root'})
+        self.assertEqual(sorted(watcher.files), sorted([self.root_path, self.imported_path, self.nested_path]))
+        self.assertFalse(watcher.poll())
+
+    def test_reload_nested_import(self):
+        """Tests that changes in nested imported files reload the values"""
+        changes = []
+        watcher = Watcher(self.root_path, on_change=lambda old, new: changes.append((old, new)), debounce=0)
+        self.__write('nested.ura', 'host: "example.com"\n')
+        self.assertTrue(watcher.poll())
+        self.assertEqual(watcher.value['host'], 'example.com')
+        self.assertEqual(changes, [({'host': 'localhost', 'port': 80, 'name': 'root'},
+                                    {'host': 'example.com', 'port': 80, 'name': 'root'})])
+
+    def test_debounce(self):
+        """Tests that files are not reloaded until they stop changing for debounce seconds"""
+        watcher = Watcher(self.root_path, debounce=3600)
+        self.__write('root.ura', 'name: "first"\n')
+        self.assertFalse(watcher.poll())
+        self.__write('root.ura', 'name: "second"\n')
+        self.assertFalse(watcher.poll())
+        self.assertEqual(watcher.value['name'], 'root')
+
+    def test_failed_reload_keeps_values(self):
+        """Tests that values are only replaced if the parse succeeds, and failed versions are not parsed again"""
+        errors = []
+        watcher = Watcher(self.root_path, on_error=errors.append, debounce=0)
+        self.__write('root.ura', 'name: [\n')
+        self.assertFalse(watcher.poll())
+        self.assertFalse(watcher.poll())
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], ParseError)
+        self.assertEqual(watcher.value['name'], 'root')
+
+        self.__write('root.ura', 'name: "fixed"\n')
+        self.assertTrue(watcher.poll())
+        self.assertEqual(watcher.value, {'name': 'fixed'})
+        self.assertEqual(watcher.files, [self.root_path])
+
+    def test_missing_import(self):
+        """Tests that an imported file which is missing in a reload is still watched until it comes back"""
+        errors = []
+        watcher = Watcher(self.root_path, on_error=errors.append, debounce=0)
+        os.rename(self.nested_path, self.nested_path + '.moved')
+        self.assertFalse(watcher.poll())
+        self.assertIsInstance(errors[0], OSError)
+        self.assertIn(self.nested_path, watcher.files)
+        self.assertFalse(watcher.poll())
+
+        os.rename(self.nested_path + '.moved', self.nested_path)
+        self.assertTrue(watcher.poll())
+        self.assertEqual(watcher.value['host'], 'localhost')
+        self.assertEqual(len(errors), 1)
+
+    @unittest.skipUnless(locale.getpreferredencoding(False).lower().replace('-', '') == 'utf8',
+                         'Files are not decoded as UTF-8')
+    def test_decoding_error(self):
+        """Tests that a file which can not be decoded is reported as any other failed reload"""
+        errors = []
+        watcher = Watcher(self.root_path, on_error=errors.append, debounce=0)
+        self.__write('nested.ura', 'host: "café"\n'.encode('latin-1'))
+        self.assertFalse(watcher.poll())
+        self.assertIsInstance(errors[0], UnicodeDecodeError)
+        self.assertEqual(watcher.value['host'], 'localhost')
+        self.assertEqual(sorted(watcher.files), sorted([self.root_path, self.imported_path, self.nested_path]))
+
+        self.__write('nested.ura', 'host: "café"\n')
+        self.assertTrue(watcher.poll())
+        self.assertEqual(watcher.value['host'], 'café')
+
+    def test_failed_reload_without_on_error(self):
+        """Tests that poll() raises the error of a failed reload when there is no on_error function"""
+        watcher = Watcher(self.root_path, debounce=0)
+        os.remove(self.nested_path)
+        with self.assertRaises(OSError):
+            watcher.poll()
+
+    def test_background_thread(self):
+        """Tests that the background thread reloads the values"""
+        reloaded = threading.Event()
+        with Watcher(self.root_path, on_change=lambda old, new: reloaded.set(), interval=0.01, debounce=0) as watcher:
+            self.__write('imported.ura', 'port: 443\n')
+            self.assertTrue(reloaded.wait(10))
+        self.assertEqual(watcher.value, {'port': 443, 'name': 'root'})
+
+
+if __name__ == '__main__':
+    unittest.main()